@@ -1,8 +1,177 @@
 import streamlit as st
 import os
-import shutil
-from src.modules.ingestion import GoogleIngestion
-from src.graph import app
+import time
+from dotenv import load_dotenv
+from src.jobs import FAILED, FINISHED, NEW_LINEAGE, QUEUED
+
+# Streamlit re-executes this script on every interaction. Analyses run in the
+# background job service (its own worker pool, built once per process below), and
+# the script only submits decks and polls their progress, so a browser refresh
+# reconnects to a running analysis instead of killing it.
+load_dotenv()
+
+# Seconds between two polls of a running job
+POLL_INTERVAL = 0.5
+
+# Display names and report keys for each committee stage, in pipeline order
+NODE_LABELS = {
+    "router": "🧭 Router",
+    "sherlock": "🕵️ Sherlock",
+    "researcher": "🔬 Researcher",
+    "cfo": "🧮 CFO",
+    "critic": "⚖️ Critic",
+    "writer": "✍️ Writer",
+}
+# Upstream stages of each node, used to compute how long the node itself took
+NODE_PREDECESSORS = {
+    "sherlock": ["router"],
+    "researcher": ["router"],
+    "cfo": ["router"],
+    "critic": ["router", "sherlock", "researcher", "cfo"],  # agents without work are skipped
+    "writer": ["critic"],
+}
+AGENT_REPORTS = {
+    "sherlock": ("sherlock_report", "Founder Risk Profile"),
+    "researcher": ("researcher_report", "Market Health Report"),
+    "cfo": ("cfo_report", "Financial Sanity Check"),
+    "critic": ("critic_feedback", "Validation Verdict"),
+}
+
+
+@st.cache_resource(show_spinner=False)
+def get_jobs():
+    """The background job service (worker pool + SQLite job store) shared by every session."""
+    from src.jobs import get_job_service
+    return get_job_service()
+
+
+def follow_job(job_id, status, reports_area, memo_placeholder):
+    """
+    Polls a background job and renders its progress until it finishes.
+
+    Node completions are reported in the status box with their elapsed time,
+    agent reports are shown as soon as they are ready, and the Writer's memo
+    is rendered as it streams in.
+
+    Returns:
+        dict: The finished job (None for an unknown job ID).
+    """
+    jobs = get_jobs()
+    seen = 0
+    finished_at = {}
+
+    while True:
+        job = jobs.get(job_id, after=seen)
+        if job is None:
+            return None
+        start = job["started_at"] or job["created_at"]
+
+        for event in job["events"]:
+            seen = event["seq"]
+            node, update, now = event["node"], event["update"], event["at"]
+            finished_at[node] = now
+            # A node starts once the last of its upstream stages has finished
+            node_start = max((finished_at[p] for p in NODE_PREDECESSORS.get(node, []) if p in finished_at), default=start)
+            label = NODE_LABELS.get(node, node)
+            status.write(f"✅ {label} finished in {now - node_start:.1f}s (total {now - start:.1f}s)")
+            status.update(label=f"The Committee is deliberating... {label} done")
+
+            for skipped in update.get("skipped_stages", []):
+                status.write(f"⏭️ {NODE_LABELS.get(skipped, skipped)} skipped (nothing to analyze)")
+
+            # Reports carried over from the previous version of the deck arrive with the Router
+            for reused in update.get("reused_agents", []):
+                key, title = AGENT_REPORTS[reused]
+                reused_label = NODE_LABELS.get(reused, reused)
+                status.write(f"♻️ {reused_label} reused (input unchanged since the previous version)")
+                with reports_area.expander(f"{reused_label}: {title} (previous version)"):
+                    st.markdown(update.get(key, "No report"))
+
+            if node in AGENT_REPORTS and AGENT_REPORTS[node][0] in update:
+                key, title = AGENT_REPORTS[node]
+                with reports_area.expander(f"{label}: {title}"):
+                    st.markdown(update.get(key, "No report"))
+
+        if job.get("partial_memo"):
+            memo_placeholder.markdown(job["partial_memo"] + " ▌")
+        if job["status"] in FINISHED:
+            break
+        if job["status"] == QUEUED:
+            status.update(label="Waiting for a free worker...")
+        time.sleep(POLL_INTERVAL)
+
+    result = job["result"] or {}
+    memo_placeholder.markdown(result.get("final_memo", "No memo generated."))
+    elapsed = (job["finished_at"] or time.time()) - (job["started_at"] or job["created_at"])
+    if job["status"] == FAILED:
+        status.update(label=f"Committee failed after {elapsed:.1f}s", state="error", expanded=True)
+    else:
+        status.update(label=f"Committee finished in {elapsed:.1f}s", state="complete", expanded=False)
+    return job
+
+
+def show_job(job_id):
+    """Renders a submitted job: live progress, the memo, and the run details once done."""
+    st.caption(f"Analysis job `{job_id}`. Refreshing the page reconnects to it.")
+    job = get_jobs().get(job_id)
+    if job and job.get("baseline_job"):
+        st.caption(f"Revision of a previously analyzed deck (job `{job['baseline_job']}`); "
+                   "only agents whose inputs changed were re-run.")
+
+    # Step C: Follow the background run (progress and reports show up as they happen)
+    status = st.status("The Committee is deliberating... (Sherlock, Researcher, CFO, and Critic are working)", expanded=True)
+    reports_area = st.container()
+    st.divider()
+    st.subheader("Final Investment Memo")
+    memo_placeholder = st.empty()
+
+    job = follow_job(job_id, status, reports_area, memo_placeholder)
+    if job is None:
+        st.error(f"Unknown analysis job: {job_id}")
+        return
+    if job["status"] == FAILED:
+        st.error(f"An error occurred: {job['error']}")
+        # Completed stages are checkpointed, so a retry only re-runs the failed ones
+        if st.button("Retry failed stages") and get_jobs().retry(job_id):
+            st.rerun()
+        return
+
+    result = job["result"] or {}
+
+    # Per-run timing breakdown (nodes, LLM calls and searches)
+    trace = result.get("trace") or {}
+    with st.expander("Run Timing Breakdown"):
+        totals = trace.get("totals") or {}
+        if totals:
+            st.caption(
+                f"{totals['llm_calls']} LLM calls, {totals['searches']} searches, "
+                f"{totals['input_tokens']} input / {totals['output_tokens']} output tokens, "
+                f"{totals['cache_hits']} cache hits"
+            )
+        models = trace.get("models") or {}
+        if models:
+            # Per-model totals show what the per-node model tiering costs and saves
+            st.dataframe(
+                [{"model": model, **{k: v for k, v in entry.items() if k != "nodes"}, "nodes": ", ".join(entry["nodes"])}
+                 for model, entry in models.items()],
+                use_container_width=True
+            )
+        st.dataframe(trace.get("breakdown") or [], use_container_width=True)
+
+    # Step D: Display Results (the memo itself was rendered while streaming)
+    final_memo = result.get("final_memo") or "No memo generated."
+
+    for error in result.get("errors") or []:
+        st.warning(f"{error['node'].title()}: search for {error['entity']} failed ({error['kind']}) — {error['message']}")
+
+    # Bonus: Hot Seat Questions Expander
+    # We'll just display the whole memo, but also look for a section if possible. 
+    # Since the memo structure is markdown, we rely on the user reading it, 
+    # but we can explicitly parse if needed. For now, we'll follow the simpler instruction
+    # to just use an expander if we *find* it or just generally for "Founders Hot Seat".
+    if "Hot Seat" in final_memo or "Questions" in final_memo:
+         with st.expander("Founders Hot Seat (Quick View)"):
+             st.info("Check the 'Hot Seat Questions' section in the memo above.")
 
 # Page Config
 st.set_page_config(page_title="Argus VC", layout="wide")
@@ -31,54 +200,33 @@ with st.sidebar:
 # File Uploader
 uploaded_file = st.file_uploader("Upload Pitch Deck (PDF)", type=["pdf"])
 
+# A revised deck re-runs only the agents whose inputs changed since its previous version
+lineage = None
+if uploaded_file and google_key and tavily_key:
+    lineages = get_jobs().lineages()
+    options = [None, NEW_LINEAGE] + [entry["lineage"] for entry in lineages]
+    labels = {None: "Auto-detect (match an earlier deck)", NEW_LINEAGE: "New deck"}
+    labels.update({entry["lineage"]: f"New version of {entry['name'] or entry['lineage']} ({entry['versions']} so far)"
+                   for entry in lineages})
+    lineage = st.selectbox("Deck version", options, format_func=labels.get)
+
 if uploaded_file and st.button("Analyze Pitch Deck"):
     if not google_key or not tavily_key:
         st.error("Please configure your API keys in the .env file.")
         st.stop()
 
-    # Step A: Save File locally
-    temp_dir = "temp"
-    if not os.path.exists(temp_dir):
-        os.makedirs(temp_dir)
-        
-    file_path = os.path.join(temp_dir, uploaded_file.name)
-    with open(file_path, "wb") as f:
-        f.write(uploaded_file.getbuffer())
-
-    try:
-        # Step B: Ingest
-        ingestion = GoogleIngestion()
-        with st.spinner("Uploading to Gemini 1.5 Flash..."):
-            file_object = ingestion.upload_to_gemini(file_path, mime_type="application/pdf")
-        
-        st.success(f"File uploaded successfully! (URI: {file_object.uri})")
+    # Step A/B: Hand the deck to the job service; ingestion and the graph run in its workers
+    job_id = get_jobs().submit(uploaded_file.getvalue(), name=uploaded_file.name, mime_type="application/pdf",
+                               lineage=lineage)
+    st.session_state["job_id"] = job_id
+    # Keep the job in the URL so a refresh (or a bookmark) reconnects to it
+    st.query_params["job"] = job_id
 
-        # Step C: Execute Graph
-        with st.spinner("The Committee is deliberating... (Sherlock, Researcher, CFO, and Critic are working)"):
-            initial_state = {"pdf_file_uri": file_object.uri}
-            final_state = app.invoke(initial_state)
+job_id = st.session_state.get("job_id") or st.query_params.get("job")
+if job_id:
+    show_job(job_id)
 
-        # Step D: Display Results
-        final_memo = final_state.get("final_memo", "No memo generated.")
-        
-        st.divider()
-        st.subheader("Final Investment Memo")
-        st.markdown(final_memo)
-        
-        # Bonus: Hot Seat Questions Expander
-        # We'll just display the whole memo, but also look for a section if possible. 
-        # Since the memo structure is markdown, we rely on the user reading it, 
-        # but we can explicitly parse if needed. For now, we'll follow the simpler instruction
-        # to just use an expander if we *find* it or just generally for "Founders Hot Seat".
-        if "Hot Seat" in final_memo or "Questions" in final_memo:
-             with st.expander("Founders Hot Seat (Quick View)"):
-                 st.info("Check the 'Hot Seat Questions' section in the memo above.")
-
-    except Exception as e:
-        st.error(f"An error occurred: {str(e)}")
-    
-    finally:
-        # Step D: Cleanup
-        if os.path.exists(file_path):
-            os.remove(file_path)
-            # print(f"Deleted temp file: {file_path}")
+elif google_key and tavily_key:
+    # Build the graph and clients once the page has rendered, so the first
+    # analysis doesn't pay for the imports (cached for the whole process).
+    get_jobs().warm()
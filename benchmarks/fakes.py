@@ -0,0 +1,183 @@
+# benchmarks/fakes.py
+# Offline stand-ins for Gemini and Tavily with configurable latency and response sizes.
+# They plug into the real nodes through src.modules.llm.set_llm_factory and
+# src.modules.tools.set_search_clients, so no network access is needed.
+
+import asyncio
+import json
+import random
+import time
+from typing import Any, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from src.modules.prompts import ROUTER_SYSTEM_PROMPT
+
+
+class LatencyModel:
+    """
+    A latency distribution in seconds.
+
+    "fixed" always returns the median; "lognormal" has the given median and
+    sigma (spread); "uniform" draws from [median * (1 - spread), median * (1 + spread)].
+    """
+
+    def __init__(self, median: float, kind: str = "lognormal", spread: float = 0.35, seed: Optional[int] = None):
+        self.median = median
+        self.kind = kind
+        self.spread = spread
+        self._random = random.Random(seed)
+
+    def sample(self) -> float:
+        if self.median <= 0:
+            return 0.0
+        if self.kind == "fixed":
+            return self.median
+        if self.kind == "uniform":
+            return self._random.uniform(self.median * (1 - self.spread), self.median * (1 + self.spread))
+        return self.median * self._random.lognormvariate(0, self.spread)
+
+
+def fake_job_order(founders: int = 3, competitors: int = 5, claims: int = 4) -> dict:
+    """A Router output with the given number of entities."""
+    return {
+        "founders": [f"Founder {i}" for i in range(founders)],
+        "competitors": [f"Competitor {i}" for i in range(competitors)],
+        "financial_claims": [f"Claim {i}: ${(i + 1) * 10}M ARR with {(i + 1) * 1000} users" for i in range(claims)],
+        "industry": "SaaS",
+    }
+
+
+def _filler(chars: int) -> str:
+    words = "revenue market founder risk growth competitor moat churn margin team".split()
+    text, i = [], 0
+    while sum(len(w) + 1 for w in text) < chars:
+        text.append(words[i % len(words)])
+        i += 1
+    return " ".join(text)[:chars]
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    Chat model that sleeps for a sampled latency and returns canned text.
+
+    The Router gets a JSON job order; every other node gets response_chars of filler.
+    Token usage is estimated at ~4 characters per token. When streamed, the text
+    arrives in stream_chunks evenly spaced pieces over the sampled latency.
+    """
+
+    model: str = "fake-gemini"
+    temperature: float = 0
+    latency: Any = None
+    response_chars: int = 2000
+    job_order: dict = {}
+    stream_chunks: int = 20
+
+    @property
+    def _llm_type(self) -> str:
+        return "argus-fake"
+
+    def _reply(self, messages: List[BaseMessage]) -> ChatResult:
+        system = messages[0].content if messages else ""
+        if system == ROUTER_SYSTEM_PROMPT:
+            text = json.dumps(self.job_order or fake_job_order())
+        else:
+            text = _filler(self.response_chars)
+
+        prompt_chars = sum(len(m.content) if isinstance(m.content, str) else len(json.dumps(m.content)) for m in messages)
+        usage = {
+            "input_tokens": prompt_chars // 4,
+            "output_tokens": len(text) // 4,
+            "total_tokens": (prompt_chars + len(text)) // 4,
+        }
+        message = AIMessage(content=text, usage_metadata=usage)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        time.sleep(self.latency.sample() if self.latency else 0)
+        return self._reply(messages)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        await asyncio.sleep(self.latency.sample() if self.latency else 0)
+        return self._reply(messages)
+
+    def _chunks(self, messages):
+        message = self._reply(messages).generations[0].message
+        text = message.content
+        size = max(1, -(-len(text) // self.stream_chunks))
+        pieces = [text[i:i + size] for i in range(0, len(text), size)] or [""]
+        for i, piece in enumerate(pieces):
+            usage = message.usage_metadata if i == len(pieces) - 1 else None
+            yield ChatGenerationChunk(message=AIMessageChunk(content=piece, usage_metadata=usage))
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        chunks = list(self._chunks(messages))
+        delay = (self.latency.sample() if self.latency else 0) / len(chunks)
+        for chunk in chunks:
+            time.sleep(delay)
+            if run_manager:
+                run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        chunks = list(self._chunks(messages))
+        delay = (self.latency.sample() if self.latency else 0) / len(chunks)
+        for chunk in chunks:
+            await asyncio.sleep(delay)
+            if run_manager:
+                await run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+
+
+def fake_llm_factory(latency: LatencyModel, response_chars: int = 2000, job_order: dict = None, model_latency: dict = None):
+    """
+    Returns a factory for src.modules.llm.set_llm_factory.
+
+    Args:
+        model_latency (dict): Optional {model: LatencyModel} for models that should
+            respond faster or slower than `latency` (e.g. a light tier).
+    """
+    def factory(model, google_api_key=None, **params):
+        return FakeChatModel(
+            model=model,
+            temperature=params.get("temperature", 0),
+            latency=(model_latency or {}).get(model, latency),
+            response_chars=response_chars,
+            job_order=job_order or fake_job_order(),
+        )
+    return factory
+
+
+class FakeSearchClient:
+    """Tavily stand-in returning results_per_query results of content_chars each."""
+
+    def __init__(self, latency: LatencyModel, results_per_query: int = 5, content_chars: int = 600):
+        self.latency = latency
+        self.results_per_query = results_per_query
+        self.content_chars = content_chars
+        self.calls = 0
+
+    def _response(self, query):
+        self.calls += 1
+        slug = "-".join(query.lower().split())
+        return {"results": [
+            {
+                "title": f"{query} result {i}",
+                "url": f"https://example.com/{slug}/{i}",
+                "content": _filler(self.content_chars),
+                "score": round(1.0 - i / (self.results_per_query + 1), 3),
+            }
+            for i in range(self.results_per_query)
+        ]}
+
+    def search(self, query, search_depth=None, topic=None, **kwargs):
+        time.sleep(self.latency.sample())
+        return self._response(query)
+
+
+class FakeAsyncSearchClient(FakeSearchClient):
+    async def search(self, query, search_depth=None, topic=None, **kwargs):
+        await asyncio.sleep(self.latency.sample())
+        return self._response(query)
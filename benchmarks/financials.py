@@ -0,0 +1,103 @@
+# benchmarks/financials.py
+# Throughput of the deterministic financial checks that run in front of the CFO agent.
+#
+# Generates synthetic claim sets (every deck gets distinct figures, so the claim
+# parser's cache does not help) and times:
+#   batch     check_claim_sets() over all decks at once (one vectorized table)
+#   per deck  check_claims() called once per deck, as the CFO node does
+# and reports how many decks would skip the CFO model call.
+#
+# Usage:
+#   python benchmarks/financials.py
+#   python benchmarks/financials.py --decks 10000 --json financials.json
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.modules import financials
+from src.modules.financials import check_claim_sets, check_claims
+
+TEMPLATES = [
+    "${arr:.1f}M ARR",
+    "${proj}M revenue in Year {year}",
+    "{users:,} paying customers",
+    "{waitlist:,} waitlist users",
+    "Growing {growth}% MoM",
+    "Raising ${raise_}M seed round",
+    "Monthly burn of ${burn}k",
+    "{margin}% gross margins",
+    "ARPU of ${arpu}/month",
+    "Partnership with a Fortune 500 retailer",
+]
+
+
+def synthetic_claims(rng: random.Random, deck: int) -> list:
+    """A claim set with plausible (and sometimes implausible) figures; the deck number keeps it unique."""
+    values = {
+        "arr": rng.uniform(0.1, 5) + deck * 1e-6,
+        "proj": rng.choice([2, 5, 10, 50, 100]),
+        "year": rng.randint(1, 5),
+        "users": rng.randint(100, 50_000),
+        "waitlist": rng.randint(1_000, 500_000),
+        "growth": rng.choice([5, 10, 15, 30]),
+        "raise_": rng.choice([1, 2, 5, 10]),
+        "burn": rng.choice([50, 100, 200, 500]),
+        "margin": rng.randint(40, 99),
+        "arpu": rng.choice([10, 30, 100, 500]),
+    }
+    chosen = rng.sample(TEMPLATES, rng.randint(3, 7))
+    return [template.format(**values) for template in chosen]
+
+
+def measure(decks: int, seed: int = 7) -> dict:
+    rng = random.Random(seed)
+    claim_sets = [synthetic_claims(rng, d) for d in range(decks)]
+
+    financials.parse_claim.cache_clear()
+    start = time.perf_counter()
+    checks = check_claim_sets(claim_sets)
+    batch = time.perf_counter() - start
+
+    financials.parse_claim.cache_clear()
+    start = time.perf_counter()
+    for claims in claim_sets:
+        check_claims(claims)
+    per_deck = time.perf_counter() - start
+
+    return {
+        "decks": decks,
+        "claims": sum(len(c) for c in claim_sets),
+        "batch_seconds": round(batch, 4),
+        "batch_decks_per_second": round(decks / batch, 1),
+        "per_deck_ms": round(per_deck / decks * 1000, 3),
+        "consistent_decks": sum(1 for c in checks if c.consistent),
+        "flagged_claims": sum(len(c.flags) for c in checks),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the vectorized financial sanity checks.")
+    parser.add_argument("--decks", type=int, default=5000, help="Synthetic decks to check (default: 5000).")
+    parser.add_argument("--json", help="Write the results to this JSON file.")
+    args = parser.parse_args(argv)
+
+    result = measure(args.decks)
+    print(f"{result['decks']} decks, {result['claims']} claims")
+    print(f"batch:     {result['batch_seconds'] * 1000:8.1f} ms  ({result['batch_decks_per_second']:,.0f} decks/s)")
+    print(f"per deck:  {result['per_deck_ms']:8.3f} ms  (one check_claims call, as in the CFO node)")
+    print(f"consistent (CFO model call skipped): {result['consistent_decks']}/{result['decks']}, "
+          f"flagged claims: {result['flagged_claims']}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2)
+    return result
+
+
+if __name__ == "__main__":
+    main()
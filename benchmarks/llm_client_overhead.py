@@ -0,0 +1,67 @@
+# benchmarks/llm_client_overhead.py
+# Measures the per-run overhead removed by the shared LLM client registry.
+#
+# Usage:
+#   python benchmarks/llm_client_overhead.py            # offline: client construction only
+#   python benchmarks/llm_client_overhead.py --live     # also times a tiny real call (needs GOOGLE_API_KEY)
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from langchain_google_genai import ChatGoogleGenerativeAI
+
+from src.modules.llm import DEFAULT_MODEL, clear_llm_clients, get_llm
+
+# One get_llm() per node per run
+NODES_PER_RUN = 6
+
+
+def per_call_client():
+    """The previous behaviour: a brand new client for every node call."""
+    return ChatGoogleGenerativeAI(
+        model=DEFAULT_MODEL,
+        temperature=0,
+        google_api_key=os.getenv("GOOGLE_API_KEY", "benchmark-placeholder")
+    )
+
+
+def time_run(factory, live):
+    start = time.perf_counter()
+    for _ in range(NODES_PER_RUN):
+        llm = factory()
+        if live:
+            llm.invoke("Reply with OK.")
+    return time.perf_counter() - start
+
+
+def report(label, samples):
+    samples_ms = sorted(s * 1000 for s in samples)
+    p95 = samples_ms[max(0, int(len(samples_ms) * 0.95) - 1)]
+    print(f"{label:<22} mean={statistics.mean(samples_ms):8.1f} ms  p50={statistics.median(samples_ms):8.1f} ms  p95={p95:8.1f} ms")
+    return statistics.mean(samples_ms)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure per-run LLM client setup overhead.")
+    parser.add_argument("--runs", type=int, default=20, help="Number of simulated runs.")
+    parser.add_argument("--live", action="store_true", help="Make a tiny real Gemini call per node.")
+    args = parser.parse_args()
+
+    if args.live and not os.getenv("GOOGLE_API_KEY"):
+        print("Error: --live requires GOOGLE_API_KEY.")
+        sys.exit(1)
+    os.environ.setdefault("GOOGLE_API_KEY", "benchmark-placeholder")
+
+    clear_llm_clients()
+    before = report("per-call clients", [time_run(per_call_client, args.live) for _ in range(args.runs)])
+    after = report("shared registry", [time_run(get_llm, args.live) for _ in range(args.runs)])
+    print(f"\nOverhead removed per run ({NODES_PER_RUN} node calls): {before - after:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
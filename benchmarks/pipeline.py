@@ -0,0 +1,248 @@
+# benchmarks/pipeline.py
+# Offline benchmark of the committee graph using the stand-ins in benchmarks/fakes.py.
+#
+# Measures end-to-end wall time, per-node time, how well the Sherlock/Researcher/CFO
+# fan-out overlaps, and the orchestration overhead left after subtracting the
+# (fake) vendor latency on the critical path, at several concurrency levels.
+#
+# With several --configs it also compares model tiering configurations: "tiered" (the
+# default per-node models), "untiered" (every node on the default model), or explicit
+# pins such as "writer=gemini-2.5-flash-lite+cfo=gemini-2.5-flash-lite".
+#
+# Usage:
+#   python benchmarks/pipeline.py                                   # 1/10/100 concurrent runs, threads
+#   python benchmarks/pipeline.py --mode async --concurrency 1,50
+#   python benchmarks/pipeline.py --llm-latency 0.8 --search-latency 0.3 --json results.json
+#   python benchmarks/pipeline.py --configs untiered,tiered --light-latency 0.2 --concurrency 1,10
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# Measure the pipeline, not the caches
+os.environ["ARGUS_SEARCH_CACHE"] = "0"
+os.environ["ARGUS_LLM_CACHE"] = "0"
+os.environ["ARGUS_DOSSIERS"] = "0"
+# ...and not the client-side rate limiters
+os.environ.setdefault("ARGUS_GEMINI_RPM", "1000000")
+os.environ.setdefault("ARGUS_TAVILY_RPM", "1000000")
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark-placeholder")
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from benchmarks.fakes import (
+    FakeAsyncSearchClient, FakeSearchClient, LatencyModel, fake_job_order, fake_llm_factory
+)
+from src.batch import percentile
+from src.graph import app
+from src.modules import llm as llm_config
+from src.modules.llm import set_llm_factory, set_node_models
+from src.modules.tools import set_search_clients
+from src.modules.tracing import start_trace
+
+NODES = ["router", "sherlock", "researcher", "cfo", "critic", "writer"]
+AGENTS = ["sherlock", "researcher", "cfo"]
+
+
+class NodeTimer(BaseCallbackHandler):
+    """Records start/end times of each graph node in a single run."""
+
+    def __init__(self):
+        self.starts = {}
+        self.ends = {}
+        self._runs = {}
+
+    def on_chain_start(self, serialized, inputs, *, run_id, metadata=None, **kwargs):
+        name = kwargs.get("name")
+        if name in NODES and (metadata or {}).get("langgraph_node") == name and name not in self.starts:
+            self._runs[run_id] = name
+            self.starts[name] = time.perf_counter()
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        name = self._runs.pop(run_id, None)
+        if name:
+            self.ends[name] = time.perf_counter()
+
+    def durations(self) -> dict:
+        return {n: self.ends[n] - self.starts[n] for n in self.ends if n in self.starts}
+
+    def fan_out(self) -> dict:
+        """Overlap of the parallel agents: 1.0 efficiency means span == slowest agent."""
+        ran = [a for a in AGENTS if a in self.starts and a in self.ends]
+        if not ran:
+            return {"span": 0.0, "efficiency": 1.0, "parallelism": 0.0}
+        span = max(self.ends[a] for a in ran) - min(self.starts[a] for a in ran)
+        durations = [self.ends[a] - self.starts[a] for a in ran]
+        return {
+            "span": span,
+            "efficiency": max(durations) / span if span > 0 else 1.0,
+            "parallelism": sum(durations) / span if span > 0 else float(len(ran)),
+        }
+
+
+def run_once_sync(_):
+    timer = NodeTimer()
+    start = time.perf_counter()
+    with start_trace() as trace:
+        app.invoke({"pdf_file_uri": "fake://deck.pdf"}, config={"callbacks": [timer]})
+    timer.models = trace.model_totals()
+    return time.perf_counter() - start, timer
+
+
+async def run_once_async():
+    timer = NodeTimer()
+    start = time.perf_counter()
+    with start_trace() as trace:
+        await app.ainvoke({"pdf_file_uri": "fake://deck.pdf"}, config={"callbacks": [timer]})
+    timer.models = trace.model_totals()
+    return time.perf_counter() - start, timer
+
+
+def run_level(concurrency: int, mode: str) -> list:
+    """Runs `concurrency` analyses at once and returns (wall_seconds, NodeTimer) per run."""
+    if mode == "async":
+        async def main():
+            return await asyncio.gather(*(run_once_async() for _ in range(concurrency)))
+        return asyncio.run(main())
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return list(pool.map(run_once_sync, range(concurrency)))
+
+
+def summarize(concurrency: int, wall: float, runs: list) -> dict:
+    e2e = [seconds for seconds, _ in runs]
+    per_node = {n: [t.durations()[n] for _, t in runs if n in t.durations()] for n in NODES}
+    fan_outs = [t.fan_out() for _, t in runs]
+
+    # Overhead = end-to-end time not explained by the nodes on the critical path
+    overheads = []
+    for seconds, timer in runs:
+        d = timer.durations()
+        critical = d.get("router", 0) + max((d.get(a, 0) for a in AGENTS), default=0) + d.get("critic", 0) + d.get("writer", 0)
+        overheads.append(seconds - critical)
+
+    # LLM calls, latency and tokens per model, summed over the runs
+    models = {}
+    for _, timer in runs:
+        for model, entry in getattr(timer, "models", {}).items():
+            total = models.setdefault(model, {"calls": 0, "ms": 0.0, "input_tokens": 0, "output_tokens": 0, "nodes": []})
+            for key in ("calls", "ms", "input_tokens", "output_tokens"):
+                total[key] += entry[key]
+            total["nodes"] = sorted(set(total["nodes"]) | set(entry["nodes"]))
+
+    return {
+        "concurrency": concurrency,
+        "models": models,
+        "wall_seconds": wall,
+        "runs_per_second": len(runs) / wall if wall > 0 else 0.0,
+        "e2e_p50": percentile(e2e, 50),
+        "e2e_p95": percentile(e2e, 95),
+        "node_p50": {n: percentile(v, 50) for n, v in per_node.items() if v},
+        "fan_out_efficiency": statistics.mean(f["efficiency"] for f in fan_outs),
+        "fan_out_parallelism": statistics.mean(f["parallelism"] for f in fan_outs),
+        "overhead_p50": percentile(overheads, 50),
+        "overhead_p95": percentile(overheads, 95),
+    }
+
+
+def print_summary(result: dict):
+    print(f"\n== {result['concurrency']} concurrent run(s) ==")
+    print(f"wall {result['wall_seconds']:.2f}s  throughput {result['runs_per_second']:.2f} runs/s")
+    print(f"end-to-end p50 {result['e2e_p50'] * 1000:.0f} ms  p95 {result['e2e_p95'] * 1000:.0f} ms")
+    print(f"orchestration overhead p50 {result['overhead_p50'] * 1000:.1f} ms  p95 {result['overhead_p95'] * 1000:.1f} ms")
+    print(f"fan-out efficiency {result['fan_out_efficiency']:.2f} (1.0 = agents fully overlapped), "
+          f"parallelism {result['fan_out_parallelism']:.2f}x")
+    print("node p50: " + "  ".join(f"{n}={v * 1000:.0f}ms" for n, v in result["node_p50"].items()))
+    for model, entry in result.get("models", {}).items():
+        mean = entry["ms"] / entry["calls"] if entry["calls"] else 0.0
+        print(f"  {model}: {entry['calls']} calls, {mean:.0f} ms/call, "
+              f"{entry['input_tokens']} in / {entry['output_tokens']} out tokens ({', '.join(entry['nodes'])})")
+
+
+def configure(args):
+    """Installs the fake Gemini and Tavily backends."""
+    llm_latency = LatencyModel(args.llm_latency, kind=args.distribution, spread=args.spread, seed=args.seed)
+    search_latency = LatencyModel(args.search_latency, kind=args.distribution, spread=args.spread, seed=args.seed)
+    job_order = fake_job_order(args.founders, args.competitors, args.claims)
+
+    light_latency = None
+    if args.light_latency is not None:
+        light_latency = {llm_config.LIGHT_MODEL: LatencyModel(
+            args.light_latency, kind=args.distribution, spread=args.spread, seed=args.seed
+        )}
+    set_llm_factory(fake_llm_factory(
+        llm_latency, response_chars=args.response_chars, job_order=job_order, model_latency=light_latency
+    ))
+    set_search_clients(
+        FakeSearchClient(search_latency, args.results_per_query, args.result_chars),
+        FakeAsyncSearchClient(search_latency, args.results_per_query, args.result_chars),
+    )
+
+
+def apply_model_config(name: str) -> dict:
+    """Pins node models for a --configs entry and returns the effective model per node."""
+    if name == "tiered":
+        set_node_models(None)
+    elif name == "untiered":
+        set_node_models({node: llm_config.DEFAULT_MODEL for node in llm_config.NODE_TIERS})
+    else:
+        set_node_models(dict(pin.split("=", 1) for pin in name.split("+")))
+    return llm_config.node_models()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Offline benchmark of the Argus VC committee graph.")
+    parser.add_argument("--concurrency", default="1,10,100", help="Comma-separated concurrency levels.")
+    parser.add_argument("--mode", choices=["thread", "async"], default="thread",
+                        help="thread = app.invoke on a thread pool, async = app.ainvoke on one event loop.")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="Median fake LLM latency (s).")
+    parser.add_argument("--search-latency", type=float, default=0.3, help="Median fake search latency (s).")
+    parser.add_argument("--light-latency", type=float, default=None,
+                        help="Median fake latency of the light model tier (s). Defaults to --llm-latency.")
+    parser.add_argument("--configs", default="tiered",
+                        help="Comma-separated model configurations: tiered, untiered, or node=model pins joined by '+'.")
+    parser.add_argument("--distribution", choices=["lognormal", "uniform", "fixed"], default="lognormal")
+    parser.add_argument("--spread", type=float, default=0.35, help="Spread of the latency distribution.")
+    parser.add_argument("--response-chars", type=int, default=2000, help="Characters per fake LLM response.")
+    parser.add_argument("--results-per-query", type=int, default=5)
+    parser.add_argument("--result-chars", type=int, default=600, help="Characters per fake search result.")
+    parser.add_argument("--founders", type=int, default=3)
+    parser.add_argument("--competitors", type=int, default=5)
+    parser.add_argument("--claims", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", help="Write the results to this JSON file.")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    configure(args)
+
+    results = []
+    for name in args.configs.split(","):
+        models = apply_model_config(name)
+        print(f"\n##### model configuration: {name} ({', '.join(f'{n}={m}' for n, m in models.items())})")
+        for level in (int(c) for c in args.concurrency.split(",")):
+            start = time.perf_counter()
+            runs = run_level(level, args.mode)
+            result = summarize(level, time.perf_counter() - start, runs)
+            result["config"] = name
+            print_summary(result)
+            results.append(result)
+    set_node_models(None)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"config": vars(args), "results": results}, f, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    main()
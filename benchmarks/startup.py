@@ -0,0 +1,136 @@
+# benchmarks/startup.py
+# Cold-start benchmark: how long a fresh process takes to render the Streamlit page
+# and to finish its first analysis.
+#
+# Every measurement runs in a new interpreter so nothing is already imported:
+#   imports         import time of the heavy modules on their own
+#   first render    one run of app.py through Streamlit's AppTest (API keys unset, so
+#                   the script renders the page without warming the committee)
+#   first analysis  import + compile the graph and run it once against zero-latency
+#                   fakes, followed by a second (warm) run for comparison
+#
+# Usage:
+#   python benchmarks/startup.py
+#   python benchmarks/startup.py --repeat 5 --json startup.json
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+MODULES = [
+    "streamlit",
+    "src.modules.nodes",
+    "src.graph",
+    "langgraph.graph",
+    "langchain_google_genai",
+    "google.genai",
+    "tavily",
+]
+
+IMPORT_SNIPPET = """
+import time
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start)
+"""
+
+RENDER_SNIPPET = """
+import time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({app!r}, default_timeout=120)
+at.run()
+elapsed = time.perf_counter() - start
+assert not at.exception, at.exception
+print(elapsed)
+"""
+
+ANALYSIS_SNIPPET = """
+import json, os, sys, time
+start = time.perf_counter()
+os.environ["ARGUS_SEARCH_CACHE"] = "0"
+os.environ["ARGUS_DOSSIERS"] = "0"
+sys.path.insert(0, {root!r})
+from src.graph import get_app
+from src.modules.llm import set_llm_factory
+from src.modules.tools import set_search_clients
+from benchmarks.fakes import FakeAsyncSearchClient, FakeSearchClient, LatencyModel, fake_llm_factory
+imported = time.perf_counter()
+app = get_app()
+compiled = time.perf_counter()
+
+none = LatencyModel(0)
+set_llm_factory(fake_llm_factory(none))
+set_search_clients(FakeSearchClient(none), FakeAsyncSearchClient(none))
+app.invoke({{"pdf_file_uri": "fake://deck.pdf"}})
+first = time.perf_counter()
+app.invoke({{"pdf_file_uri": "fake://deck.pdf"}})
+warm = time.perf_counter()
+print(json.dumps({{
+    "import": imported - start,
+    "compile": compiled - imported,
+    "first_run": first - compiled,
+    "first_analysis": first - start,
+    "warm_run": warm - first,
+}}))
+"""
+
+
+def run_python(code: str, env_overrides=None) -> str:
+    env = {**os.environ, "GOOGLE_API_KEY": "benchmark-placeholder", "PYTHONDONTWRITEBYTECODE": "1"}
+    env.update(env_overrides or {})
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    return result.stdout.strip().splitlines()[-1]
+
+
+def measure(repeat: int) -> dict:
+    imports = {
+        module: statistics.median(float(run_python(IMPORT_SNIPPET.format(module=module))) for _ in range(repeat))
+        for module in MODULES
+    }
+
+    # Without API keys the page renders and stops, i.e. what a user sees first
+    render_env = {"GOOGLE_API_KEY": "", "TAVILY_API_KEY": ""}
+    render = [float(run_python(RENDER_SNIPPET.format(app=os.path.join(ROOT, "app.py")), render_env))
+              for _ in range(repeat)]
+
+    analyses = [json.loads(run_python(ANALYSIS_SNIPPET.format(root=ROOT))) for _ in range(repeat)]
+    analysis = {key: statistics.median(a[key] for a in analyses) for key in analyses[0]}
+
+    return {"imports": imports, "first_render": statistics.median(render), "analysis": analysis}
+
+
+def print_summary(result: dict):
+    print("== cold imports (each in a fresh process) ==")
+    for module, seconds in result["imports"].items():
+        print(f"  {module:<24} {seconds * 1000:7.0f} ms")
+    print(f"\ntime to first render      {result['first_render'] * 1000:7.0f} ms")
+    a = result["analysis"]
+    print(f"time to first analysis    {a['first_analysis'] * 1000:7.0f} ms "
+          f"(import {a['import'] * 1000:.0f} + compile {a['compile'] * 1000:.0f} + run {a['first_run'] * 1000:.0f})")
+    print(f"warm analysis             {a['warm_run'] * 1000:7.0f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cold-start benchmark of the Streamlit app and the committee graph.")
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh processes per measurement (median is reported).")
+    parser.add_argument("--json", help="Write the results to this JSON file.")
+    args = parser.parse_args(argv)
+
+    result = measure(args.repeat)
+    print_summary(result)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2)
+    return result
+
+
+if __name__ == "__main__":
+    main()
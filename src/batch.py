@@ -0,0 +1,295 @@
+"""
+Batch analysis of many pitch decks.
+
+Usage:
+    python -m src.batch decks/                      # every PDF in a folder
+    python -m src.batch manifest.jsonl -c 8 -o memos/
+
+A manifest is a JSONL file with one deck per line:
+    {"path": "decks/omniagi.pdf", "id": "omniagi"}
+("id" is optional and defaults to the file name without extension.)
+
+Runs are checkpointed by default: re-running the same batch resumes failed decks
+from their last completed node and returns completed decks from the checkpoint.
+    python -m src.batch decks/ --retry-failed       # only decks that failed last time
+Decks that came back from a checkpoint are left out of the latency and throughput
+figures, and a retry merges its results into the existing summary.json.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from dotenv import load_dotenv
+
+from src.modules.ingestion import file_sha256
+from src.modules.pdf_index import extract_pages
+from src.modules.tracing import METRICS, start_trace
+
+DEFAULT_CONCURRENCY = int(os.getenv("ARGUS_BATCH_CONCURRENCY", "4"))
+
+
+def load_decks(source: str) -> list:
+    """
+    Resolves a folder of PDFs or a JSONL manifest into a list of decks.
+
+    Args:
+        source (str): A directory or the path of a .jsonl manifest.
+
+    Returns:
+        list[dict]: One {"id": ..., "path": ...} entry per deck.
+    """
+    decks = []
+    if os.path.isdir(source):
+        for name in sorted(os.listdir(source)):
+            if name.lower().endswith(".pdf"):
+                decks.append({"id": os.path.splitext(name)[0], "path": os.path.join(source, name)})
+        return decks
+
+    base_dir = os.path.dirname(os.path.abspath(source))
+    with open(source) as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            entry = json.loads(line)
+            if "path" not in entry:
+                raise ValueError(f"{source}:{line_no}: manifest entry has no 'path'.")
+            path = entry["path"]
+            if not os.path.isabs(path):
+                path = os.path.join(base_dir, path)
+            deck_id = entry.get("id") or os.path.splitext(os.path.basename(path))[0]
+            decks.append({**entry, "id": deck_id, "path": path})
+    return decks
+
+
+def percentile(values, pct: float) -> float:
+    """Returns the pct-th percentile (0-100) of values using linear interpolation."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def deck_run_id(deck: dict) -> str:
+    """Checkpoint run ID of a deck: its id plus a content hash, so an edited file starts a new run."""
+    return f"{deck['id']}-{file_sha256(deck['path'])[:12]}"
+
+
+def analyze_deck(deck: dict, ingestion, graph) -> dict:
+    """
+    Runs ingestion and the committee graph for a single deck.
+
+    With a checkpointed graph, the run resumes from the deck's last completed node.
+
+    Returns:
+        dict: The final graph state.
+    """
+    file_object = ingestion.upload_to_gemini(deck["path"], mime_type="application/pdf")
+    initial_state = {"pdf_file_uri": file_object.uri, "pdf_pages": extract_pages(deck["path"])}
+
+    if getattr(graph, "checkpointer", None) is not None:
+        from src.graph import run_with_checkpoints
+        return run_with_checkpoints(initial_state, deck["run_id"], graph=graph)
+    return graph.invoke(initial_state)
+
+
+def failed_decks(decks, summary_path: str) -> list:
+    """Filters decks down to those recorded as failed in a previous summary.json."""
+    with open(summary_path) as f:
+        previous = json.load(f)
+    failed_ids = {r["id"] for r in previous.get("results", []) if r.get("status") != "ok"}
+    return [d for d in decks if d["id"] in failed_ids]
+
+
+def merge_results(previous, results) -> list:
+    """Replaces the previous results of the decks that ran again, keeping every other deck's result."""
+    by_id = {r["id"]: r for r in results}
+    merged = [by_id.pop(r["id"], r) for r in previous]
+    return merged + [r for r in results if r["id"] in by_id]
+
+
+def summarize(results, concurrency: int, wall: float) -> dict:
+    """
+    Aggregates per-deck results into the batch summary.
+
+    Decks resumed or returned from a checkpoint ran only part of the graph (or none
+    of it), so only decks that ran from the start count towards latency and throughput.
+    """
+    succeeded = [r for r in results if r["status"] == "ok"]
+    fresh = [r for r in succeeded if r.get("checkpoint", "new") == "new"]
+    latencies = [r["seconds"] for r in fresh]
+    return {
+        "decks": len(results),
+        "succeeded": len(succeeded),
+        "failed": len(results) - len(succeeded),
+        "from_checkpoint": len(succeeded) - len(fresh),
+        "concurrency": concurrency,
+        "wall_seconds": round(wall, 3),
+        "decks_per_minute": round(len(fresh) / wall * 60, 2) if wall > 0 else 0.0,
+        "latency_p50": round(percentile(latencies, 50), 3),
+        "latency_p95": round(percentile(latencies, 95), 3),
+        "node_ms_p50": _node_percentiles(fresh, 50),
+        "metrics": METRICS.snapshot(),
+        "results": results,
+    }
+
+
+def run_batch(decks, output_dir="memos", concurrency=None, ingestion=None, graph=None, checkpoint=True,
+              merge=False) -> dict:
+    """
+    Analyzes many decks with bounded concurrency, writing memos as they complete.
+
+    Args:
+        decks (list[dict] | str): Decks from load_decks(), or a folder/manifest path.
+        output_dir (str): Where "<id>.md" memos and "summary.json" are written.
+        concurrency (int): Maximum decks analyzed at once. Defaults to DEFAULT_CONCURRENCY.
+        ingestion: Optional GoogleIngestion instance (one is created if omitted).
+        graph: Optional compiled graph. Defaults to the checkpointed graph, or
+            src.graph.app when checkpoint is False.
+        checkpoint (bool): Persist progress per deck so failed stages can be retried.
+        merge (bool): Merge into an existing summary.json (e.g. when retrying failed
+            decks) instead of replacing it.
+
+    Returns:
+        dict: Summary with per-deck results, throughput and latency percentiles.
+    """
+    if isinstance(decks, str):
+        decks = load_decks(decks)
+    if ingestion is None:
+        from src.modules.ingestion import GoogleIngestion
+        ingestion = GoogleIngestion()
+    if graph is None:
+        if checkpoint:
+            from src.graph import get_checkpointed_app
+            graph = get_checkpointed_app()
+        else:
+            from src.graph import get_app
+            graph = get_app()
+
+    checkpointed = getattr(graph, "checkpointer", None) is not None
+    if checkpointed:
+        from src.graph import checkpoint_status
+
+    os.makedirs(output_dir, exist_ok=True)
+    workers = max(1, min(concurrency or DEFAULT_CONCURRENCY, len(decks) or 1))
+
+    def timed(deck):
+        start = time.perf_counter()
+        # Each deck gets its own trace (exported to ARGUS_TRACE_FILE when set)
+        with start_trace(run_id=deck["id"]) as trace:
+            try:
+                deck = {**deck, "run_id": deck.get("run_id") or deck_run_id(deck)}
+                deck["checkpoint"] = checkpoint_status(deck["run_id"], graph) if checkpointed else "new"
+                final_state = analyze_deck(deck, ingestion, graph)
+                error = None
+            except Exception as e:
+                final_state, error = None, e
+        return deck, final_state, error, time.perf_counter() - start, trace
+
+    results = []
+    batch_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="argus-batch") as pool:
+        futures = [pool.submit(timed, deck) for deck in decks]
+        for future in as_completed(futures):
+            deck, final_state, error, elapsed, trace = future.result()
+            result = {
+                "id": deck["id"],
+                "run_id": deck.get("run_id"),
+                "path": deck["path"],
+                "checkpoint": deck.get("checkpoint", "new"),
+                "seconds": round(elapsed, 3),
+                "node_ms": trace.node_durations(),
+                "models": trace.model_totals(),
+                **trace.totals(),
+            }
+
+            if error is None:
+                memo_path = os.path.join(output_dir, f"{deck['id']}.md")
+                with open(memo_path, "w") as f:
+                    f.write(final_state.get("final_memo", "No memo generated."))
+                result.update(status="ok", memo=memo_path, errors=final_state.get("errors", []),
+                              skipped_stages=final_state.get("skipped_stages", []))
+                print(f"[{len(results) + 1}/{len(decks)}] {deck['id']}: done in {elapsed:.1f}s -> {memo_path}")
+            else:
+                result.update(status="failed", error=str(error))
+                if hasattr(error, "to_dict"):
+                    result["error_detail"] = error.to_dict()
+                print(f"[{len(results) + 1}/{len(decks)}] {deck['id']}: FAILED after {elapsed:.1f}s ({error})")
+            results.append(result)
+
+    wall = time.perf_counter() - batch_start
+    summary_path = os.path.join(output_dir, "summary.json")
+    if merge and os.path.exists(summary_path):
+        with open(summary_path) as f:
+            previous = json.load(f)
+        # Wall time adds up over the runs, so throughput covers every deck in the summary
+        results = merge_results(previous.get("results", []), results)
+        wall += previous.get("wall_seconds", 0.0)
+    summary = summarize(results, workers, wall)
+    with open(summary_path, "w") as f:
+        json.dump(summary, f, indent=2)
+    return summary
+
+
+def _node_percentiles(results, pct):
+    """Per-node p-th percentile wall time (ms) across decks."""
+    per_node = {}
+    for result in results:
+        for node, ms in result.get("node_ms", {}).items():
+            per_node.setdefault(node, []).append(ms)
+    return {node: round(percentile(values, pct), 1) for node, values in per_node.items()}
+
+
+def print_summary(summary: dict):
+    """Prints the throughput/latency report of a batch run."""
+    print("\n" + "=" * 50)
+    print("BATCH SUMMARY")
+    print("=" * 50)
+    print(f"Decks:       {summary['succeeded']}/{summary['decks']} succeeded ({summary['failed']} failed)")
+    if summary.get("from_checkpoint"):
+        print(f"Checkpoint:  {summary['from_checkpoint']} deck(s) resumed or reused (not in latency/throughput)")
+    print(f"Wall time:   {summary['wall_seconds']:.1f}s at concurrency {summary['concurrency']}")
+    print(f"Throughput:  {summary['decks_per_minute']:.2f} decks/min")
+    print(f"Latency:     p50 {summary['latency_p50']:.1f}s, p95 {summary['latency_p95']:.1f}s")
+    if summary.get("node_ms_p50"):
+        print("Node p50:    " + "  ".join(f"{n}={ms / 1000:.1f}s" for n, ms in summary["node_ms_p50"].items()))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the Argus VC committee over many pitch decks.")
+    parser.add_argument("source", help="A folder of PDFs or a JSONL manifest.")
+    parser.add_argument("-o", "--output", default="memos", help="Output directory for memos (default: memos).")
+    parser.add_argument("-c", "--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"Maximum decks analyzed at once (default: {DEFAULT_CONCURRENCY}).")
+    parser.add_argument("--retry-failed", action="store_true",
+                        help="Only run decks that failed in the previous summary.json (resuming their failed stages).")
+    parser.add_argument("--no-checkpoint", action="store_true", help="Do not persist or resume per-deck progress.")
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+    decks = load_decks(args.source)
+    if args.retry_failed:
+        summary_path = os.path.join(args.output, "summary.json")
+        if not os.path.exists(summary_path):
+            print(f"No previous summary at {summary_path}; nothing to retry.")
+            return 1
+        decks = failed_decks(decks, summary_path)
+    if not decks:
+        print(f"No decks to analyze in {args.source}.")
+        return 1 if not args.retry_failed else 0
+
+    summary = run_batch(decks, output_dir=args.output, concurrency=args.concurrency,
+                        checkpoint=not args.no_checkpoint, merge=args.retry_failed)
+    print_summary(summary)
+    return 0 if summary["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,38 +1,52 @@
+import os
+import sqlite3
+import threading
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import StateGraph, START, END
 
+from src.modules.cache import cache_path
+
 from src.modules.nodes import (
     AgentState,
-    router_node,
-    sherlock_node,
-    researcher_node,
-    cfo_node,
-    critic_node,
-    writer_node
+    route_agents,
+    router_node, arouter_node,
+    sherlock_node, asherlock_node,
+    researcher_node, aresearcher_node,
+    cfo_node, acfo_node,
+    critic_node, acritic_node,
+    writer_node, awriter_node
 )
 
+
+def _node(name, func, afunc):
+    # Each node carries a sync and an async implementation: app.invoke/stream run
+    # the sync one (on threads), app.ainvoke/astream await the async one.
+    return RunnableLambda(func, afunc=afunc, name=name)
+
+
 # Initialize the graph
 workflow = StateGraph(AgentState)
 
 # Add Nodes
-workflow.add_node("router", router_node)
-workflow.add_node("sherlock", sherlock_node)
-workflow.add_node("researcher", researcher_node)
-workflow.add_node("cfo", cfo_node)
-workflow.add_node("critic", critic_node)
-workflow.add_node("writer", writer_node)
+workflow.add_node("router", _node("router", router_node, arouter_node))
+workflow.add_node("sherlock", _node("sherlock", sherlock_node, asherlock_node))
+workflow.add_node("researcher", _node("researcher", researcher_node, aresearcher_node))
+workflow.add_node("cfo", _node("cfo", cfo_node, acfo_node))
+workflow.add_node("critic", _node("critic", critic_node, acritic_node))
+workflow.add_node("writer", _node("writer", writer_node, awriter_node))
 
 # Define Edges
 # Start -> Router
 workflow.add_edge(START, "router")
 
-# Router -> Parallel Agents (Fan Out)
-workflow.add_edge("router", "sherlock")
-workflow.add_edge("router", "researcher")
-workflow.add_edge("router", "cfo")
+# Router -> Parallel Agents (Conditional Fan Out)
+# Only agents with a non-empty input in the job order are dispatched; if none has
+# any work (e.g. the Router fell back to the empty job order), go straight to the Critic.
+workflow.add_conditional_edges("router", route_agents, ["sherlock", "researcher", "cfo", "critic"])
 
 # Parallel Agents -> Critic (Fan In)
-# By connecting all parallel nodes to 'critic', LangGraph waits for all to complete in the current superstep
-# before executing the critic node if they are in the same stage (which they are, conceptually).
+# By connecting all parallel nodes to 'critic', LangGraph waits for the dispatched ones to complete
+# in the current superstep before executing the critic node.
 workflow.add_edge("sherlock", "critic")
 workflow.add_edge("researcher", "critic")
 workflow.add_edge("cfo", "critic")
@@ -44,4 +58,119 @@ workflow.add_edge("critic", "writer")
 workflow.add_edge("writer", END)
 
 # Compile the graph
-app = workflow.compile()
+def compile_graph(checkpointer=None):
+    """Compiles the workflow, optionally with a LangGraph checkpointer for resumable runs."""
+    return workflow.compile(checkpointer=checkpointer)
+
+
+# The default graph is compiled on first use (get_app() or `from src.graph import app`),
+# so importing this module for compile_graph or the checkpointed graph stays cheap.
+_app = None
+_app_lock = threading.Lock()
+
+
+def get_app():
+    """Returns the process-wide compiled graph (without a checkpointer), compiling it once."""
+    global _app
+    if _app is None:
+        with _app_lock:
+            if _app is None:
+                _app = compile_graph()
+    return _app
+
+
+def __getattr__(name):
+    # Keeps `from src.graph import app` working while compiling lazily
+    if name == "app":
+        return get_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Durable checkpoints (one SQLite file per process by default), keyed by run ID
+CHECKPOINT_DB = os.getenv("ARGUS_CHECKPOINT_DB")
+_checkpointed_apps = {}
+_checkpointed_lock = threading.Lock()
+
+
+def get_checkpointed_app(db_path=None):
+    """
+    Returns the workflow compiled with a SQLite checkpointer.
+
+    Every completed node is persisted under the run's thread ID, so a failed or
+    interrupted run can resume from the last completed node (see run_with_checkpoints).
+
+    Args:
+        db_path (str): The checkpoint database. Defaults to ARGUS_CHECKPOINT_DB or the cache directory.
+    """
+    from langgraph.checkpoint.sqlite import SqliteSaver
+
+    db_path = db_path or CHECKPOINT_DB or cache_path("checkpoints.sqlite3")
+    with _checkpointed_lock:
+        graph = _checkpointed_apps.get(db_path)
+        if graph is None:
+            saver = SqliteSaver(sqlite3.connect(db_path, check_same_thread=False))
+            graph = compile_graph(checkpointer=saver)
+            _checkpointed_apps[db_path] = graph
+        return graph
+
+
+def checkpoint_status(run_id: str, graph=None) -> str:
+    """
+    How far a run got before, according to its checkpoints.
+
+    Returns:
+        str: "new" (nothing stored), "resumable" (failed or interrupted) or "completed".
+    """
+    graph = graph or get_checkpointed_app()
+    snapshot = graph.get_state({"configurable": {"thread_id": run_id}})
+    if snapshot.next:
+        return "resumable"
+    if snapshot.values and snapshot.values.get("final_memo"):
+        return "completed"
+    return "new"
+
+
+def run_with_checkpoints(initial_state, run_id: str, graph=None, fresh=False) -> dict:
+    """
+    Runs the committee under a run ID, resuming instead of restarting when possible.
+
+    - A run that never started is invoked with initial_state.
+    - A run that failed or was interrupted resumes from its last completed node;
+      nodes that already succeeded (including parallel siblings of the failed one)
+      are not called again.
+    - A run that already completed returns its stored final state without any calls.
+
+    A resumed run uses the pdf_file_uri of initial_state (File API uploads expire
+    after 48 hours, so the checkpointed one may be gone). It is passed in the run
+    config rather than written into the pending checkpoint, since updating that
+    checkpoint would discard the stored results of the failed node's siblings and
+    run them again; the completed run's state is then updated to the fresh URI.
+
+    Args:
+        initial_state (dict): The initial graph state.
+        run_id (str): Stable identifier of the run (used as the LangGraph thread ID).
+        graph: A checkpointed compiled graph (defaults to get_checkpointed_app()).
+        fresh (bool): Ignore any stored progress and start over.
+
+    Returns:
+        dict: The final graph state.
+    """
+    graph = graph or get_checkpointed_app()
+    config = {"configurable": {"thread_id": run_id}}
+
+    if fresh:
+        graph.checkpointer.delete_thread(run_id)
+    else:
+        snapshot = graph.get_state(config)
+        if snapshot.next:
+            print(f"Resuming run {run_id} at: {', '.join(snapshot.next)}")
+            uri = initial_state.get("pdf_file_uri")
+            if not uri or uri == snapshot.values.get("pdf_file_uri"):
+                return graph.invoke(None, config)
+            final_state = graph.invoke(None, {"configurable": {**config["configurable"], "pdf_file_uri": uri}})
+            graph.update_state(config, {"pdf_file_uri": uri}, as_node="writer")
+            return {**final_state, "pdf_file_uri": uri}
+        if snapshot.values and snapshot.values.get("final_memo"):
+            print(f"Run {run_id} already completed; returning the stored result.")
+            return snapshot.values
+
+    return graph.invoke(initial_state, config)
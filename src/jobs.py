@@ -0,0 +1,513 @@
+"""
+Background analysis jobs.
+
+A deck is submitted to the JobService and gets a job ID right away; a worker pool
+runs ingestion and the committee graph in the background while callers poll the
+job for its status, the nodes finished so far and the final memo. Jobs, their deck
+content and every node's result are persisted in a local SQLite database, so:
+
+- a browser refresh (or a closed tab) does not stop the analysis,
+- a job that was queued or running when the process stopped is picked up again
+  by the next JobService, resuming from its last completed node.
+
+Decks are grouped into lineages (v1, v2, v3 of the same pitch). A job joins the
+lineage chosen at submission, or the one whose latest deck text is most similar.
+The previous version's result is handed to the graph as its baseline, so only the
+agents whose inputs changed run again (see nodes.reusable_reports) and the Critic
+and Writer review the combined reports.
+
+Usage:
+    service = get_job_service()
+    job_id = service.submit(pdf_bytes, name="deck.pdf")
+    service.get(job_id)              # {"status": "running", "events": [...], ...}
+    service.submit(v2_bytes, name="deck-v2.pdf", lineage=job_id)  # a revision of that deck
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from src.modules.cache import cache_path
+from src.modules.tracing import start_trace
+
+# Analyses run at once by the worker pool
+DEFAULT_JOB_WORKERS = int(os.getenv("ARGUS_JOB_WORKERS", "4"))
+# Job database (defaults to the cache directory)
+JOB_DB = os.getenv("ARGUS_JOB_DB")
+# Re-analyze revised decks incrementally (reusing unchanged agent reports). Set to 0 to disable.
+INCREMENTAL = os.getenv("ARGUS_INCREMENTAL", "1") != "0"
+# Minimum deck text similarity (0-1) for an upload to be matched to an earlier deck's lineage
+LINEAGE_SIMILARITY = float(os.getenv("ARGUS_LINEAGE_SIMILARITY", "0.4"))
+# Most recent finished jobs compared against when matching a lineage by similarity
+LINEAGE_CANDIDATES = 200
+# Pass as `lineage` to start a new lineage instead of matching an earlier deck
+NEW_LINEAGE = "new"
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+FINISHED = (SUCCEEDED, FAILED)
+
+# State keys kept in a job's result (the deck's page text is not worth storing twice)
+RESULT_KEYS = (
+    "job_order", "sherlock_report", "researcher_report", "cfo_report",
+    "critic_feedback", "final_memo", "errors", "skipped_stages", "reused_agents",
+)
+
+
+class JobStore:
+    """Thread-safe SQLite persistence for jobs and their per-node events."""
+
+    def __init__(self, path: str = None):
+        """
+        Args:
+            path (str): The SQLite database file (":memory:" is allowed).
+                Defaults to ARGUS_JOB_DB or jobs.sqlite3 in the cache directory.
+        """
+        self.path = path or JOB_DB or cache_path("jobs.sqlite3")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    name TEXT,
+                    status TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL,
+                    content BLOB,
+                    mime_type TEXT,
+                    error TEXT,
+                    result TEXT,
+                    lineage TEXT,
+                    fingerprint TEXT,
+                    baseline_job TEXT
+                )"""
+            )
+            # Job databases created before lineages existed
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+            for column in ("lineage", "fingerprint", "baseline_job"):
+                if column not in columns:
+                    self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} TEXT")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS job_events (
+                    job_id TEXT NOT NULL,
+                    seq INTEGER NOT NULL,
+                    node TEXT NOT NULL,
+                    at REAL NOT NULL,
+                    payload TEXT NOT NULL,
+                    PRIMARY KEY (job_id, seq)
+                )"""
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_lineage ON jobs (lineage, created_at)")
+            self._conn.commit()
+
+    def create(self, content: bytes, name: str = None, mime_type: str = "application/pdf", lineage: str = None) -> str:
+        """
+        Stores a new queued job with its deck content and returns its ID.
+
+        Args:
+            lineage (str): The deck lineage the job belongs to, NEW_LINEAGE to start
+                one, or None to match it by similarity when the job runs.
+        """
+        job_id = uuid.uuid4().hex
+        if lineage == NEW_LINEAGE:
+            lineage = job_id
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, name, status, created_at, content, mime_type, lineage) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, name, QUEUED, time.time(), sqlite3.Binary(content), mime_type, lineage)
+            )
+            self._conn.commit()
+        return job_id
+
+    def content(self, job_id: str):
+        """Returns (content, mime_type, name) of a job's deck."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content, mime_type, name FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            raise KeyError(job_id)
+        return bytes(row[0]) if row[0] is not None else None, row[1], row[2]
+
+    def mark_running(self, job_id: str):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, started_at = COALESCE(started_at, ?) WHERE id = ?",
+                (RUNNING, time.time(), job_id)
+            )
+            self._conn.commit()
+
+    def add_event(self, job_id: str, node: str, payload: dict) -> int:
+        """Records the state update of a finished node and returns its sequence number."""
+        data = json.dumps(payload, default=str)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COALESCE(MAX(seq), 0) FROM job_events WHERE job_id = ?", (job_id,)
+            ).fetchone()
+            seq = row[0] + 1
+            self._conn.execute(
+                "INSERT INTO job_events (job_id, seq, node, at, payload) VALUES (?, ?, ?, ?, ?)",
+                (job_id, seq, node, time.time(), data)
+            )
+            self._conn.commit()
+        return seq
+
+    def finish(self, job_id: str, result: dict = None, error: str = None):
+        """
+        Marks a job succeeded (with its result) or failed.
+
+        A succeeded job's deck content is dropped; a failed job keeps it so it can be retried.
+        """
+        status = FAILED if error is not None else SUCCEEDED
+        content = "content" if error is not None else "NULL"
+        with self._lock:
+            self._conn.execute(
+                f"UPDATE jobs SET status = ?, finished_at = ?, error = ?, result = ?, content = {content} WHERE id = ?",
+                (status, time.time(), error, json.dumps(result, default=str) if result is not None else None, job_id)
+            )
+            self._conn.commit()
+
+    def requeue(self, job_id: str) -> bool:
+        """Puts a failed job back in the queue. Returns False if it is not a failed job."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = NULL, error = NULL WHERE id = ? AND status = ?",
+                (QUEUED, job_id, FAILED)
+            )
+            self._conn.commit()
+        return cursor.rowcount > 0
+
+    def events(self, job_id: str, after: int = 0) -> list:
+        """Node events of a job with a sequence number greater than after, in order."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, node, at, payload FROM job_events WHERE job_id = ? AND seq > ? ORDER BY seq",
+                (job_id, after)
+            ).fetchall()
+        return [{"seq": seq, "node": node, "at": at, "update": json.loads(payload)} for seq, node, at, payload in rows]
+
+    def get(self, job_id: str):
+        """Returns a job's metadata and result (without the deck content), or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, name, status, created_at, started_at, finished_at, error, result, lineage, baseline_job "
+                "FROM jobs WHERE id = ?",
+                (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        keys = ("id", "name", "status", "created_at", "started_at", "finished_at", "error", "result",
+                "lineage", "baseline_job")
+        job = dict(zip(keys, row))
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def set_lineage(self, job_id: str, lineage: str, fingerprint: list, baseline_job: str = None):
+        """Records the lineage a job was assigned to, its deck fingerprint and the job it builds on."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET lineage = ?, fingerprint = ?, baseline_job = ? WHERE id = ?",
+                (lineage, json.dumps(fingerprint), baseline_job, job_id)
+            )
+            self._conn.commit()
+
+    def latest_in_lineage(self, lineage: str, before: float):
+        """The most recent succeeded job of a lineage created before the given time, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id FROM jobs WHERE lineage = ? AND status = ? AND created_at < ? "
+                "ORDER BY created_at DESC LIMIT 1",
+                (lineage, SUCCEEDED, before)
+            ).fetchone()
+        return self.get(row[0]) if row else None
+
+    def match_lineage(self, fingerprint: list, before: float, threshold: float = None):
+        """
+        Finds the lineage of the most similar earlier deck.
+
+        Returns:
+            tuple[str, float] | None: (lineage, similarity) of the best match at or above
+            the threshold (LINEAGE_SIMILARITY by default), or None.
+        """
+        from src.modules.pdf_index import fingerprint_similarity
+
+        threshold = LINEAGE_SIMILARITY if threshold is None else threshold
+        if not fingerprint:
+            return None
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT lineage, fingerprint FROM jobs WHERE status = ? AND created_at < ? "
+                "AND lineage IS NOT NULL AND fingerprint IS NOT NULL ORDER BY created_at DESC LIMIT ?",
+                (SUCCEEDED, before, LINEAGE_CANDIDATES)
+            ).fetchall()
+
+        best = None
+        for lineage, stored in rows:
+            similarity = fingerprint_similarity(fingerprint, json.loads(stored))
+            if similarity >= threshold and (best is None or similarity > best[1]):
+                best = (lineage, similarity)
+        return best
+
+    def lineages(self, limit: int = 50) -> list:
+        """
+        Deck lineages with at least one succeeded job, most recently updated first.
+
+        Returns:
+            list[dict]: {"lineage", "name" (of the latest version), "versions", "updated_at"}.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT lineage, COUNT(*), MAX(created_at) FROM jobs WHERE status = ? AND lineage IS NOT NULL "
+                "GROUP BY lineage ORDER BY MAX(created_at) DESC LIMIT ?",
+                (SUCCEEDED, limit)
+            ).fetchall()
+            result = []
+            for lineage, versions, updated_at in rows:
+                name = self._conn.execute(
+                    "SELECT name FROM jobs WHERE lineage = ? AND created_at = ?", (lineage, updated_at)
+                ).fetchone()[0]
+                result.append({"lineage": lineage, "name": name, "versions": versions, "updated_at": updated_at})
+        return result
+
+    def unfinished(self) -> list:
+        """IDs of jobs that are queued or were running, oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id FROM jobs WHERE status IN (?, ?) ORDER BY created_at", (QUEUED, RUNNING)
+            ).fetchall()
+        return [r[0] for r in rows]
+
+
+class JobService:
+    """Runs submitted decks through ingestion and the committee graph on a worker pool."""
+
+    def __init__(self, store: JobStore = None, workers: int = None, ingestion=None, graph=None, resume=True,
+                 incremental: bool = None):
+        """
+        Args:
+            store (JobStore): Defaults to a JobStore on ARGUS_JOB_DB.
+            workers (int): Analyses run at once. Defaults to DEFAULT_JOB_WORKERS.
+            ingestion: Optional GoogleIngestion (created on the first job if omitted).
+            graph: Optional compiled graph. Defaults to the checkpointed graph, so
+                interrupted jobs resume from their last completed node.
+            resume (bool): Re-queue jobs left unfinished by a previous process.
+            incremental (bool): Reuse unchanged agent reports from the previous version
+                of a deck. Defaults to ARGUS_INCREMENTAL.
+        """
+        self.store = store or JobStore()
+        self.incremental = INCREMENTAL if incremental is None else incremental
+        self._ingestion = ingestion
+        self._graph = graph
+        self._init_lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max(1, workers or DEFAULT_JOB_WORKERS),
+                                        thread_name_prefix="argus-job")
+        # Writer tokens of running jobs, kept in memory only (the final memo is stored with the result)
+        self._live_memos = {}
+
+        if resume:
+            for job_id in self.store.unfinished():
+                print(f"Resuming unfinished job {job_id}")
+                self._pool.submit(self._run, job_id)
+
+    @property
+    def ingestion(self):
+        with self._init_lock:
+            if self._ingestion is None:
+                from src.modules.ingestion import GoogleIngestion
+                self._ingestion = GoogleIngestion()
+            return self._ingestion
+
+    @property
+    def graph(self):
+        with self._init_lock:
+            if self._graph is None:
+                from src.graph import get_checkpointed_app
+                self._graph = get_checkpointed_app()
+            return self._graph
+
+    def warm(self):
+        """Builds the graph and the ingestion client ahead of the first job."""
+        self.graph
+        self.ingestion
+
+    def submit(self, content, name: str = None, mime_type: str = "application/pdf", lineage: str = None) -> str:
+        """
+        Queues a deck for analysis.
+
+        Args:
+            content: The deck as bytes, a memoryview or a binary file-like object.
+            name (str): Display name (e.g. the uploaded file name).
+            mime_type (str): The deck's mime type.
+            lineage (str): The lineage (or the ID of any job in it) this deck is a new
+                version of, NEW_LINEAGE for an unrelated deck, or None to match it to
+                the most similar earlier deck.
+
+        Returns:
+            str: The job ID.
+        """
+        if hasattr(content, "read"):
+            content = content.read()
+        if lineage not in (None, NEW_LINEAGE):
+            # A job ID stands for the lineage that job belongs to
+            job = self.store.get(lineage)
+            if job is not None:
+                lineage = job["lineage"] or job["id"]
+        job_id = self.store.create(bytes(content), name=name, mime_type=mime_type, lineage=lineage)
+        self._pool.submit(self._run, job_id)
+        return job_id
+
+    def lineages(self, limit: int = 50) -> list:
+        """Deck lineages a new upload can be filed under (see JobStore.lineages)."""
+        return self.store.lineages(limit)
+
+    def retry(self, job_id: str) -> bool:
+        """
+        Re-queues a failed job. With the checkpointed graph it resumes from its last completed node.
+
+        Returns:
+            bool: False if the job does not exist or has not failed.
+        """
+        if not self.store.requeue(job_id):
+            return False
+        self._pool.submit(self._run, job_id)
+        return True
+
+    def get(self, job_id: str, after: int = 0):
+        """
+        Returns a job's status and progress, or None for an unknown ID.
+
+        Args:
+            job_id (str): The job ID.
+            after (int): Only include node events after this sequence number (for polling).
+
+        Returns:
+            dict: The job metadata plus "events" (finished nodes with their state
+            updates) and, while the Writer is streaming, "partial_memo".
+        """
+        job = self.store.get(job_id)
+        if job is None:
+            return None
+        job["events"] = self.store.events(job_id, after=after)
+        tokens = self._live_memos.get(job_id)
+        if tokens and job["status"] not in FINISHED:
+            job["partial_memo"] = "".join(tokens)
+        return job
+
+    def wait(self, job_id: str, timeout: float = None, poll_interval: float = 0.5):
+        """Blocks until a job has finished (or the timeout passes) and returns it."""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while True:
+            job = self.store.get(job_id)
+            if job is None or job["status"] in FINISHED:
+                return self.get(job_id)
+            if deadline is not None and time.monotonic() >= deadline:
+                return self.get(job_id)
+            time.sleep(poll_interval)
+
+    def shutdown(self, wait: bool = True):
+        self._pool.shutdown(wait=wait)
+
+    def _run(self, job_id: str):
+        from src.modules.nodes import extract_text_from_response
+        from src.modules.pdf_index import extract_pages
+
+        try:
+            content, mime_type, name = self.store.content(job_id)
+            self.store.mark_running(job_id)
+            graph = self.graph
+            config = {"configurable": {"thread_id": job_id}} if getattr(graph, "checkpointer", None) else {}
+
+            # A job interrupted mid-run resumes from its checkpoint (inputs=None); one that
+            # completed its graph run but was never marked finished just reads the result.
+            snapshot = graph.get_state(config) if config else None
+            resume = bool(snapshot and snapshot.next)
+            done = bool(snapshot and not snapshot.next and (snapshot.values or {}).get("final_memo"))
+
+            with start_trace(run_id=job_id) as trace:
+                inputs = None
+                if resume:
+                    # File API uploads expire, so the checkpointed URI may be stale: the
+                    # remaining nodes read a fresh upload from the config instead
+                    file_object = self.ingestion.upload_to_gemini(content, mime_type=mime_type, display_name=name)
+                    config = {"configurable": {**config["configurable"], "pdf_file_uri": file_object.uri}}
+                elif not done:
+                    file_object = self.ingestion.upload_to_gemini(content, mime_type=mime_type, display_name=name)
+                    inputs = {"pdf_file_uri": file_object.uri, "pdf_pages": extract_pages(content)}
+                    baseline = self._baseline(job_id, inputs["pdf_pages"])
+                    if baseline:
+                        inputs["baseline"] = baseline
+
+                final_state = dict(inputs or {})
+                memo_tokens = self._live_memos.setdefault(job_id, [])
+                stream = graph.stream(inputs, config, stream_mode=["updates", "messages"]) if not done else []
+                for mode, chunk in stream:
+                    if mode == "messages":
+                        message, metadata = chunk
+                        if metadata.get("langgraph_node") == "writer":
+                            memo_tokens.append(extract_text_from_response(message))
+                        continue
+                    for node, update in chunk.items():
+                        if not update:
+                            continue
+                        final_state.update(update)
+                        self.store.add_event(job_id, node, update)
+
+            if config:
+                # A resumed run only streams the nodes it re-ran; the checkpoint has everything
+                final_state = graph.get_state(config).values
+            result = {k: final_state.get(k) for k in RESULT_KEYS if k in final_state}
+            result["trace"] = {"totals": trace.totals(), "models": trace.model_totals(), "breakdown": trace.breakdown()}
+            self.store.finish(job_id, result=result)
+        except Exception as e:
+            print(f"Job {job_id} failed: {e}")
+            self.store.finish(job_id, error=str(e))
+        finally:
+            self._live_memos.pop(job_id, None)
+
+    def _baseline(self, job_id: str, pages: list):
+        """
+        Assigns a job to its deck lineage and returns the previous version's result.
+
+        Returns:
+            dict | None: The latest succeeded result in the lineage (plus its "job_id"),
+            or None for the first version of a deck or when incremental runs are off.
+        """
+        from src.modules.pdf_index import deck_fingerprint
+
+        job = self.store.get(job_id)
+        fingerprint = deck_fingerprint(pages)
+        lineage = job["lineage"]
+        if lineage is None and self.incremental:
+            match = self.store.match_lineage(fingerprint, before=job["created_at"])
+            if match:
+                lineage = match[0]
+                print(f"Job {job_id}: matched to deck lineage {lineage} (similarity {match[1]:.2f})")
+        lineage = lineage or job_id
+
+        previous = self.store.latest_in_lineage(lineage, before=job["created_at"]) if self.incremental else None
+        self.store.set_lineage(job_id, lineage, fingerprint, previous["id"] if previous else None)
+        if previous is None or not previous["result"]:
+            return None
+        return {"job_id": previous["id"], **{k: v for k, v in previous["result"].items() if k != "trace"}}
+
+
+_default_service = None
+_default_service_lock = threading.Lock()
+
+
+def get_job_service() -> JobService:
+    """Returns the process-wide JobService, starting its worker pool on first use."""
+    global _default_service
+    with _default_service_lock:
+        if _default_service is None:
+            _default_service = JobService()
+        return _default_service
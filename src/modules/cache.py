@@ -0,0 +1,272 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+
+# Every on-disk cache lives under this directory unless a full path is given.
+CACHE_DIR = os.getenv("ARGUS_CACHE_DIR", ".argus_cache")
+
+
+def cache_path(filename: str) -> str:
+    """Returns the path of a cache file inside CACHE_DIR, creating the directory if needed."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    return os.path.join(CACHE_DIR, filename)
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls for the same key into one in-flight computation.
+
+    The first caller for a key runs the function; every caller that arrives
+    while it is still running waits for and shares that result (or exception).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight = {}
+
+    def do(self, key, fn):
+        """
+        Runs fn() once per key at a time.
+
+        Returns:
+            tuple: (result, shared) where shared is True if this caller joined
+            a computation started by another caller.
+        """
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+
+        if not leader:
+            return future.result(), True
+
+        try:
+            result = fn()
+            future.set_result(result)
+            return result, False
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+
+class AsyncSingleFlight:
+    """
+    asyncio counterpart of SingleFlight.
+
+    Futures are bound to an event loop, so in-flight calls are tracked per loop.
+    """
+
+    def __init__(self):
+        self._inflight = {}
+
+    async def do(self, key, afn):
+        """
+        Awaits afn() once per key (and event loop) at a time.
+
+        Returns:
+            tuple: (result, shared) as in SingleFlight.do.
+        """
+        loop = asyncio.get_running_loop()
+        flight_key = (id(loop), key)
+        future = self._inflight.get(flight_key)
+        if future is not None:
+            # shield() so a cancelled follower does not cancel the leader's call
+            return await asyncio.shield(future), True
+
+        future = loop.create_future()
+        self._inflight[flight_key] = future
+        try:
+            result = await afn()
+            future.set_result(result)
+            return result, False
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved so a flight without followers does not log a warning
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(flight_key, None)
+
+
+class SQLiteCache:
+    """
+    A small thread-safe key/value cache persisted in SQLite.
+
+    Values are stored as JSON with a per-entry TTL. Expired entries are pruned
+    periodically, and the oldest entries are evicted once max_entries is exceeded.
+    """
+
+    # Prune expired / excess rows after this many writes
+    _EVICT_EVERY = 64
+
+    def __init__(self, path: str, max_entries: int = 10_000):
+        """
+        Args:
+            path (str): The SQLite database file (":memory:" is allowed).
+            max_entries (int): Maximum number of rows kept after eviction.
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+        self._aflight = AsyncSingleFlight()
+        self._writes = 0
+        self._stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0, "shared": 0}
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS cache (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    expires_at REAL
+                )"""
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_expires ON cache (expires_at)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_created ON cache (created_at)")
+            self._conn.commit()
+
+    def get(self, key: str, default=None):
+        """Returns the cached value for key, or default if missing or expired."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM cache WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (key, now)
+            ).fetchone()
+            if row is None:
+                self._stats["misses"] += 1
+                return default
+            self._stats["hits"] += 1
+        return json.loads(row[0])
+
+    def set(self, key: str, value, ttl: float = None):
+        """
+        Stores a JSON-serializable value.
+
+        Args:
+            key (str): The cache key.
+            value: Any JSON-serializable value.
+            ttl (float): Lifetime in seconds. None means the entry never expires.
+        """
+        now = time.time()
+        expires_at = now + ttl if ttl is not None else None
+        payload = json.dumps(value)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, created_at, expires_at) VALUES (?, ?, ?, ?)",
+                (key, payload, now, expires_at)
+            )
+            self._conn.commit()
+            self._stats["stores"] += 1
+            self._writes += 1
+            if self._writes % self._EVICT_EVERY == 0:
+                self._evict_locked(now)
+
+    def delete(self, key: str):
+        """Removes a single entry."""
+        with self._lock:
+            self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def get_or_compute(self, key: str, compute, ttl: float = None):
+        """
+        Returns the cached value for key, computing and storing it on a miss.
+
+        Concurrent misses for the same key share a single call to compute().
+        Exceptions raised by compute() propagate and nothing is cached.
+        """
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is not sentinel:
+            return value
+
+        def load():
+            # Another flight may have filled the entry between our miss and now
+            cached = self._peek(key, sentinel)
+            if cached is not sentinel:
+                return cached
+            result = compute()
+            self.set(key, result, ttl)
+            return result
+
+        value, shared = self._flight.do(key, load)
+        if shared:
+            with self._lock:
+                self._stats["shared"] += 1
+        return value
+
+    async def aget_or_compute(self, key: str, acompute, ttl: float = None):
+        """Async variant of get_or_compute; acompute is a coroutine function."""
+        # SQLite reads and writes run in threads so they do not block the event loop
+        sentinel = object()
+        value = await asyncio.to_thread(self.get, key, sentinel)
+        if value is not sentinel:
+            return value
+
+        async def load():
+            cached = await asyncio.to_thread(self._peek, key, sentinel)
+            if cached is not sentinel:
+                return cached
+            result = await acompute()
+            await asyncio.to_thread(self.set, key, result, ttl)
+            return result
+
+        value, shared = await self._aflight.do(key, load)
+        if shared:
+            with self._lock:
+                self._stats["shared"] += 1
+        return value
+
+    def evict(self):
+        """Removes expired entries and trims the table down to max_entries."""
+        with self._lock:
+            self._evict_locked(time.time())
+
+    def clear(self):
+        """Removes every entry."""
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        """Returns hit/miss counters plus the current number of stored entries."""
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["entries"] = size
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+    def _peek(self, key, default):
+        # Lookup that does not touch the hit/miss counters
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM cache WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (key, time.time())
+            ).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def _evict_locked(self, now):
+        removed = self._conn.execute(
+            "DELETE FROM cache WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,)
+        ).rowcount
+        removed += self._conn.execute(
+            """DELETE FROM cache WHERE key IN (
+                SELECT key FROM cache ORDER BY created_at DESC LIMIT -1 OFFSET ?
+            )""",
+            (self.max_entries,)
+        ).rowcount
+        self._conn.commit()
+        self._stats["evictions"] += removed
@@ -0,0 +1,246 @@
+"""
+Bounded context assembly for the Critic and the Writer.
+
+The Critic and the Writer used to embed every agent report verbatim (and the Writer
+the full Critic output too), so their prompts grew with the number of founders and
+competitors. assemble_context() splits each report once into line units and marks
+its key findings (verdicts and risk ratings, red flags, figures). The result is kept
+in the run state and rendered for each node within that node's token budget:
+
+- a report that fits its share of the budget is passed through unchanged,
+- a longer one is compacted to its key findings plus as many other lines as fit,
+- for the Writer, lines the Critic rejected as hallucinations are dropped and
+  lines it could not verify are marked, before anything is budgeted.
+"""
+
+import os
+import re
+
+from src.modules.pdf_index import tokenize
+from src.modules.resilience import CHARS_PER_TOKEN
+
+# Token budget of the assembled reports per node; override with ARGUS_CONTEXT_TOKEN_BUDGET_<NODE>
+DEFAULT_CONTEXT_TOKEN_BUDGET = int(os.getenv("ARGUS_CONTEXT_TOKEN_BUDGET", "6000"))
+# Longest single key finding kept in a compacted report
+KEY_FINDING_MAX_CHARS = 400
+# Share of a report line's terms a Critic item must contain for the line to count as the
+# claim it rejected (the item itself adds attribution and verdict words around the claim)
+CLAIM_MATCH_THRESHOLD = 0.6
+# Report lines with fewer terms (headings, "Verdict: LOW") are never matched to an item
+CLAIM_MIN_TERMS = 3
+
+# The sources in the order they appear in prompts
+CONTEXT_SOURCES = (
+    ("sherlock_report", "Sherlock Report"),
+    ("researcher_report", "Researcher Report"),
+    ("cfo_report", "CFO Report"),
+    ("critic_feedback", "CRITIC FEEDBACK (VALIDATION)"),
+)
+
+_VERDICT_RE = re.compile(
+    r"\bverdict\b|\brecommend|\brating\b|\bclassif|\brisk\b[^\n]{0,30}\b(?:low|medium|high)\b|\b(?:LOW|MEDIUM|HIGH)\b"
+    r"|\bwinner[- ]take[- ]all\b|\bdefensib",
+    re.IGNORECASE
+)
+_RED_FLAG_RE = re.compile(
+    r"red flag|\bfraud|\blawsuits?\b|\bsued\b|litigation|scandal|bankrupt|\bfailed\b|shut ?down|"
+    r"too good to be true|unrealistic|implausible|inconsistent|\bflag|declin|\bdying\b|warning|concern|"
+    r"exaggerat|\bunverified\b|\bcontradict|hallucinat",
+    re.IGNORECASE
+)
+_FIGURE_RE = re.compile(r"[$€£]\s*\d|\d\s*%|\b\d[\d,.]*\s*(?:k|m|bn|b|x|million|billion|users|customers)\b", re.IGNORECASE)
+_HEADING_RE = re.compile(r"^\s*(?:#+\s|\*\*[^*]+\*\*:?\s*$|[A-Z][A-Za-z /()-]{2,60}:\s*$)")
+_BULLET_RE = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s+")
+# Only an explicit hallucinations/invalid section rejects its items; a verdict line such as
+# "Validation Verdict: Partially Rejected" does not
+_REJECTED_RE = re.compile(r"hallucinat|unsupported|invalid|contradict", re.IGNORECASE)
+_UNVERIFIED_RE = re.compile(r"unverified|unverifiable|not verified|cannot be verified", re.IGNORECASE)
+# "None", "N/A", "No hallucinations found." under a section heading
+_EMPTY_ITEM_RE = re.compile(r"^(?:none\b|n/?a\b|no (?:hallucinations?|contradictions?|issues?|invalid claims?|unverified claims?)\b)", re.IGNORECASE)
+
+
+def context_token_budget(node: str) -> int:
+    """The assembled-context token budget of a node (see ARGUS_CONTEXT_TOKEN_BUDGET)."""
+    return int(os.getenv(f"ARGUS_CONTEXT_TOKEN_BUDGET_{node.upper()}", DEFAULT_CONTEXT_TOKEN_BUDGET))
+
+
+def score_line(line: str) -> int:
+    """
+    How important a report line is when the report has to be compacted.
+
+    Returns:
+        int: 3 for verdicts and risk ratings, 2 for red flags, 1 for lines with
+        figures, 0 for everything else (headings included).
+    """
+    if _HEADING_RE.match(line) and not _VERDICT_RE.search(line):
+        return 0
+    if _VERDICT_RE.search(line):
+        return 3
+    if _RED_FLAG_RE.search(line):
+        return 2
+    if _FIGURE_RE.search(line):
+        return 1
+    return 0
+
+
+def split_report(text: str) -> list:
+    """
+    Splits a report into line units with their importance.
+
+    Returns:
+        list[dict]: {"text", "score"} per non-empty line, in report order.
+    """
+    return [{"text": line.rstrip(), "score": score_line(line)} for line in (text or "").splitlines() if line.strip()]
+
+
+def assemble_context(reports: dict) -> dict:
+    """
+    Builds the shared context of the agent reports, once per run.
+
+    Args:
+        reports (dict): Agent report key -> text (keys as in CONTEXT_SOURCES).
+
+    Returns:
+        dict: {"units": {key: [unit, ...]}} (JSON-serializable, so it can live in the
+        checkpointed run state).
+    """
+    return {"units": {key: split_report(reports.get(key) or "") for key, _ in CONTEXT_SOURCES if key in reports}}
+
+
+def _is_heading(item: str) -> bool:
+    """True for list items shaped like a section heading: "**Confirmed Facts**", "Hallucinations:"."""
+    text = item.strip().lstrip("#").strip()
+    bold = text.startswith("**") and text.endswith("**")
+    return bold or (len(text) <= 80 and text.rstrip("* ").endswith(":"))
+
+
+def _critic_items(feedback: str) -> tuple:
+    """
+    Reads the Critic's verdict for the claims it rejected or could not verify.
+
+    Returns:
+        tuple[list[str], list[str]]: (rejected items, unverified items).
+    """
+    rejected, unverified = [], []
+    section = None
+    for line in (feedback or "").splitlines():
+        if not line.strip():
+            continue
+        item = _BULLET_RE.sub("", line).strip()
+        if not _BULLET_RE.match(line) or _is_heading(item):
+            # A heading (or any non-list line) starts a new section
+            section = "rejected" if _REJECTED_RE.search(line) else "unverified" if _UNVERIFIED_RE.search(line) else None
+            continue
+        if section is None or len(tokenize(item)) < 3 or _EMPTY_ITEM_RE.match(item):
+            continue
+        (rejected if section == "rejected" else unverified).append(item)
+    return rejected, unverified
+
+
+def _matches(line_terms: set, item_terms: list) -> bool:
+    """True if a Critic item quotes most of a report line's terms."""
+    if len(line_terms) < CLAIM_MIN_TERMS:
+        return False
+    return any(len(terms & line_terms) / len(line_terms) >= CLAIM_MATCH_THRESHOLD for terms in item_terms)
+
+
+def apply_critic(context: dict, feedback: str) -> dict:
+    """
+    Removes report lines the Critic rejected, marks the ones it could not verify,
+    and adds the Critic's feedback itself as a source.
+
+    Returns:
+        dict: A new context; the input is not modified. "dropped" counts the removed lines.
+    """
+    rejected, unverified = _critic_items(feedback)
+    rejected_terms = [set(tokenize(item)) for item in rejected]
+    unverified_terms = [set(tokenize(item)) for item in unverified]
+
+    units, dropped = {}, 0
+    for key, report_units in context["units"].items():
+        kept = []
+        for unit in report_units:
+            terms = set(tokenize(unit["text"]))
+            if rejected_terms and _matches(terms, rejected_terms):
+                dropped += 1
+                continue
+            if unverified_terms and _matches(terms, unverified_terms):
+                unit = {**unit, "text": f"{unit['text']} [unverified by the Critic]"}
+            kept.append(unit)
+        units[key] = kept
+    units["critic_feedback"] = split_report(feedback)
+    return {**context, "units": units, "dropped": context.get("dropped", 0) + dropped}
+
+
+def _allocate(sizes: dict, budget: int) -> dict:
+    """Splits a character budget across sources: equal shares, with what short sources leave over going to longer ones."""
+    shares, remaining, pending = {}, budget, dict(sizes)
+    while pending:
+        share = remaining // len(pending)
+        fitting = {key: size for key, size in pending.items() if size <= share}
+        if not fitting:
+            shares.update({key: share for key in pending})
+            break
+        for key, size in fitting.items():
+            shares[key] = size
+            remaining -= size
+            del pending[key]
+    return shares
+
+
+def _compact(units: list, limit: int) -> str:
+    """Key findings first (best first, in report order within a score), then other lines in order, within limit characters."""
+    key_findings, details = [], []
+    # Room for the section headers and the omission note
+    used = len("Key findings:\nOther details:\n") + 60
+    order = sorted(range(len(units)), key=lambda i: (-units[i]["score"], i))
+    chosen = set()
+    for i in order:
+        text = units[i]["text"].strip()
+        if units[i]["score"] > 0 and len(text) > KEY_FINDING_MAX_CHARS:
+            text = text[:KEY_FINDING_MAX_CHARS].rstrip() + " [...]"
+        if units[i]["score"] > 0:
+            text = _BULLET_RE.sub("", text)
+        cost = len(text) + 3  # "- " prefix and newline
+        if used + cost > limit:
+            continue
+        chosen.add(i)
+        used += cost
+        (key_findings if units[i]["score"] > 0 else details).append((i, text))
+
+    omitted = len(units) - len(chosen)
+    lines = []
+    if key_findings:
+        lines += ["Key findings:"] + [f"- {text}" for _, text in sorted(key_findings)]
+    if details:
+        lines += ["Other details:"] + [text for _, text in sorted(details)]
+    if omitted:
+        lines.append(f"[{omitted} more line(s) omitted to fit the context budget]")
+    return "\n".join(lines)
+
+
+def render_context(context: dict, keys, token_budget: int) -> tuple:
+    """
+    Renders the given sources of an assembled context within a token budget.
+
+    Args:
+        context (dict): From assemble_context() (optionally after apply_critic()).
+        keys (list[str]): The sources to render.
+        token_budget (int): Maximum estimated tokens for all rendered sources together.
+
+    Returns:
+        tuple[dict, dict]: (key -> rendered text, stats with "tokens" and "compacted" sources).
+    """
+    units = {key: context["units"].get(key) or [] for key in keys}
+    full = {key: "\n".join(u["text"] for u in report_units) for key, report_units in units.items()}
+    shares = _allocate({key: len(text) for key, text in full.items()}, token_budget * CHARS_PER_TOKEN)
+
+    rendered, compacted = {}, []
+    for key in keys:
+        if len(full[key]) <= shares[key]:
+            rendered[key] = full[key]
+        else:
+            rendered[key] = _compact(units[key], shares[key])
+            compacted.append(key)
+    tokens = sum(len(text) for text in rendered.values()) // CHARS_PER_TOKEN
+    return rendered, {"tokens": tokens, "compacted": compacted}
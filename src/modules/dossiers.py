@@ -0,0 +1,310 @@
+"""
+Cross-deck entity dossiers for founders and competitors.
+
+The same well-known competitors and repeat founders show up in many decks. Instead
+of searching for them and having the model digest the raw results every time,
+Sherlock and the Researcher keep a short synthesized dossier per entity: the
+findings, when they were written and the source URLs they came from. A later deck
+that mentions the entity gets the dossier in its prompt, and only entities without
+a fresh dossier are searched, so search volume and prompt size grow with the number
+of new entities rather than the total.
+
+Entities are keyed by a normalized name ("OpenAI, Inc." and "openai" are the same
+company) and an optional alias table ("Google DeepMind" -> "deepmind"), seeded from
+the JSON file in ARGUS_ENTITY_ALIASES ({"alias": "canonical name", ...}).
+
+With the LLM response cache on (ARGUS_LLM_CACHE=1), the store also pins which of a
+deck's entities were searched (see pin_split), so re-running an identical deck rebuilds
+the same prompt, searched entities included, and hits the cached response instead of
+swapping in the dossiers its own first run wrote.
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from src.modules.cache import cache_path
+
+# Set to 0 to always search every entity and never store dossiers
+DOSSIERS_ENABLED = os.getenv("ARGUS_DOSSIERS", "1") != "0"
+# Dossier database (defaults to the cache directory)
+DOSSIER_DB = os.getenv("ARGUS_DOSSIER_DB")
+# Seconds before a dossier is considered stale and its entity is searched again
+DOSSIER_TTL = {
+    "founder": float(os.getenv("ARGUS_DOSSIER_TTL_FOUNDER", str(30 * 86400))),
+    "competitor": float(os.getenv("ARGUS_DOSSIER_TTL_COMPETITOR", str(7 * 86400))),
+}
+# Source URLs kept per dossier
+MAX_SOURCES = 5
+
+_PUNCTUATION_RE = re.compile(r"[^\w\s&+-]")
+_COMPANY_SUFFIXES = {
+    "inc", "incorporated", "llc", "ltd", "limited", "corp", "corporation", "co", "company",
+    "gmbh", "plc", "sa", "ag", "bv", "pty", "srl",
+}
+_PERSON_TITLES = {"dr", "mr", "mrs", "ms", "prof", "sir"}
+_PERSON_SUFFIXES = {"phd", "mba", "md", "jr", "sr", "ii", "iii"}
+
+
+def normalize_entity(kind: str, name: str) -> str:
+    """
+    A comparable form of an entity name: case-folded, without punctuation, and
+    without legal suffixes (companies) or titles and degrees (people).
+    """
+    words = _PUNCTUATION_RE.sub(" ", str(name).casefold()).split()
+    if kind == "founder":
+        while words and words[0] in _PERSON_TITLES:
+            words = words[1:]
+        while words and words[-1] in _PERSON_SUFFIXES:
+            words = words[:-1]
+    else:
+        if len(words) > 1 and words[0] == "the":
+            words = words[1:]
+        while len(words) > 1 and words[-1] in _COMPANY_SUFFIXES:
+            words = words[:-1]
+    return " ".join(words)
+
+
+def result_sources(entity_results) -> list:
+    """The URLs of an entity's raw search results, best first (at most MAX_SOURCES)."""
+    if not isinstance(entity_results, list):
+        return []
+    ranked = sorted(entity_results, key=lambda r: r.get("score") or 0.0, reverse=True)
+    urls = []
+    for result in ranked:
+        url = result.get("url")
+        if url and url not in urls:
+            urls.append(url)
+    return urls[:MAX_SOURCES]
+
+
+class DossierStore:
+    """Thread-safe SQLite persistence for per-entity dossiers and name aliases."""
+
+    def __init__(self, path: str = None, aliases_file: str = None):
+        """
+        Args:
+            path (str): The SQLite database file (":memory:" is allowed).
+                Defaults to ARGUS_DOSSIER_DB or dossiers.sqlite3 in the cache directory.
+            aliases_file (str): JSON object of alias -> canonical name to load.
+                Defaults to ARGUS_ENTITY_ALIASES.
+        """
+        self.path = path or DOSSIER_DB or cache_path("dossiers.sqlite3")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS dossiers (
+                    kind TEXT NOT NULL,
+                    entity_key TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    findings TEXT NOT NULL,
+                    sources TEXT NOT NULL,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (kind, entity_key)
+                )"""
+            )
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS splits (
+                    kind TEXT NOT NULL,
+                    entities TEXT NOT NULL,
+                    searched TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (kind, entities)
+                )"""
+            )
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS aliases (
+                    kind TEXT NOT NULL,
+                    alias TEXT NOT NULL,
+                    entity_key TEXT NOT NULL,
+                    PRIMARY KEY (kind, alias)
+                )"""
+            )
+            self._conn.commit()
+
+        aliases_file = aliases_file or os.getenv("ARGUS_ENTITY_ALIASES")
+        if aliases_file:
+            with open(aliases_file) as f:
+                for alias, canonical in json.load(f).items():
+                    # The file is not split by kind, so each alias applies to founders and competitors alike
+                    for kind in DOSSIER_TTL:
+                        self.add_alias(kind, alias, canonical)
+
+    def add_alias(self, kind: str, alias: str, canonical: str):
+        """Resolves alias to the same dossier as canonical from now on."""
+        alias_key = normalize_entity(kind, alias)
+        entity_key = self.resolve(kind, canonical)
+        if not alias_key or alias_key == entity_key:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO aliases (kind, alias, entity_key) VALUES (?, ?, ?)",
+                (kind, alias_key, entity_key)
+            )
+            self._conn.commit()
+
+    def resolve(self, kind: str, name: str) -> str:
+        """The dossier key of an entity name (normalized, then alias-resolved)."""
+        key = normalize_entity(kind, name)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT entity_key FROM aliases WHERE kind = ? AND alias = ?", (kind, key)
+            ).fetchone()
+        return row[0] if row else key
+
+    def lookup(self, kind: str, names, max_age: float = None) -> dict:
+        """
+        Finds the fresh dossiers of several entities.
+
+        Args:
+            kind (str): "founder" or "competitor".
+            names (list[str]): Entity names as they appear in the deck.
+            max_age (float): Seconds a dossier stays fresh. Defaults to DOSSIER_TTL[kind].
+
+        Returns:
+            dict: name -> {"name", "findings", "sources", "updated_at"} for every
+            entity with a dossier younger than max_age.
+        """
+        max_age = DOSSIER_TTL[kind] if max_age is None else max_age
+        keys = {name: self.resolve(kind, name) for name in names}
+        if not keys:
+            return {}
+        placeholders = ", ".join("?" for _ in set(keys.values()))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT entity_key, name, findings, sources, updated_at FROM dossiers "
+                f"WHERE kind = ? AND updated_at >= ? AND entity_key IN ({placeholders})",
+                (kind, time.time() - max_age, *set(keys.values()))
+            ).fetchall()
+        found = {
+            key: {"name": name, "findings": findings, "sources": json.loads(sources), "updated_at": updated_at}
+            for key, name, findings, sources, updated_at in rows
+        }
+        return {name: found[key] for name, key in keys.items() if key in found}
+
+    def save(self, kind: str, name: str, findings: str, sources=()):
+        """Stores (or replaces) the dossier of an entity."""
+        key = self.resolve(kind, name)
+        if not key or not findings:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO dossiers (kind, entity_key, name, findings, sources, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (kind, key, name, findings.strip(), json.dumps(list(sources)[:MAX_SOURCES]), time.time())
+            )
+            self._conn.commit()
+
+    def delete(self, kind: str, name: str):
+        """Forgets an entity's dossier, so it is searched again next time."""
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM dossiers WHERE kind = ? AND entity_key = ?", (kind, self.resolve(kind, name))
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def _split_key(kind: str, entities) -> str:
+        return json.dumps([normalize_entity(kind, e) for e in entities])
+
+    def pin_split(self, kind: str, entities, searched):
+        """Remembers which of a deck's entities were searched; the others came from dossiers."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO splits (kind, entities, searched, created_at) VALUES (?, ?, ?, ?)",
+                (kind, self._split_key(kind, entities), json.dumps(list(searched)), time.time())
+            )
+            self._conn.commit()
+
+    def pinned_split(self, kind: str, entities, max_age: float = None):
+        """
+        The entities searched the last time this exact entity list was analyzed.
+
+        Returns:
+            list[str] | None: The searched names, or None if the list was not analyzed
+            within max_age (defaults to DOSSIER_TTL[kind]).
+        """
+        max_age = DOSSIER_TTL[kind] if max_age is None else max_age
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT searched FROM splits WHERE kind = ? AND entities = ? AND created_at >= ?",
+                (kind, self._split_key(kind, entities), time.time() - max_age)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def stats(self) -> dict:
+        """Number of dossiers per kind."""
+        with self._lock:
+            rows = self._conn.execute("SELECT kind, COUNT(*) FROM dossiers GROUP BY kind").fetchall()
+        return dict(rows)
+
+
+def format_dossiers(dossiers: dict) -> str:
+    """Renders dossiers (as returned by DossierStore.lookup) as a prompt block."""
+    sections = []
+    for name, dossier in dossiers.items():
+        updated = time.strftime("%Y-%m-%d", time.localtime(dossier["updated_at"]))
+        sources = ", ".join(dossier["sources"]) or "none recorded"
+        sections.append(f"--- Dossier on {name} (updated {updated}; sources: {sources}) ---\n{dossier['findings']}")
+    return "\n\n".join(sections)
+
+
+_FINDINGS_RE = re.compile(r"```json\s*(\{.*?\})\s*```\s*$", re.DOTALL)
+
+
+def split_findings(text: str, entities, kind: str = "competitor") -> tuple:
+    """
+    Separates the per-entity findings block from an agent's report.
+
+    The agent is asked to end its report with a ```json block mapping each newly
+    researched entity to a short summary. The block is removed from the report.
+
+    Returns:
+        tuple[str, dict]: (report without the block, {entity: findings} for the
+        requested entities that were summarized).
+    """
+    match = _FINDINGS_RE.search(text.rstrip())
+    if not match:
+        return text, {}
+    try:
+        data = json.loads(match.group(1))
+    except json.JSONDecodeError:
+        return text, {}
+    report = text.rstrip()[:match.start()].rstrip()
+    if not isinstance(data, dict):
+        return report, {}
+
+    # Match the model's keys back to the requested names, tolerating case and punctuation
+    by_key = {normalize_entity(kind, k): v for k, v in data.items() if isinstance(v, str) and v.strip()}
+    findings = {}
+    for entity in entities:
+        value = data.get(entity) if isinstance(data.get(entity), str) else by_key.get(normalize_entity(kind, entity))
+        if value and value.strip():
+            findings[entity] = value.strip()
+    return report, findings
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_dossier_store():
+    """Returns the process-wide DossierStore, or None when dossiers are disabled."""
+    global _default_store
+    if not DOSSIERS_ENABLED:
+        return None
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = DossierStore()
+        return _default_store
+
+
+def set_dossier_store(store):
+    """Replaces the process-wide store (e.g. an in-memory one in benchmarks); None restores the default."""
+    global _default_store
+    with _default_store_lock:
+        _default_store = store
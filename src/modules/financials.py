@@ -0,0 +1,482 @@
+"""
+Deterministic financial sanity checks that run before the CFO agent.
+
+The CFO used to receive the deck's financial claims as free text and do the
+arithmetic itself ("$100M Year 1 revenue vs 500,000 waitlist users"). This module
+parses every numeric claim into a structured table (metric, value, year horizon),
+computes the implied figures (ARPU, revenue CAGR, runway) and checks them against
+configurable benchmark ranges with vectorized NumPy operations. Only the flagged
+claims and the computed figures are sent to the model; a claim set that passes
+every check gets a deterministic report and no model call at all.
+
+All checks work on one flat table for any number of decks, so historical decks
+can be screened in bulk:
+    checks = check_claim_sets([deck["financial_claims"] for deck in decks])
+"""
+
+import datetime
+import json
+import os
+import re
+from functools import lru_cache
+
+import numpy as np
+
+# Metric codes (the "metric" column of the claim table)
+REVENUE, USERS, ARPU, GROWTH, BURN, RAISE, VALUATION, MARGIN, CHURN, RETENTION, UNKNOWN = range(11)
+METRIC_NAMES = ("revenue", "users", "arpu", "growth", "burn", "raise", "valuation", "margin", "churn", "retention", "unknown")
+
+# Benchmark ranges; override any of them with a JSON object in ARGUS_CFO_BENCHMARKS
+DEFAULT_BENCHMARKS = {
+    "arpu_min": 1.0,                  # annual revenue per user, in dollars
+    "arpu_max": 50_000.0,
+    "arpu_mismatch": 3.0,             # max ratio between stated and implied ARPU
+    "waitlist_conversion": 0.2,       # share of a waitlist/sign-up count assumed to pay
+    "max_cagr": 3.0,                  # max annual revenue growth (3.0 = +300%/year)
+    "pre_revenue_year1_max": 5_000_000.0,  # max Year 1 revenue for a pre-revenue company
+    "max_margin_pct": 95.0,
+    "min_runway_months": 12.0,
+}
+
+
+def _load_benchmarks() -> dict:
+    benchmarks = dict(DEFAULT_BENCHMARKS)
+    overrides = os.getenv("ARGUS_CFO_BENCHMARKS")
+    if overrides:
+        try:
+            benchmarks.update({k: float(v) for k, v in json.loads(overrides).items() if k in benchmarks})
+        except (ValueError, TypeError, AttributeError):
+            print("Ignoring invalid ARGUS_CFO_BENCHMARKS (expected a JSON object of numbers).")
+    return benchmarks
+
+
+BENCHMARKS = _load_benchmarks()
+
+_SCALES = {"k": 1e3, "thousand": 1e3, "m": 1e6, "mm": 1e6, "mn": 1e6, "million": 1e6,
+           "b": 1e9, "bn": 1e9, "billion": 1e9}
+_NUMBER = r"(\d+(?:,\d{3})*(?:\.\d+)?)\s*(thousand|million|billion|mm|mn|bn|k|m|b)?\b"
+_FIGURE_RE = re.compile(
+    r"(?P<money>\$\s*" + _NUMBER + r")"
+    r"|(?P<multiple>" + r"(\d+(?:\.\d+)?)\s*x\b)"
+    r"|(?P<plain>" + _NUMBER + r"(?P<pct>\s*(?:%|percent\b))?)",
+    re.IGNORECASE
+)
+# "2000 users" and "2025 customers" are counts, not calendar years
+_YEAR_RE = re.compile(
+    r"\b(?:year|yr|y)\s*(\d{1,2})\b"
+    r"|\b(20\d{2})\b(?!\s*(?:[a-z-]+\s+)?(?:users?|customers?|subscribers?|members?|clients?|accounts?|seats?|downloads?|sign[- ]?ups?)\b)",
+    re.IGNORECASE
+)
+# Wording that ties a figure to a future year ("project $100M in Year 1", "$10M by 2027")
+_PROJECTION_RE = re.compile(
+    r"\bproject|\bforecast|\bexpect|\btarget|\bplan|\banticipat|\bwill\b|\bgoal\b|\bby\b|"
+    r"\bin\s+(?:year|yr|y)\s*\d|\bin\s+(?:fy\s*)?20\d{2}\b",
+    re.IGNORECASE
+)
+# Clause boundaries: a year only applies to the figures of its own clause, so the $0 in
+# "$0 revenue but project $100M in Year 1" stays current (commas inside numbers do not split)
+_CLAUSE_RE = re.compile(r";|,(?!\d{3})|\bbut\b|\bwhile\b|\bwhereas\b|\band\b|\bvs\.?|\bversus\b", re.IGNORECASE)
+# Monthly amounts (MRR, "$30/month") and monthly rates ("15% MoM") are told apart,
+# so "$2M ARR growing 15% MoM" keeps its annual revenue
+_MONTHLY_RE = re.compile(r"\bmrr\b|/\s*mo(?:nth)?\b|\bper month\b|\bmonthly\b|\ba month\b", re.IGNORECASE)
+_MONTHLY_RATE_RE = re.compile(r"\bmom\b|month[- ]over[- ]month|/\s*mo(?:nth)?\b|\bper month\b|\bmonthly\b|\ba month\b", re.IGNORECASE)
+_ANNUAL_RE = re.compile(r"\barr\b|\bannual(?:ly)?\b|\bper year\b|/\s*y(?:ea)?r\b", re.IGNORECASE)
+_ANNUAL_RATE_RE = re.compile(r"\byoy\b|year[- ]over[- ]year|\bcagr\b|\bannual(?:ly)?\b|\bper year\b|/\s*y(?:ea)?r\b", re.IGNORECASE)
+_WAITLIST_RE = re.compile(r"wait\s*-?list|sign[- ]?ups?|pre[- ]?orders?|\bleads\b|\binterest", re.IGNORECASE)
+
+# Keywords that give a figure its metric, by the kind of figure they apply to
+_KEYWORDS = {
+    "money": [
+        (ARPU, r"\barpu\b|\bacv\b|per (?:user|customer|seat|subscriber)|/\s*(?:user|customer|seat)"),
+        (BURN, r"\bburn"),
+        (RAISE, r"\brais(?:e|ing)\b|\bround\b|\bfunding\b|\bseed\b|\bseries [a-d]\b"),
+        (VALUATION, r"\bvaluation\b|\bvalued\b|pre-money|post-money"),
+        (REVENUE, r"\brevenue|\barr\b|\bmrr\b|\bsales\b|\bturnover\b|\bbookings\b|\bgmv\b|\bincome\b"),
+    ],
+    "count": [
+        (USERS, r"\busers?\b|\bcustomers?\b|wait\s*-?list|sign[- ]?ups?|subscribers?|downloads?|\bmembers?\b|"
+                r"\bclients?\b|\baccounts?\b|\bseats?\b|\bmau\b|\bdau\b|pre[- ]?orders?"),
+    ],
+    "percent": [
+        (MARGIN, r"\bmargins?\b"),
+        (RETENTION, r"\bretention\b|\bnrr\b|\bndr\b"),
+        (CHURN, r"\bchurn\b"),
+        (GROWTH, r"\bgrowth\b|\bgrow(?:ing|s)?\b|\bmom\b|\byoy\b|\bcagr\b|month[- ]over[- ]month|year[- ]over[- ]year|\bincrease"),
+    ],
+}
+_KEYWORDS = {kind: [(metric, re.compile(pattern, re.IGNORECASE)) for metric, pattern in entries]
+             for kind, entries in _KEYWORDS.items()}
+_PRE_REVENUE_RE = re.compile(
+    r"pre[- ]revenue|\b(?:no|zero)\s+(?:revenue|sales)|\$\s*0(?:\.0+)?\s*(?:in\s+)?(?:revenue|sales|arr|mrr)\b"
+    r"|not (?:yet )?generat\w*\s+(?:any\s+)?revenue",
+    re.IGNORECASE
+)
+
+
+def _number(text: str, scale: str) -> float:
+    return float(text.replace(",", "")) * _SCALES.get((scale or "").lower(), 1.0)
+
+
+def _year_offset(match, projection: bool, reference_year: int) -> float:
+    """
+    The horizon of a year reference, counted from the last completed year: "Year N" (only
+    used in forecasts) is N, a calendar year is its distance from the year before
+    reference_year (past years are 0 or negative, i.e. historical; later ones are a
+    projection horizon). NaN for a current or future calendar year without projection
+    wording around it.
+    """
+    if match.group(1):
+        return float(match.group(1))
+    offset = float(match.group(2)) - (reference_year - 1)
+    return offset if offset <= 0 or projection else np.nan
+
+
+def _clauses(claim: str) -> list:
+    """The (start, end) spans of the clauses of a claim."""
+    bounds = [0] + [pos for m in _CLAUSE_RE.finditer(claim) for pos in (m.start(), m.end())] + [len(claim)]
+    return list(zip(bounds[::2], bounds[1::2]))
+
+
+def _nearest_metric(kind: str, claim: str, start: int, end: int, others=()):
+    """
+    The metric of the keyword closest to a figure, or UNKNOWN. A count only takes a
+    keyword with no other figure in between, so labels such as "Claim 1:" in
+    "Claim 1: $20M ARR with 2,000 users" are not read as user counts.
+    """
+    best, best_distance, best_span = UNKNOWN, None, None
+    for metric, pattern in _KEYWORDS[kind]:
+        for match in pattern.finditer(claim):
+            distance = max(match.start() - end, start - match.end(), 0)
+            if best_distance is None or distance < best_distance:
+                best, best_distance, best_span = metric, distance, match.span()
+    if kind == "count" and best_span is not None:
+        low, high = min(end, best_span[1]), max(start, best_span[0])
+        if any(low <= s and e <= high for s, e in others):
+            return UNKNOWN
+    return best
+
+
+@lru_cache(maxsize=65536)
+def parse_claim(claim: str, reference_year: int) -> tuple:
+    """
+    Extracts the numeric figures of one financial claim.
+
+    Args:
+        claim (str): The claim.
+        reference_year (int): The current calendar year, which calendar years are
+            counted from (an argument so that it is part of the cache key).
+
+    Returns:
+        tuple[tuple]: (metric, value, year, monthly, pipeline) per figure, where value is
+        annualized for revenue/ARPU and monthly for burn, year is the horizon in years
+        from the last completed year (NaN if none, 0 or negative for past years; see
+        _year_offset), monthly marks month-over-month growth rates and pipeline marks
+        user counts that are not paying users (waitlists, sign-ups). Years, percentages
+        and "Nx" multiples are recognized; numbers that are part of a year reference are
+        not treated as figures. A figure only takes a year from its own clause.
+    """
+    years = [(m.start(), m.end(), m) for m in _YEAR_RE.finditer(claim)]
+    clauses = _clauses(claim)
+    monthly = bool(_MONTHLY_RE.search(claim))
+    monthly_rate = bool(_MONTHLY_RATE_RE.search(claim)) and not _ANNUAL_RATE_RE.search(claim)
+    annual = bool(_ANNUAL_RE.search(claim))
+    pipeline = bool(_WAITLIST_RE.search(claim))
+
+    figures = []
+    pre_revenue = bool(_PRE_REVENUE_RE.search(claim))
+    if pre_revenue:
+        figures.append((REVENUE, 0.0, 0.0, False, False))
+
+    matches = [m for m in _FIGURE_RE.finditer(claim) if not any(ys <= m.start() < ye for ys, ye, _ in years)]
+    spans = [m.span() for m in matches]
+    for match in matches:
+        start, end = match.span()
+
+        if match.group("money"):
+            kind, value = "money", _number(match.group(2), match.group(3))
+        elif match.group("multiple"):
+            # "3x growth" is +200%
+            kind, value = "percent", (float(match.group(5)) - 1) * 100
+        elif match.group("pct"):
+            kind, value = "percent", _number(match.group(7), match.group(8))
+        else:
+            kind, value = "count", _number(match.group(7), match.group(8))
+        if pre_revenue and kind == "money" and value == 0:
+            continue  # the "$0 revenue" already recorded above
+
+        metric = _nearest_metric(kind, claim, start, end, [s for s in spans if s != (start, end)])
+        if kind == "count" and metric == UNKNOWN:
+            continue  # e.g. "12 employees", "3 patents": not a financial figure
+        if match.group("multiple") and metric == UNKNOWN:
+            metric = GROWTH
+
+        year = np.nan
+        cs, ce = next((cs, ce) for cs, ce in clauses if cs <= start < ce or start < cs)
+        clause_years = [y for y in years if cs <= y[0] < ce]
+        if clause_years:
+            _, _, ym = min(clause_years, key=lambda y: max(y[0] - end, start - y[1], 0))
+            year = _year_offset(ym, bool(_PROJECTION_RE.search(claim, cs, ce)), reference_year)
+        if metric == UNKNOWN and kind == "money" and not np.isnan(year):
+            metric = REVENUE  # "$100M in Year 1" is a revenue projection
+
+        if metric in (REVENUE, ARPU) and monthly and not annual:
+            value *= 12
+        if metric == BURN and annual and not monthly:
+            value /= 12
+        figures.append((metric, value, year, metric == GROWTH and monthly_rate, metric == USERS and pipeline))
+    return tuple(figures)
+
+
+class ClaimTable:
+    """Column arrays of the figures parsed from many decks' claims."""
+
+    def __init__(self, claim_sets, reference_year: int = None):
+        reference_year = reference_year or datetime.date.today().year
+        deck, claim, metric, value, year, monthly, pipeline = [], [], [], [], [], [], []
+        self.claims = [[str(c) for c in claims or []] for claims in claim_sets]
+        for d, claims in enumerate(self.claims):
+            for c, text in enumerate(claims):
+                for m, v, y, mo, p in parse_claim(text, reference_year):
+                    deck.append(d)
+                    claim.append(c)
+                    metric.append(m)
+                    value.append(v)
+                    year.append(y)
+                    monthly.append(mo)
+                    pipeline.append(p)
+        self.decks = len(self.claims)
+        self.deck = np.array(deck, dtype=np.int64)
+        self.claim = np.array(claim, dtype=np.int64)
+        self.metric = np.array(metric, dtype=np.int64)
+        self.value = np.array(value, dtype=np.float64)
+        self.year = np.array(year, dtype=np.float64)
+        self.monthly = np.array(monthly, dtype=bool)
+        self.pipeline = np.array(pipeline, dtype=bool)
+
+    def __len__(self):
+        return len(self.deck)
+
+    def deck_max(self, mask) -> np.ndarray:
+        """Per-deck maximum of value over the rows in mask (NaN for decks without any)."""
+        out = np.full(self.decks, np.nan)
+        np.fmax.at(out, self.deck[mask], self.value[mask])
+        return out
+
+
+# Flag reasons: (check name, message template)
+_REASONS = {
+    "unclassified": "figure could not be classified automatically",
+    "arpu_range": "implied ARPU of {implied_arpu} per user per year is outside {arpu_min}-{arpu_max}",
+    "arpu_mismatch": "stated ARPU {stated_arpu} is inconsistent with the implied {implied_arpu}",
+    "stated_arpu_range": "stated ARPU is outside {arpu_min}-{arpu_max} per user per year",
+    "cagr": "implied revenue growth of {cagr} per year exceeds {max_cagr}",
+    "pre_revenue": "pre-revenue company projecting {projected_revenue} by year {horizon}",
+    "no_baseline": "projects {projected_revenue} by year {horizon} without a current revenue figure to check it against",
+    "growth": "stated growth rate exceeds {max_cagr} per year (annualized)",
+    "margin": "margin above {max_margin_pct}%",
+    "runway": "runway of {runway_months} months is below {min_runway_months}",
+}
+
+
+def _money(value) -> str:
+    if value is None or np.isnan(value):
+        return "n/a"
+    for scale, suffix in ((1e9, "B"), (1e6, "M"), (1e3, "K")):
+        if abs(value) >= scale:
+            return f"${value / scale:,.1f}{suffix}"
+    return f"${value:,.0f}"
+
+
+def _pct(value) -> str:
+    return "n/a" if value is None or np.isnan(value) else f"{value * 100:,.0f}%"
+
+
+class FinancialCheck:
+    """The outcome of the automated checks for one deck."""
+
+    def __init__(self, claims, rows, flags, figures, benchmarks):
+        """
+        Args:
+            claims (list[str]): The deck's claims.
+            rows (list[tuple]): (claim index, metric name, value, year) per parsed figure.
+            flags (dict[int, list[str]]): Flag reasons per claim index.
+            figures (dict): Computed figures (NaN when not computable).
+            benchmarks (dict): The ranges the claims were checked against.
+        """
+        self.claims = claims
+        self.rows = rows
+        self.flags = flags
+        self.figures = figures
+        self.benchmarks = benchmarks
+
+    @property
+    def numeric_claims(self) -> int:
+        return len({c for c, _, _, _ in self.rows})
+
+    @property
+    def consistent(self) -> bool:
+        """True if at least one figure was parsed and nothing was flagged."""
+        return bool(self.rows) and not self.flags
+
+    def unparsed_claims(self) -> list:
+        """The claims no figure could be parsed from, in deck order."""
+        parsed = {c for c, _, _, _ in self.rows}
+        return [claim for c, claim in enumerate(self.claims) if c not in parsed]
+
+    def flagged_claims(self) -> list:
+        """(claim, reasons) for every flagged claim, in deck order."""
+        return [(self.claims[c], reasons) for c, reasons in sorted(self.flags.items())]
+
+    def figures_text(self) -> str:
+        """The computed figures as a markdown list (only those that could be computed)."""
+        f = self.figures
+        lines = []
+        if not np.isnan(f["current_revenue"]):
+            lines.append(f"- Current annual revenue: {_money(f['current_revenue'])}")
+        if not np.isnan(f["projected_revenue"]):
+            lines.append(f"- Projected annual revenue: {_money(f['projected_revenue'])} in year {f['horizon']:.0f}")
+        if not np.isnan(f["cagr"]):
+            lines.append(f"- Implied revenue growth: {_pct(f['cagr'])} per year")
+        if not np.isnan(f["users"]):
+            kind = "waitlist/sign-ups" if f["pipeline_users"] else "users"
+            lines.append(f"- Largest user count: {f['users']:,.0f} ({kind})")
+        if not np.isnan(f["implied_arpu"]):
+            lines.append(f"- Implied ARPU: {_money(f['implied_arpu'])} per paying user per year")
+        if not np.isnan(f["stated_arpu"]):
+            lines.append(f"- Stated ARPU: {_money(f['stated_arpu'])} per user per year")
+        if not np.isnan(f["runway_months"]):
+            lines.append(f"- Runway: {f['runway_months']:.1f} months ({_money(f['raise'])} raise / {_money(f['burn'])} monthly burn)")
+        return "\n".join(lines) or "- No ratios could be computed from the claims."
+
+    def report(self) -> str:
+        """The CFO report for a consistent claim set (no model call needed)."""
+        table = ["| Claim | Metric | Value | Horizon |", "|---|---|---|---|"]
+        for c, metric, value, year in self.rows:
+            shown = f"{value:,.0f}" if metric == "users" else f"{value:,.1f}%" if metric in ("growth", "margin", "churn", "retention") else _money(value)
+            horizon = "n/a" if np.isnan(year) else "current" if year == 0 else "historical" if year < 0 else f"year {year:.0f}"
+            table.append(f"| {self.claims[c]} | {metric} | {shown} | {horizon} |")
+        other = len(self.claims) - self.numeric_claims
+        note = f" {other} qualitative claim(s) contain no figures to check." if other else ""
+        return (
+            "**Financial Sanity Check (automated)**: all "
+            f"{self.numeric_claims} numeric claim(s) are consistent with each other and within the benchmark "
+            f"ranges (ARPU {_money(self.benchmarks['arpu_min'])}-{_money(self.benchmarks['arpu_max'])}, "
+            f"revenue growth up to {_pct(self.benchmarks['max_cagr'])} per year).{note}\n\n"
+            + "\n".join(table)
+            + "\n\n**Computed figures**\n" + self.figures_text()
+        )
+
+
+def check_claim_sets(claim_sets, benchmarks: dict = None, reference_year: int = None) -> list:
+    """
+    Runs the financial sanity checks over many decks at once.
+
+    Args:
+        claim_sets (list[list[str]]): Each deck's financial_claims.
+        benchmarks (dict): Overrides for BENCHMARKS.
+        reference_year (int): The current calendar year. Defaults to today's.
+
+    Returns:
+        list[FinancialCheck]: One result per deck, in input order.
+    """
+    b = {**BENCHMARKS, **(benchmarks or {})}
+    t = ClaimTable(claim_sets, reference_year)
+    m, v, y = t.metric, t.value, t.year
+
+    # Per-deck aggregates
+    current = (m == REVENUE) & (np.isnan(y) | (y <= 0))
+    projected = (m == REVENUE) & (y >= 1)
+    # The baseline is the latest current or historical revenue figure (undated ones count as current)
+    dated = np.nan_to_num(y, nan=0.0)
+    base_year = np.full(t.decks, np.nan)
+    np.fmax.at(base_year, t.deck[current], dated[current])
+    at_base = current & (dated == base_year[t.deck])
+    current_revenue = t.deck_max(at_base)
+    horizon = np.full(t.decks, np.nan)
+    np.fmax.at(horizon, t.deck[projected], y[projected])
+    span = horizon - base_year
+    at_horizon = projected & (y == horizon[t.deck])
+    projected_revenue = t.deck_max(at_horizon)
+    users = t.deck_max(m == USERS)
+    pipeline_users = np.zeros(t.decks, dtype=bool)
+    largest_users = (m == USERS) & (v == users[t.deck])
+    np.logical_or.at(pipeline_users, t.deck[largest_users], t.pipeline[largest_users])
+    stated_arpu = t.deck_max(m == ARPU)
+    burn = t.deck_max(m == BURN)
+    raise_ = t.deck_max(m == RAISE)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        revenue = np.where(np.isnan(projected_revenue), current_revenue, projected_revenue)
+        paying = users * np.where(pipeline_users, b["waitlist_conversion"], 1.0)
+        implied_arpu = np.where(paying > 0, revenue / paying, np.nan)
+        cagr = np.where(current_revenue > 0, (projected_revenue / current_revenue) ** (1 / span) - 1, np.nan)
+        runway = np.where(burn > 0, raise_ / burn, np.nan)
+        # Annualized stated growth rates (month-over-month compounds over 12 months)
+        growth = np.where(t.monthly, (1 + v / 100) ** 12 - 1, v / 100)
+
+    # Deck-level checks (NaN compares False, so missing figures never flag)
+    deck_flags = {
+        "arpu_range": (implied_arpu < b["arpu_min"]) | (implied_arpu > b["arpu_max"]),
+        "arpu_mismatch": (np.fmax(stated_arpu, implied_arpu) / np.fmin(stated_arpu, implied_arpu)) > b["arpu_mismatch"],
+        "cagr": cagr > b["max_cagr"],
+        "pre_revenue": (current_revenue == 0)
+                       & (projected_revenue > b["pre_revenue_year1_max"] * (1 + b["max_cagr"]) ** (span - 1)),
+        # A projection with nothing to compare it to cannot pass the checks on its own
+        "no_baseline": ~np.isnan(projected_revenue) & np.isnan(current_revenue),
+        "runway": runway < b["min_runway_months"],
+    }
+    # The figures each deck-level check implicates
+    implicated = {
+        "arpu_range": (m == USERS) | at_horizon | (at_base & np.isnan(projected_revenue[t.deck])),
+        "arpu_mismatch": (m == ARPU) | (m == USERS),
+        "cagr": at_base | at_horizon,
+        "pre_revenue": at_base | at_horizon,
+        "no_baseline": at_horizon,
+        "runway": (m == BURN) | (m == RAISE),
+    }
+    row_flags = {check: deck_flags[check][t.deck] & implicated[check] for check in deck_flags}
+    # Row-level checks
+    row_flags.update({
+        "unclassified": m == UNKNOWN,
+        "stated_arpu_range": (m == ARPU) & ((v < b["arpu_min"]) | (v > b["arpu_max"])),
+        "growth": (m == GROWTH) & (growth > b["max_cagr"]),
+        "margin": (m == MARGIN) & (v > b["max_margin_pct"]),
+    })
+
+    any_flag = np.zeros(len(t), dtype=bool)
+    for mask in row_flags.values():
+        any_flag |= mask
+
+    results = []
+    deck_rows = np.searchsorted(t.deck, np.arange(t.decks + 1))
+    for d in range(t.decks):
+        figures = {
+            "current_revenue": current_revenue[d], "projected_revenue": projected_revenue[d],
+            "horizon": horizon[d], "cagr": cagr[d], "users": users[d], "pipeline_users": bool(pipeline_users[d]),
+            "implied_arpu": implied_arpu[d], "stated_arpu": stated_arpu[d],
+            "burn": burn[d], "raise": raise_[d], "runway_months": runway[d],
+        }
+        values = {
+            "implied_arpu": _money(implied_arpu[d]), "stated_arpu": _money(stated_arpu[d]),
+            "arpu_min": _money(b["arpu_min"]), "arpu_max": _money(b["arpu_max"]),
+            "cagr": _pct(cagr[d]), "max_cagr": _pct(b["max_cagr"]),
+            "projected_revenue": _money(projected_revenue[d]), "horizon": f"{horizon[d]:.0f}",
+            "max_margin_pct": f"{b['max_margin_pct']:g}", "runway_months": f"{runway[d]:.1f}",
+            "min_runway_months": f"{b['min_runway_months']:g}",
+        }
+        flags = {}
+        start, end = deck_rows[d], deck_rows[d + 1]
+        for i in np.flatnonzero(any_flag[start:end]) + start:
+            reasons = flags.setdefault(int(t.claim[i]), [])
+            for check, mask in row_flags.items():
+                reason = _REASONS[check].format(**values)
+                if mask[i] and reason not in reasons:
+                    reasons.append(reason)
+        rows = [(int(t.claim[i]), METRIC_NAMES[t.metric[i]], float(t.value[i]), float(t.year[i])) for i in range(start, end)]
+        results.append(FinancialCheck(t.claims[d], rows, flags, figures, b))
+    return results
+
+
+def check_claims(claims, benchmarks: dict = None, reference_year: int = None) -> FinancialCheck:
+    """Runs the financial sanity checks for a single deck's claims."""
+    return check_claim_sets([claims], benchmarks, reference_year)[0]
@@ -1,48 +1,323 @@
+import hashlib
+import inspect
+import io
 import os
+import random
+import tempfile
 import time
-from google import genai
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from src.modules.cache import SQLiteCache, cache_path
+
+# Files are re-uploaded this long before the File API would expire them,
+# so a reused file never expires in the middle of a run.
+EXPIRY_SAFETY_MARGIN = 15 * 60
+
+# Polling schedule for wait_for_active: start short, back off exponentially
+# (with jitter) up to POLL_MAX_DELAY, and give up after POLL_TIMEOUT seconds.
+POLL_INITIAL_DELAY = 0.25
+POLL_MAX_DELAY = 5.0
+POLL_BACKOFF = 1.6
+POLL_TIMEOUT = float(os.getenv("ARGUS_UPLOAD_TIMEOUT", "300"))
+
+
+class IngestionTimeoutError(TimeoutError):
+    """Raised when an uploaded file does not become ACTIVE before the deadline."""
+
+
+def file_sha256(file_path) -> str:
+    """Returns the hex SHA-256 digest of a file's bytes."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def content_sha256(source) -> str:
+    """
+    Returns the hex SHA-256 digest of in-memory content.
+
+    Args:
+        source: bytes, bytearray, memoryview or a seekable binary file-like object.
+            A file-like object is read from its current position and rewound afterwards.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        # hashlib reads buffers in place, so a memoryview is hashed without a copy
+        return hashlib.sha256(source).hexdigest()
+
+    digest = hashlib.sha256()
+    start = source.tell()
+    for chunk in iter(lambda: source.read(1024 * 1024), b""):
+        digest.update(chunk)
+    source.seek(start)
+    return digest.hexdigest()
+
+
+def as_stream(source):
+    """
+    Wraps in-memory content in a binary stream for the File API, avoiding copies where possible.
+
+    bytes are shared by io.BytesIO until written to; a memoryview over a whole bytes
+    object reuses that object. File-like objects are returned as they are.
+    """
+    if isinstance(source, memoryview):
+        if isinstance(source.obj, bytes) and source.contiguous and source.nbytes == len(source.obj):
+            source = source.obj
+        else:
+            source = source.tobytes()
+    if isinstance(source, bytearray):
+        source = bytes(source)
+    if isinstance(source, bytes):
+        return io.BytesIO(source)
+    return source
+
+
+def sniff_mime_type(stream):
+    """Guesses the mime type of a stream from its first bytes (PDF only), or None."""
+    start = stream.tell()
+    head = stream.read(5)
+    stream.seek(start)
+    return "application/pdf" if head == b"%PDF-" else None
+
+
+def accepts_streams(upload) -> bool:
+    """True if a Files.upload method takes file objects (older google-genai releases only take paths)."""
+    try:
+        annotation = inspect.signature(upload).parameters["file"].annotation
+    except (KeyError, TypeError, ValueError):
+        return False
+    return "IOBase" in str(annotation)
+
+
+def file_state(file_object) -> str:
+    """Returns the processing state of a File API object as a plain string."""
+    # In the new SDK, state is often an enum, let's convert to string to be safe or access .name
+    return file_object.state.name if hasattr(file_object.state, 'name') else str(file_object.state)
+
+
+class UploadRegistry:
+    """
+    Local record of uploaded files, keyed by the SHA-256 of their bytes.
+
+    Lets an identical deck reuse the File API object from a previous upload
+    instead of uploading and polling again. Entries expire together with the
+    remote file. Every GoogleIngestion shares the same on-disk registry by default,
+    so app.py and verify_system.py see each other's uploads.
+    """
+
+    def __init__(self, path=None):
+        self._cache = SQLiteCache(path or cache_path("uploads.sqlite3"))
+
+    def lookup(self, sha256: str):
+        """Returns the stored {"name", "uri", "expiration_time"} for a digest, or None."""
+        return self._cache.get(f"sha256:{sha256}")
+
+    def sha256_for_uri(self, uri: str):
+        """Returns the content digest of a previously registered file URI, or None."""
+        return self._cache.get(f"uri:{uri}")
+
+    def remember(self, sha256: str, file_object):
+        """Registers an active file object under the digest of its content."""
+        expiration = getattr(file_object, "expiration_time", None)
+        if expiration is not None:
+            ttl = (expiration - datetime.now(timezone.utc)).total_seconds() - EXPIRY_SAFETY_MARGIN
+            if ttl <= 0:
+                return
+        else:
+            # The File API keeps uploads for 48 hours
+            ttl = 48 * 3600 - EXPIRY_SAFETY_MARGIN
+
+        entry = {
+            "name": file_object.name,
+            "uri": file_object.uri,
+            "expiration_time": expiration.isoformat() if expiration else None,
+        }
+        self._cache.set(f"sha256:{sha256}", entry, ttl=ttl)
+        self._cache.set(f"uri:{file_object.uri}", sha256, ttl=ttl)
+
+    def forget(self, sha256: str):
+        """Drops a digest whose remote file has expired or been deleted."""
+        entry = self.lookup(sha256)
+        self._cache.delete(f"sha256:{sha256}")
+        if entry:
+            self._cache.delete(f"uri:{entry['uri']}")
+
+
+_default_registry = None
+
+
+def get_upload_registry() -> UploadRegistry:
+    """Returns the process-wide UploadRegistry backed by the shared cache directory."""
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = UploadRegistry()
+    return _default_registry
+
 
 class GoogleIngestion:
-    def __init__(self):
-        """Initialize and configure the Google GenAI client."""
+    def __init__(self, registry=None):
+        """
+        Initialize and configure the Google GenAI client.
+
+        Args:
+            registry (UploadRegistry): Optional upload registry. Defaults to the shared one.
+        """
         api_key = os.getenv("GOOGLE_API_KEY")
         if not api_key:
             raise ValueError("GOOGLE_API_KEY environment variable not found.")
+        # Imported here: google.genai is slow to import and only needed once a deck is uploaded
+        from google import genai
         self.client = genai.Client(api_key=api_key)
+        self.registry = registry or get_upload_registry()
 
-    def upload_to_gemini(self, file_path, mime_type=None):
+    def upload_to_gemini(self, file_path, mime_type=None, display_name=None):
         """
         Uploads a file to the Google GenAI File API and waits for it to be active.
+
+        If a file with identical content was uploaded before and is still
+        available remotely, that file is reused instead of uploading again.
+
+        In-memory content (e.g. a Streamlit upload) is streamed to the File API
+        directly, without writing it to disk first.
         
         Args:
-            file_path (str): The path to the file to upload.
-            mime_type (str): Optional mime type (deprecated/inferred in new SDK usually, but kept for sig compatibility).
+            file_path: The path to the file to upload, or its content as bytes,
+                a memoryview or a seekable binary file-like object.
+            mime_type (str): Optional mime type. Required for in-memory content
+                unless it can be detected (PDFs are).
+            display_name (str): Optional name shown in the File API (e.g. the original file name).
 
         Returns:
             The uploaded and active file object.
         """
-        print(f"Uploading file: {file_path}...")
-        # The new SDK's upload method. file argument is used (not path).
-        file_object = self.client.files.upload(file=file_path)
+        in_memory = not isinstance(file_path, (str, os.PathLike))
+        if in_memory:
+            source = as_stream(file_path)
+            digest = content_sha256(source)
+            label = display_name or "in-memory upload"
+        else:
+            source = file_path
+            digest = file_sha256(file_path)
+            label = file_path
+
+        reused = self._reuse_existing(digest)
+        if reused is not None:
+            return reused
+
+        print(f"Uploading file: {label}...")
+        if in_memory:
+            file_object = self._upload_stream(source, mime_type, display_name)
+        else:
+            # The new SDK's upload method. file argument is used (not path).
+            file_object = self.client.files.upload(file=file_path, config=self._upload_config(mime_type, display_name))
         print(f"Upload complete: {file_object.name}")
         
         # Wait for the file to be active
-        return self.wait_for_active(file_object)
+        file_object = self.wait_for_active(file_object)
+        self.registry.remember(digest, file_object)
+        return file_object
+
+    @staticmethod
+    def _upload_config(mime_type=None, display_name=None):
+        config = {}
+        if mime_type:
+            config["mime_type"] = mime_type
+        if display_name:
+            config["display_name"] = display_name
+        return config or None
+
+    def _upload_stream(self, stream, mime_type=None, display_name=None):
+        """Uploads a binary stream, via a private temp file if the SDK cannot upload streams."""
+        mime_type = mime_type or sniff_mime_type(stream)
+        if not mime_type:
+            raise ValueError("mime_type is required to upload in-memory content.")
+        config = self._upload_config(mime_type, display_name)
+
+        if accepts_streams(self.client.files.upload):
+            return self.client.files.upload(file=stream, config=config)
+
+        # Unique per request, so concurrent uploads with the same display name never collide
+        suffix = os.path.splitext(display_name or "")[1]
+        with tempfile.NamedTemporaryFile(prefix="argus-upload-", suffix=suffix, delete=False) as f:
+            for chunk in iter(lambda: stream.read(1024 * 1024), b""):
+                f.write(chunk)
+            temp_path = f.name
+        try:
+            return self.client.files.upload(file=temp_path, config=config)
+        finally:
+            os.remove(temp_path)
+
+    def _reuse_existing(self, digest):
+        """Returns the registered file for a digest if it is still usable, else None."""
+        entry = self.registry.lookup(digest)
+        if entry is None:
+            return None
+
+        try:
+            # Cheap metadata call to confirm the remote file still exists
+            file_object = self.client.files.get(name=entry["name"])
+        except Exception as e:
+            print(f"Registered upload {entry['name']} is no longer available ({e}); re-uploading.")
+            self.registry.forget(digest)
+            return None
 
-    def wait_for_active(self, file_object):
+        state = file_state(file_object)
+        if state == "ACTIVE":
+            print(f"Reusing previous upload: {file_object.name}")
+            return file_object
+        if state == "PROCESSING":
+            return self.wait_for_active(file_object)
+
+        self.registry.forget(digest)
+        return None
+
+    def upload_many(self, file_paths, mime_type=None, max_workers=4):
+        """
+        Uploads several files concurrently and waits for all of them to be active.
+
+        Args:
+            file_paths (list): The files to upload (paths or in-memory content, see upload_to_gemini).
+            mime_type (str): Optional mime type applied to every file.
+            max_workers (int): Maximum number of uploads/polls in flight.
+
+        Returns:
+            list: The active file objects, in the same order as file_paths.
+        """
+        file_paths = list(file_paths)
+        if not file_paths:
+            return []
+
+        workers = max(1, min(max_workers, len(file_paths)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="argus-upload") as pool:
+            return list(pool.map(
+                lambda path: self.upload_to_gemini(path, mime_type=mime_type),
+                file_paths
+            ))
+
+    def wait_for_active(self, file_object, timeout=None):
         """
         Waits for the uploaded file to become active.
+
+        Polls with exponential backoff and jitter, so small files are picked up
+        within a fraction of a second while large ones are not polled needlessly.
         
         Args:
             file_object: The file object returned by upload.
+            timeout (float): Seconds to wait before giving up. Defaults to POLL_TIMEOUT.
             
         Returns:
             The updated file object once it is active.
             
         Raises:
             Exception: If the file processing fails.
+            IngestionTimeoutError: If the file is not active before the deadline.
         """
         print("Waiting for file processing...", end="")
+
+        deadline = time.monotonic() + (timeout if timeout is not None else POLL_TIMEOUT)
+        delay = POLL_INITIAL_DELAY
         
         while True:
             # Refresh file object
@@ -50,23 +325,31 @@ class GoogleIngestion:
             
             # Check state. safely accessing state.name or similar if it's an enum
             # The prompt requests: file.state.name == "ACTIVE"
-            # In the new SDK, state is often an enum, let's convert to string to be safe or access .name
-            current_state = file_object.state.name if hasattr(file_object.state, 'name') else str(file_object.state)
+            current_state = file_state(file_object)
             
-            if current_state == "PROCESSING":
-                print(".", end="", flush=True)
-                time.sleep(2)
-            elif current_state == "ACTIVE":
+            if current_state == "ACTIVE":
                 print() # Newline
                 print("File is active and ready for use.")
                 return file_object
             elif current_state == "FAILED":
                 print()
                 raise Exception(f"File processing failed with state: {current_state}")
+            elif current_state == "PROCESSING":
+                print(".", end="", flush=True)
             else:
                 # Handle unknown states or just check loop again? 
                 # Assuming standard lifecycle: PROCESSING -> ACTIVE or FAILED
                 # Example: STATE_UNSPECIFIED could happen?
                 print(f"[{current_state}]", end="", flush=True)
-                time.sleep(2)
 
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                print()
+                raise IngestionTimeoutError(
+                    f"File {file_object.name} still {current_state} after waiting for it to become ACTIVE."
+                )
+
+            # Equal jitter (half the delay fixed, half random) keeps concurrent waiters from
+            # polling in lockstep without ever polling faster than delay / 2
+            time.sleep(min(random.uniform(delay / 2, delay), remaining))
+            delay = min(delay * POLL_BACKOFF, POLL_MAX_DELAY)
@@ -0,0 +1,94 @@
+"""
+Incremental extraction of array items from a JSON object that is still being streamed.
+
+The Router writes its job order as one JSON object. The founders and competitors
+arrays are usually complete long before the model has finished the rest of the
+object, so instead of waiting for json.loads on the full text, the streamed text is
+fed through StreamingArrayParser, which reports every string item of the tracked
+top-level arrays as soon as its closing quote arrives. Text before the first "{"
+(such as a ```json fence) is ignored. The final job order is still parsed from the
+complete response; this parser only lets work start early.
+"""
+
+import json
+
+
+class StreamingArrayParser:
+    """Reports string items of selected top-level arrays while JSON text streams in."""
+
+    def __init__(self, keys):
+        """
+        Args:
+            keys (iterable[str]): Top-level keys whose array items should be reported.
+        """
+        self.keys = set(keys)
+        self._stack = []        # open containers: "{" or "["
+        self._in_string = False
+        self._escape = False
+        self._chars = []        # raw characters of the current string
+        self._last_string = None
+        self._key = None        # the current top-level key
+        self._started = False
+        self._done = False
+
+    def feed(self, text: str) -> list:
+        """
+        Consumes the next chunk of streamed text.
+
+        Returns:
+            list[tuple[str, str]]: (key, item) for every array item completed in this chunk.
+        """
+        items = []
+        for ch in text:
+            if self._done:
+                break
+            if not self._started:
+                if ch == "{":
+                    self._started = True
+                    self._stack.append("{")
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                    self._chars.append(ch)
+                elif ch == "\\":
+                    self._escape = True
+                    self._chars.append(ch)
+                elif ch == '"':
+                    self._in_string = False
+                    item = self._end_string()
+                    if item is not None:
+                        items.append(item)
+                else:
+                    self._chars.append(ch)
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                self._chars = []
+            elif ch == ":" and len(self._stack) == 1:
+                self._key = self._last_string
+            elif ch in "{[":
+                self._stack.append(ch)
+            elif ch in "}]":
+                if self._stack:
+                    self._stack.pop()
+                if not self._stack:
+                    self._done = True
+            elif ch == "," and len(self._stack) == 1:
+                self._key = None
+        return items
+
+    def _end_string(self):
+        raw = "".join(self._chars)
+        try:
+            value = json.loads(f'"{raw}"')
+        except json.JSONDecodeError:
+            value = raw
+
+        self._last_string = value
+        # A string directly inside a tracked top-level array is an item
+        if len(self._stack) == 2 and self._stack[-1] == "[" and self._key in self.keys:
+            return self._key, value
+        return None
@@ -0,0 +1,407 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+from langchain_core.messages import AIMessage
+
+from src.modules.cache import SQLiteCache, cache_path
+from src.modules.ingestion import get_upload_registry
+from src.modules.resilience import CHARS_PER_TOKEN, acall_with_retry, call_with_retry
+from src.modules.tracing import record_llm_usage, span
+
+DEFAULT_MODEL = os.getenv("ARGUS_MODEL", "gemini-3-flash-preview")
+# Faster, cheaper model for stages that mostly compute or reformat
+LIGHT_MODEL = os.getenv("ARGUS_LIGHT_MODEL", "gemini-2.5-flash-lite")
+
+# Per-node model tiering. The Router (multimodal extraction), the search agents and
+# the Critic (hallucination checks) keep the strong model; the CFO (arithmetic on a
+# few claims) and the Writer (mostly reformatting validated text) use the light one.
+#   ARGUS_MODEL_TIERING=0         every node uses DEFAULT_MODEL
+#   ARGUS_MODEL_<NODE>=<model>    pin one node to a model (e.g. ARGUS_MODEL_WRITER)
+NODE_TIERS = {
+    "router": "strong",
+    "sherlock": "strong",
+    "researcher": "strong",
+    "cfo": "light",
+    "critic": "strong",
+    "writer": "light",
+}
+MODEL_TIERING = os.getenv("ARGUS_MODEL_TIERING", "1") != "0"
+# Set by set_node_models (e.g. by benchmarks comparing configurations)
+_node_models = {}
+
+# Opt-in response cache for deterministic (temperature 0) calls.
+#   ARGUS_LLM_CACHE=1                   enable the cache
+#   ARGUS_LLM_CACHE_BYPASS=critic,...   nodes that always call the model
+#   ARGUS_LLM_CACHE_MAX_ENTRIES=2000    size bound before oldest entries are evicted
+LLM_CACHE_ENABLED = os.getenv("ARGUS_LLM_CACHE", "0") == "1"
+LLM_CACHE_BYPASS = {n.strip() for n in os.getenv("ARGUS_LLM_CACHE_BYPASS", "").split(",") if n.strip()}
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("ARGUS_LLM_CACHE_MAX_ENTRIES", "2000"))
+
+_response_cache = None
+
+# Process-wide client registry. Building a ChatGoogleGenerativeAI creates a new
+# genai.Client (and HTTP connection pool), so every node call used to pay client
+# setup plus a fresh TLS handshake. Clients are keyed by model + parameters and
+# shared by all nodes, threads and runs in the process.
+_clients = {}
+_clients_lock = threading.Lock()
+
+# Constructor used for new clients; swapped out by set_llm_factory (e.g. for offline benchmarks).
+# None means ChatGoogleGenerativeAI, imported on first use since langchain_google_genai
+# takes over a second to import and most entry points don't need it until the first call.
+_llm_factory = None
+
+
+def _default_factory():
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    return ChatGoogleGenerativeAI
+
+
+def _registry_key(model: str, params: dict) -> tuple:
+    return (model, tuple(sorted((k, repr(v)) for k, v in params.items())))
+
+
+def get_llm(model: str = DEFAULT_MODEL, temperature: float = 0, **params):
+    """
+    Returns a shared ChatGoogleGenerativeAI instance for the given configuration.
+
+    The same instance is returned for identical (model, temperature, params),
+    so its underlying HTTP connections are pooled and reused across calls.
+    Safe to call concurrently from the parallel agents and from batch runs.
+
+    Args:
+        model (str): The Gemini model name.
+        temperature (float): Sampling temperature.
+        **params: Extra keyword arguments for ChatGoogleGenerativeAI.
+
+    Returns:
+        ChatGoogleGenerativeAI: The shared client.
+    """
+    params = {"temperature": temperature, **params}
+    key = _registry_key(model, params)
+
+    llm = _clients.get(key)
+    if llm is not None:
+        return llm
+
+    with _clients_lock:
+        # Double-checked so concurrent first calls build only one client
+        llm = _clients.get(key)
+        if llm is None:
+            factory = _llm_factory or _default_factory()
+            llm = factory(
+                model=model,
+                google_api_key=os.getenv("GOOGLE_API_KEY"),
+                **params
+            )
+            _clients[key] = llm
+        return llm
+
+
+def model_for(node: str) -> str:
+    """
+    Returns the model a node runs on.
+
+    Precedence: ARGUS_MODEL_<NODE>, then set_node_models(), then the node's tier
+    (DEFAULT_MODEL for every node when tiering is disabled).
+    """
+    override = os.getenv(f"ARGUS_MODEL_{node.upper()}") or _node_models.get(node)
+    if override:
+        return override
+    if MODEL_TIERING and NODE_TIERS.get(node) == "light":
+        return LIGHT_MODEL
+    return DEFAULT_MODEL
+
+
+def node_models() -> dict:
+    """The effective model of every node, e.g. for display or benchmark reports."""
+    return {node: model_for(node) for node in NODE_TIERS}
+
+
+def set_node_models(models=None):
+    """
+    Pins nodes to models for this process.
+
+    Args:
+        models (dict): {node: model}. None clears every pin.
+    """
+    _node_models.clear()
+    _node_models.update(models or {})
+
+
+def get_node_llm(node: str, temperature: float = 0, **params):
+    """Returns the shared client for the model configured for a node (see model_for)."""
+    return get_llm(model_for(node), temperature=temperature, **params)
+
+
+def clear_llm_clients():
+    """Drops every cached client (e.g. after rotating GOOGLE_API_KEY)."""
+    with _clients_lock:
+        _clients.clear()
+
+
+def set_llm_factory(factory=None):
+    """
+    Replaces the chat model constructor used by get_llm.
+
+    Args:
+        factory: A callable accepting (model=..., google_api_key=..., **params)
+            and returning a LangChain chat model. None restores ChatGoogleGenerativeAI.
+    """
+    global _llm_factory
+    with _clients_lock:
+        _llm_factory = factory
+        _clients.clear()
+
+
+def get_response_cache():
+    """Returns the on-disk LLM response cache, or None when caching is disabled."""
+    global _response_cache
+    if not LLM_CACHE_ENABLED:
+        return None
+    if _response_cache is None:
+        with _clients_lock:
+            if _response_cache is None:
+                _response_cache = SQLiteCache(cache_path("llm_cache.sqlite3"), max_entries=LLM_CACHE_MAX_ENTRIES)
+    return _response_cache
+
+
+def _normalize_content(content):
+    """Replaces attached file URIs with the hash of the file's content."""
+    if isinstance(content, str):
+        return content
+
+    registry = get_upload_registry()
+    parts = []
+    for part in content:
+        if isinstance(part, dict) and "file_uri" in part:
+            # URIs change on every upload; the content hash does not.
+            # Unknown files (not uploaded via GoogleIngestion) fall back to the URI.
+            uri = part["file_uri"]
+            digest = registry.sha256_for_uri(uri)
+            part = {k: v for k, v in part.items() if k != "file_uri"}
+            part["file"] = f"sha256:{digest}" if digest else f"uri:{uri}"
+        parts.append(part)
+    return parts
+
+
+def response_cache_key(llm, messages) -> str:
+    """Builds the cache key from the model name, prompts and attached file content hashes."""
+    payload = {
+        "model": llm.model,
+        "temperature": llm.temperature,
+        "messages": [[m.type, _normalize_content(m.content)] for m in messages],
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _cache_for(node: str, llm, use_cache: bool):
+    """Returns the response cache if this call may use it, else None."""
+    cache = get_response_cache()
+    if cache is None or not use_cache or node in LLM_CACHE_BYPASS or llm.temperature != 0:
+        return None
+    return cache
+
+
+def _cached_message(cached: dict):
+    return AIMessage(
+        content=cached["content"],
+        usage_metadata=cached.get("usage_metadata"),
+        response_metadata={"argus_cache_hit": True},
+    )
+
+
+def _cache_lookup(cache, llm, messages) -> tuple:
+    """(key, cached entry or None); the key reads the upload registry, so both touch SQLite."""
+    key = response_cache_key(llm, messages)
+    return key, cache.get(key)
+
+
+def _store_response(cache, key: str, response):
+    cache.set(key, {
+        "content": response.content,
+        "usage_metadata": getattr(response, "usage_metadata", None),
+    })
+
+
+def prompt_chars(messages) -> int:
+    """Total characters of text sent in the messages (attached files excluded)."""
+    total = 0
+    for m in messages:
+        if isinstance(m.content, str):
+            total += len(m.content)
+        else:
+            total += sum(len(p.get("text", "")) for p in m.content if isinstance(p, dict))
+    return total
+
+
+def invoke_llm(node: str, llm, messages, use_cache=True):
+    """
+    Invokes the model for a node, going through the response cache when enabled.
+
+    Only temperature-0 calls are cached, since only those are reproducible.
+    Model calls go through the shared Gemini rate limiter and retry policy
+    (the client's own retries are disabled so the two do not multiply).
+    Each call is recorded as an "llm" span with prompt size, token counts and cache hits.
+
+    Args:
+        node (str): Name of the calling node (used for the bypass switch).
+        llm: The chat model returned by get_llm().
+        messages (list): The messages to send.
+        use_cache (bool): Set to False to force a model call for this invocation.
+
+    Returns:
+        The model response (an AIMessage).
+
+    Raises:
+        APIError: If the call failed after retries or ran past its deadline.
+    """
+    chars = prompt_chars(messages)
+    with span(node, "llm", model=llm.model, prompt_chars=chars) as s:
+        cache = _cache_for(node, llm, use_cache)
+        key = response_cache_key(llm, messages) if cache is not None else None
+        cached = cache.get(key) if cache is not None else None
+
+        if cached is not None:
+            response = _cached_message(cached)
+        else:
+            response = call_with_retry(
+                "gemini", node,
+                lambda remaining: llm.invoke(messages, timeout=remaining, max_retries=1),
+                tokens=chars // CHARS_PER_TOKEN
+            )
+            if cache is not None:
+                _store_response(cache, key, response)
+
+        s.set(cache_hit=cached is not None)
+        record_llm_usage(s, response)
+        return response
+
+
+async def ainvoke_llm(node: str, llm, messages, use_cache=True):
+    """Async variant of invoke_llm, using the model's ainvoke."""
+    chars = prompt_chars(messages)
+    with span(node, "llm", model=llm.model, prompt_chars=chars) as s:
+        cache = _cache_for(node, llm, use_cache)
+        # SQLite lookups run off the event loop, so concurrent runs are not stalled
+        key, cached = await asyncio.to_thread(_cache_lookup, cache, llm, messages) if cache is not None else (None, None)
+
+        if cached is not None:
+            response = _cached_message(cached)
+        else:
+            response = await acall_with_retry(
+                "gemini", node,
+                lambda remaining: llm.ainvoke(messages, timeout=remaining, max_retries=1),
+                tokens=chars // CHARS_PER_TOKEN
+            )
+            if cache is not None:
+                await asyncio.to_thread(_store_response, cache, key, response)
+
+        s.set(cache_hit=cached is not None)
+        record_llm_usage(s, response)
+        return response
+
+
+def _chunk_text(content) -> str:
+    if isinstance(content, str):
+        return content
+    return "".join(
+        part if isinstance(part, str) else part.get("text", "")
+        for part in content
+        if isinstance(part, str) or isinstance(part, dict)
+    )
+
+
+def _merge_chunks(chunks):
+    if not chunks:
+        return AIMessage(content="")
+    response = chunks[0]
+    for chunk in chunks[1:]:
+        response = response + chunk
+    return response
+
+
+def stream_llm(node: str, llm, messages, on_text, on_attempt=None, use_cache=True):
+    """
+    Like invoke_llm, but streams the response and hands every text chunk to on_text as it arrives.
+
+    Lets a node act on a partial response (e.g. the Router starting searches for
+    entities it has already written out). A cached response is delivered as one chunk.
+
+    Args:
+        node (str): Name of the calling node.
+        llm: The chat model returned by get_llm().
+        messages (list): The messages to send.
+        on_text: Callable receiving each new chunk of text.
+        on_attempt: Optional callable invoked before every (re)try, so a consumer of
+            on_text can reset its state after a stream failed part way through.
+        use_cache (bool): Set to False to force a model call for this invocation.
+
+    Returns:
+        The complete model response.
+
+    Raises:
+        APIError: If the call failed after retries or ran past its deadline.
+    """
+    chars = prompt_chars(messages)
+    with span(node, "llm", model=llm.model, prompt_chars=chars, streamed=True) as s:
+        cache = _cache_for(node, llm, use_cache)
+        key = response_cache_key(llm, messages) if cache is not None else None
+        cached = cache.get(key) if cache is not None else None
+
+        if cached is not None:
+            response = _cached_message(cached)
+            on_text(_chunk_text(response.content))
+        else:
+            def attempt(remaining):
+                if on_attempt is not None:
+                    on_attempt()
+                chunks = []
+                for chunk in llm.stream(messages, timeout=remaining, max_retries=1):
+                    chunks.append(chunk)
+                    text = _chunk_text(chunk.content)
+                    if text:
+                        on_text(text)
+                return _merge_chunks(chunks)
+
+            response = call_with_retry("gemini", node, attempt, tokens=chars // CHARS_PER_TOKEN)
+            if cache is not None:
+                _store_response(cache, key, response)
+
+        s.set(cache_hit=cached is not None)
+        record_llm_usage(s, response)
+        return response
+
+
+async def astream_llm(node: str, llm, messages, on_text, on_attempt=None, use_cache=True):
+    """Async variant of stream_llm, using the model's astream."""
+    chars = prompt_chars(messages)
+    with span(node, "llm", model=llm.model, prompt_chars=chars, streamed=True) as s:
+        cache = _cache_for(node, llm, use_cache)
+        # SQLite lookups run off the event loop, so concurrent runs are not stalled
+        key, cached = await asyncio.to_thread(_cache_lookup, cache, llm, messages) if cache is not None else (None, None)
+
+        if cached is not None:
+            response = _cached_message(cached)
+            on_text(_chunk_text(response.content))
+        else:
+            async def attempt(remaining):
+                if on_attempt is not None:
+                    on_attempt()
+                chunks = []
+                async for chunk in llm.astream(messages, timeout=remaining, max_retries=1):
+                    chunks.append(chunk)
+                    text = _chunk_text(chunk.content)
+                    if text:
+                        on_text(text)
+                return _merge_chunks(chunks)
+
+            response = await acall_with_retry("gemini", node, attempt, tokens=chars // CHARS_PER_TOKEN)
+            if cache is not None:
+                await asyncio.to_thread(_store_response, cache, key, response)
+
+        s.set(cache_hit=cached is not None)
+        record_llm_usage(s, response)
+        return response
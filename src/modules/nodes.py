@@ -1,8 +1,10 @@
+import asyncio
 import json
+import operator
 import os
-from typing import TypedDict, List, Any
+from typing import Annotated, TypedDict, List, Any
 from langchain_core.messages import SystemMessage, HumanMessage
-from langchain_google_genai import ChatGoogleGenerativeAI
+from langgraph.config import get_config
 from dotenv import load_dotenv
 
 # Load environment variables if they aren't already loaded
@@ -13,30 +15,58 @@ from src.modules.prompts import (
     ROUTER_SYSTEM_PROMPT, ROUTER_TASK_PROMPT,
     SHERLOCK_SYSTEM_PROMPT, SHERLOCK_TASK_PROMPT,
     RESEARCHER_SYSTEM_PROMPT, RESEARCHER_TASK_PROMPT,
-    CFO_SYSTEM_PROMPT, CFO_TASK_PROMPT,
-    CRITIC_SYSTEM_PROMPT, CRITIC_TASK_PROMPT,
+    CFO_SYSTEM_PROMPT, CFO_TASK_PROMPT, CFO_FIGURES_PROMPT, CFO_UNPARSED_PROMPT,
+    DOSSIER_PROMPT, FINDINGS_PROMPT,
+    CRITIC_SYSTEM_PROMPT, CRITIC_TASK_PROMPT, CRITIC_EXCERPTS_PROMPT,
     WRITER_SYSTEM_PROMPT, WRITER_TASK_PROMPT
 )
-from src.modules.tools import perform_live_search
-
-# Initialization Helper
-def get_llm():
-    """Returns an initialized ChatGoogleGenerativeAI instance."""
-    return ChatGoogleGenerativeAI(
-        model="gemini-3-flash-preview",
-        temperature=0,
-        google_api_key=os.getenv("GOOGLE_API_KEY")
-    )
+from src.modules.tools import (
+    aperform_live_searches, build_search_context, perform_live_searches, prefetch_search, search_token_budget
+)
+from src.modules.resilience import APIError
+from src.modules.dossiers import format_dossiers, get_dossier_store, result_sources, split_findings
+# Shared, process-wide client registry (one pooled client per model), with per-node model tiering
+from src.modules.llm import get_node_llm, get_response_cache, invoke_llm, ainvoke_llm, stream_llm, astream_llm
+from src.modules.json_stream import StreamingArrayParser
+from src.modules.tracing import annotate, traced_node
+from src.modules.pdf_index import PageIndex
+from src.modules.context import CONTEXT_SOURCES, apply_critic, assemble_context, context_token_budget, render_context
+
+# Critic evidence: "auto" validates against the best matching page excerpts and
+# falls back to the full PDF when most of the deck has no text layer; "full_pdf" always attaches it.
+CRITIC_EVIDENCE_MODE = os.getenv("ARGUS_CRITIC_EVIDENCE", "auto")
+CRITIC_PAGES_PER_REPORT = 3
+CRITIC_MAX_PAGES = 8
+CRITIC_EXCERPT_CHARS = 1500
+
+# Stream the Router's output and start each founder/competitor search as soon as the
+# entity appears, so the searches overlap with Router generation. Set to 0 to disable.
+ROUTER_PREFETCH = os.getenv("ARGUS_ROUTER_PREFETCH", "1") != "0"
+
+# Check numeric financial claims locally before the CFO: only flagged claims go to the
+# model, and a fully consistent claim set gets a deterministic report. Set to 0 to disable.
+CFO_PRECHECK = os.getenv("ARGUS_CFO_PRECHECK", "1") != "0"
 
 # 2. State Definition
 class AgentState(TypedDict):
     pdf_file_uri: str
+    pdf_pages: List[str]
     job_order: dict
     sherlock_report: str
     researcher_report: str
     cfo_report: str
     critic_feedback: str
     final_memo: str
+    # Structured vendor failures (e.g. a search that failed after retries), appended by any node
+    errors: Annotated[List[dict], operator.add]
+    # Stages that were not run because they had nothing to analyze
+    skipped_stages: Annotated[List[str], operator.add]
+    # Result of the previous version of the same deck (job_order, reports, errors), if any
+    baseline: dict
+    # Agents whose report was carried over from the baseline because their input did not change
+    reused_agents: List[str]
+    # The agent reports split into scored units, assembled once and shared by the Critic and Writer
+    committee_context: dict
 
 # Helper to clean JSON
 def extract_text_from_response(response) -> str:
@@ -61,165 +91,625 @@ def clean_json_text(text: str) -> str:
         text = text.split("```")[1].split("```")[0]
     return text.strip()
 
-# 3. Node Functions
+# 3. Prompt Builders
+# Shared by the sync and async node variants so both send identical prompts.
 
-def router_node(state: AgentState) -> dict:
-    """Extracts entities from the PDF into JSON."""
-    pdf_uri = state["pdf_file_uri"]
-    llm = get_llm()
-    
+# Fallback empty structure if the Router output cannot be parsed
+EMPTY_JOB_ORDER = {
+    "founders": [], 
+    "competitors": [], 
+    "financial_claims": [], 
+    "industry": "Unknown"
+}
+
+
+# The job_order field each parallel agent works on, and how its absence is described downstream
+AGENT_INPUTS = {
+    "sherlock": ("founders", "sherlock_report", "No founders were identified in the deck."),
+    "researcher": ("competitors", "researcher_report", "No competitors were identified in the deck."),
+    "cfo": ("financial_claims", "cfo_report", "No financial claims were identified in the deck."),
+}
+
+
+def agents_with_work(job_order: dict) -> list:
+    """The parallel agents whose job_order input is non-empty, in pipeline order."""
+    job_order = job_order or {}
+    return [agent for agent, (field, _, _) in AGENT_INPUTS.items() if job_order.get(field)]
+
+
+def route_agents(state: AgentState):
+    """
+    Conditional fan-out after the Router: only dispatch agents that have something to analyze.
+
+    Returns:
+        list[str] | str: The agents to run, or "critic" when none of them has any input.
+    """
+    reused = state.get("reused_agents") or []
+    agents = [agent for agent in agents_with_work(state.get("job_order")) if agent not in reused]
+    return agents or "critic"
+
+
+def _normalized_input(value):
+    """An agent input in comparable form: list items stripped, case-folded and sorted."""
+    if isinstance(value, list):
+        return sorted(" ".join(str(item).split()).casefold() for item in value)
+    return value
+
+
+def reusable_reports(job_order: dict, baseline: dict) -> dict:
+    """
+    Diffs a job order against the previous version of the deck.
+
+    An agent's previous report is reused when the agent has work, its job_order
+    input is unchanged (ignoring order, case and whitespace), and its previous run
+    produced a real report without failed searches.
+
+    Args:
+        job_order (dict): The new Router output.
+        baseline (dict): The previous run's job_order, reports and errors.
+
+    Returns:
+        dict: {agent: previous report} for every agent that does not need to run again.
+    """
+    if not baseline or not baseline.get("job_order"):
+        return {}
+    previous_order = baseline["job_order"]
+    failed = {error.get("node") for error in baseline.get("errors") or []}
+
+    reused = {}
+    for agent in agents_with_work(job_order):
+        field, report_key, _ = AGENT_INPUTS[agent]
+        report = baseline.get(report_key)
+        if not report or report.startswith("[Skipped]") or agent in failed:
+            continue
+        if _normalized_input(job_order.get(field)) == _normalized_input(previous_order.get(field)):
+            reused[agent] = report
+    return reused
+
+
+def _report(state: AgentState, key: str) -> str:
+    """An agent report, or a note explaining why the agent did not run."""
+    report = state.get(key)
+    if report:
+        return report
+    for _, (_, report_key, note) in AGENT_INPUTS.items():
+        if report_key == key:
+            return f"[Skipped] {note}"
+    return "No report"
+
+
+def _has_reports(state: AgentState) -> bool:
+    return any(state.get(report_key) for _, report_key, _ in AGENT_INPUTS.values())
+
+
+# Returned without a model call when the deck gave the agents nothing to work on
+NO_EVIDENCE_FEEDBACK = "Validation Verdict: Nothing to validate. No agent report was produced because the deck lists no founders, competitors or financial claims."
+NO_EVIDENCE_MEMO = """# Investment Memo
+
+**Recommendation: Insufficient information.**
+
+The committee could not extract any founders, competitors or financial claims from the pitch deck, so no background checks, market research or financial review were performed. Request a complete deck (team, market and financials) before re-running the analysis.
+"""
+
+
+def founder_query(founder: str) -> str:
+    """The Sherlock background-check query for a founder."""
+    return f"{founder} fraud lawsuit startup exit"
+
+
+def competitor_query(competitor: str) -> str:
+    """The Researcher market query for a competitor."""
+    return competitor
+
+
+# The search each agent runs per entity: job_order field -> (query builder, topic).
+# The Router prefetches exactly these, so the agents find them already in flight.
+ENTITY_SEARCHES = {
+    "founders": (founder_query, "general"),
+    "competitors": (competitor_query, "news"),
+}
+# The dossier kind of each job_order entity field (see src/modules/dossiers.py)
+DOSSIER_KINDS = {"founders": "founder", "competitors": "competitor"}
+
+
+def known_entities(kind: str, entities) -> tuple:
+    """
+    Splits entities into those with a fresh dossier and those that need new research.
+
+    With the LLM response cache on, an entity list analyzed before keeps the split of
+    its first run (as long as those dossiers are still fresh), so an identical deck
+    sends an identical prompt and gets the cached response.
+
+    Returns:
+        tuple[dict, list]: (name -> dossier, names to search), the latter in input order.
+    """
+    store = get_dossier_store()
+    if store is None:
+        return {}, list(entities)
+    stable = get_response_cache() is not None
+    pinned = store.pinned_split(kind, entities) if stable else None
+    if pinned is not None:
+        dossiers = store.lookup(kind, [e for e in entities if e not in pinned])
+        if all(e in dossiers or e in pinned for e in entities):
+            return dossiers, [e for e in entities if e in pinned]
+
+    dossiers = store.lookup(kind, entities)
+    searched = [entity for entity in entities if entity not in dossiers]
+    if stable:
+        store.pin_split(kind, entities, searched)
+    return dossiers, searched
+
+
+def _record_findings(kind: str, response, searched, results) -> str:
+    """Stores the per-entity findings block of a report as dossiers and returns the report without it."""
+    report, findings = split_findings(extract_text_from_response(response), searched, kind)
+    store = get_dossier_store()
+    # A cached response repeats findings that are already stored; saving them again would
+    # only bump their dates (and change the prompts of the decks that use them)
+    if store is not None and not (getattr(response, "response_metadata", None) or {}).get("argus_cache_hit"):
+        for entity, entity_results in zip(searched, results):
+            # Only entities whose search succeeded; a dossier must rest on actual sources
+            if entity in findings and not isinstance(entity_results, APIError):
+                store.save(kind, entity, findings[entity], result_sources(entity_results))
+    annotate(dossiers_saved=sum(1 for e in searched if e in findings))
+    return report
+
+
+class RouterPrefetch:
+    """Feeds the streamed Router output to a JSON parser and starts each entity's search as it appears."""
+
+    def __init__(self, baseline: dict = None):
+        """
+        Args:
+            baseline (dict): The previous version's result. Entities it already listed
+                are not prefetched, since their agent's report is likely reused.
+        """
+        previous_order = (baseline or {}).get("job_order") or {}
+        self.known = {field: set(_normalized_input(previous_order.get(field) or [])) for field in ENTITY_SEARCHES}
+        self.store = get_dossier_store()
+        self.started = 0
+        self.reset()
+
+    def reset(self):
+        # Called before every Router attempt; a retried stream starts from the first character
+        self.parser = StreamingArrayParser(ENTITY_SEARCHES)
+
+    def feed(self, text: str):
+        for field, entity in self._new_entities(text):
+            self.started += self._start(field, entity)
+
+    def _new_entities(self, text: str):
+        for field, entity in self.parser.feed(text):
+            if not isinstance(entity, str) or not entity.strip():
+                continue
+            if " ".join(entity.split()).casefold() in self.known[field]:
+                continue
+            yield field, entity
+
+    def _start(self, field: str, entity: str) -> bool:
+        # Entities with a fresh dossier are not searched by their agent either
+        if self.store is not None and self.store.lookup(DOSSIER_KINDS[field], [entity]):
+            return False
+        build_query, topic = ENTITY_SEARCHES[field]
+        return prefetch_search(build_query(entity), topic=topic)
+
+
+class AsyncRouterPrefetch(RouterPrefetch):
+    """RouterPrefetch for the event loop: the dossier lookups (SQLite) run in worker threads."""
+
+    def __init__(self, baseline: dict = None):
+        super().__init__(baseline)
+        self.pending = []
+
+    def feed(self, text: str):
+        for field, entity in self._new_entities(text):
+            self.pending.append(asyncio.ensure_future(asyncio.to_thread(self._start, field, entity)))
+
+    async def join(self):
+        """Waits for the scheduled lookups and counts the searches they started."""
+        self.started += sum(await asyncio.gather(*self.pending))
+        self.pending = []
+
+
+def _deck_uri(state: AgentState) -> str:
+    """
+    The File API URI of the deck.
+
+    A resumed run passes the URI of its fresh upload in the run config
+    (configurable["pdf_file_uri"], see run_with_checkpoints); it wins over the one
+    in the checkpointed state, whose upload may have expired since.
+    """
+    try:
+        fresh = get_config().get("configurable", {}).get("pdf_file_uri")
+    except RuntimeError:
+        fresh = None  # Called outside a graph run
+    return fresh or state["pdf_file_uri"]
+
+
+def _router_messages(state: AgentState) -> list:
+    pdf_uri = _deck_uri(state)
     # Construct the message payload with the PDF file
-    messages = [
+    return [
         SystemMessage(content=ROUTER_SYSTEM_PROMPT),
         HumanMessage(content=[
             {"type": "text", "text": ROUTER_TASK_PROMPT},
             {"type": "media", "file_uri": pdf_uri, "mime_type": "application/pdf"}
         ])
     ]
-    
-    response = llm.invoke(messages)
-    
+
+
+def _router_result(response, state: AgentState) -> dict:
     try:
         content = extract_text_from_response(response)
         clean_text = clean_json_text(content)
         job_order = json.loads(clean_text)
     except json.JSONDecodeError:
-        # Fallback empty structure if parsing fails
-        job_order = {
-            "founders": [], 
-            "competitors": [], 
-            "financial_claims": [], 
-            "industry": "Unknown"
-        }
+        job_order = dict(EMPTY_JOB_ORDER)
         print("Error parsing JSON from Router Node.")
 
-    return {"job_order": job_order}
+    # Record the agents route_agents will not dispatch, so skipped stages show up in the result
+    running = agents_with_work(job_order)
+    skipped = [agent for agent in AGENT_INPUTS if agent not in running]
+    if skipped:
+        print(f"Router: nothing for {', '.join(skipped)} to analyze; skipping.")
+    update = {"job_order": job_order, "skipped_stages": skipped}
 
+    # Revised deck: carry over the reports of agents whose input did not change
+    reused = reusable_reports(job_order, state.get("baseline"))
+    if reused:
+        print(f"Router: inputs unchanged since the previous version for {', '.join(reused)}; reusing their reports.")
+        for agent, report in reused.items():
+            update[AGENT_INPUTS[agent][1]] = report
+    update["reused_agents"] = list(reused)
+    return update
 
-def sherlock_node(state: AgentState) -> dict:
-    """Performs background checks on founders."""
-    job_order = state.get("job_order", {})
-    founders = job_order.get("founders", [])
-    llm = get_llm()
-    
-    search_results = ""
-    for founder in founders:
-        query = f"{founder} fraud lawsuit startup exit"
-        result = perform_live_search(query)
-        search_results += f"\n--- Search for {founder} ---\n{result}\n"
-    
+
+def _search_errors(node: str, entities, results) -> list:
+    """Structured records of the searches that failed, for the run's `errors` list."""
+    return [
+        {**result.to_dict(), "node": node, "entity": entity}
+        for entity, result in zip(entities, results)
+        if isinstance(result, APIError)
+    ]
+
+
+def _dossier_prompt(dossiers: dict, searched) -> str:
+    """The dossier block for already-known entities, plus the findings request for newly searched ones."""
+    parts = []
+    if dossiers:
+        parts.append(DOSSIER_PROMPT.format(dossiers=format_dossiers(dossiers)))
+    if searched and get_dossier_store() is not None:
+        parts.append(FINDINGS_PROMPT.format(entities=", ".join(searched)))
+    return "".join("\n\n" + part for part in parts)
+
+
+def _search_data(node: str, searched, results) -> str:
+    if not searched:
+        return "No new searches were needed; every name has a recent dossier (below)."
+    return build_search_context(searched, results, search_token_budget(node))
+
+
+def _sherlock_messages(founders, results, searched=None, dossiers=None) -> list:
+    # Only the founders without a fresh dossier were searched
+    searched = founders if searched is None else searched
     task_prompt = SHERLOCK_TASK_PROMPT.format(
         founders=", ".join(founders),
-        search_results=search_results
-    )
-    
-    messages = [
+        search_results=_search_data("sherlock", searched, results)
+    ) + _dossier_prompt(dossiers, searched)
+    return [
         SystemMessage(content=SHERLOCK_SYSTEM_PROMPT),
         HumanMessage(content=task_prompt)
     ]
-    
-    response = llm.invoke(messages)
-    return {"sherlock_report": extract_text_from_response(response)}
 
 
-def researcher_node(state: AgentState) -> dict:
-    """Analyzes market and competitors."""
-    job_order = state.get("job_order", {})
-    competitors = job_order.get("competitors", [])
-    llm = get_llm()
-    
-    search_results = ""
-    for competitor in competitors:
-        # Topic='news' for competitor analysis
-        result = perform_live_search(competitor, topic="news")
-        search_results += f"\n--- Search for {competitor} ---\n{result}\n"
-        
+def _researcher_messages(competitors, results, searched=None, dossiers=None) -> list:
+    searched = competitors if searched is None else searched
     task_prompt = RESEARCHER_TASK_PROMPT.format(
         competitors=", ".join(competitors),
-        search_results=search_results
-    )
-    
-    messages = [
+        search_results=_search_data("researcher", searched, results)
+    ) + _dossier_prompt(dossiers, searched)
+    return [
         SystemMessage(content=RESEARCHER_SYSTEM_PROMPT),
         HumanMessage(content=task_prompt)
     ]
-    
-    response = llm.invoke(messages)
-    return {"researcher_report": extract_text_from_response(response)}
 
 
-def cfo_node(state: AgentState) -> dict:
-    """Sanity checks financial claims."""
-    job_order = state.get("job_order", {})
-    financial_claims = job_order.get("financial_claims", [])
-    llm = get_llm()
-    
+def _cfo_precheck(state: AgentState):
+    """
+    Runs the deterministic financial checks on the job order's claims.
+
+    Returns:
+        FinancialCheck | None: The result, or None when the pre-check is disabled.
+    """
+    if not CFO_PRECHECK:
+        return None
+    # NumPy is only imported once a deck actually reaches the CFO
+    from src.modules.financials import check_claims
+
+    check = check_claims(state.get("job_order", {}).get("financial_claims", []))
+    annotate(numeric_claims=check.numeric_claims, flagged_claims=len(check.flags), llm_skipped=check.consistent)
+    return check
+
+
+def _cfo_messages(state: AgentState, check=None) -> list:
+    financial_claims = state.get("job_order", {}).get("financial_claims", [])
+    if check is not None and check.rows:
+        # Only the flagged claims (with the reason) and the computed figures
+        claims_text = "\n".join(f"{claim} [{'; '.join(reasons)}]" for claim, reasons in check.flagged_claims())
+        task_prompt = CFO_TASK_PROMPT.format(financial_claims=claims_text) + "\n\n" + CFO_FIGURES_PROMPT.format(
+            passed=check.numeric_claims - len(check.flags),
+            figures=check.figures_text()
+        )
+        unparsed = check.unparsed_claims()
+        if unparsed:
+            task_prompt += "\n\n" + CFO_UNPARSED_PROMPT.format(claims="\n".join(unparsed))
+        return [
+            SystemMessage(content=CFO_SYSTEM_PROMPT),
+            HumanMessage(content=task_prompt)
+        ]
+
     # If list is empty, handle gracefully
     claims_text = "\n".join(str(c) for c in financial_claims) if financial_claims else "None provided."
-    
     task_prompt = CFO_TASK_PROMPT.format(
         financial_claims=claims_text
     )
-    
-    messages = [
+    return [
         SystemMessage(content=CFO_SYSTEM_PROMPT),
         HumanMessage(content=task_prompt)
     ]
-    
-    response = llm.invoke(messages)
-    return {"cfo_report": extract_text_from_response(response)}
 
 
-def critic_node(state: AgentState) -> dict:
-    """Validates reports against the original PDF."""
-    pdf_uri = state["pdf_file_uri"]
-    llm = get_llm()
-    
-    task_prompt = CRITIC_TASK_PROMPT.format(
-        sherlock_report=state.get("sherlock_report", "No report"),
-        researcher_report=state.get("researcher_report", "No report"),
-        cfo_report=state.get("cfo_report", "No report")
+def _critic_excerpts(state: AgentState):
+    """
+    Selects the deck pages relevant to the agent reports.
+
+    Returns:
+        str | None: The formatted page excerpts, or None if the full PDF is needed
+        (no local page text, a deck of mostly image-only pages, or nothing in the
+        reports matched).
+    """
+    pages = state.get("pdf_pages") or []
+    if CRITIC_EVIDENCE_MODE == "full_pdf" or not pages:
+        return None
+
+    index = PageIndex(pages)
+    if not index.has_text:
+        return None
+
+    selected = set()
+    for key in ("sherlock_report", "researcher_report", "cfo_report"):
+        report = state.get(key)
+        if report:
+            selected.update(page for page, _ in index.search(report, k=CRITIC_PAGES_PER_REPORT))
+    if not selected:
+        return None
+
+    # Keep the overall best pages if the per-report picks exceed the cap, then restore page order
+    if len(selected) > CRITIC_MAX_PAGES:
+        query = " ".join(state.get(k) or "" for k in ("sherlock_report", "researcher_report", "cfo_report"))
+        scores = index.score(query)
+        selected = set(sorted(selected, key=lambda p: scores[p], reverse=True)[:CRITIC_MAX_PAGES])
+
+    annotate(critic_pages=sorted(p + 1 for p in selected))
+    return "\n\n".join(
+        f"[Page {page + 1}]\n{index.excerpt(page, CRITIC_EXCERPT_CHARS)}" for page in sorted(selected)
     )
-    
+
+
+def _committee_context(state: AgentState) -> dict:
+    """The assembled agent reports: built by the Critic, then reused from the state by the Writer."""
+    context = state.get("committee_context")
+    if context is None:
+        context = assemble_context({report_key: _report(state, report_key) for _, report_key, _ in AGENT_INPUTS.values()})
+    return context
+
+
+def _render(node: str, context: dict, keys) -> dict:
+    """Renders context sources within the node's token budget, recording the result on the node's span."""
+    rendered, stats = render_context(context, keys, context_token_budget(node))
+    annotate(context_tokens=stats["tokens"], context_compacted=stats["compacted"],
+             context_dropped=context.get("dropped", 0))
+    return rendered
+
+
+def _critic_messages(state: AgentState, context: dict = None) -> list:
+    pdf_uri = _deck_uri(state)
+    reports = _render("critic", context or _committee_context(state),
+                      [report_key for _, report_key, _ in AGENT_INPUTS.values()])
+    task_prompt = CRITIC_TASK_PROMPT.format(**reports)
+
+    excerpts = _critic_excerpts(state)
+    if excerpts is not None:
+        annotate(critic_evidence="excerpts")
+        return [
+            SystemMessage(content=CRITIC_SYSTEM_PROMPT),
+            HumanMessage(content=f"{task_prompt}\n\n{CRITIC_EXCERPTS_PROMPT.format(excerpts=excerpts)}")
+        ]
+
     # Critic needs to see the PDF to validate hallucinations
-    messages = [
+    annotate(critic_evidence="full_pdf")
+    return [
         SystemMessage(content=CRITIC_SYSTEM_PROMPT),
         HumanMessage(content=[
             {"type": "text", "text": task_prompt},
             {"type": "media", "file_uri": pdf_uri, "mime_type": "application/pdf"}
         ])
     ]
-    
-    response = llm.invoke(messages)
-    return {"critic_feedback": extract_text_from_response(response)}
 
 
-def writer_node(state: AgentState) -> dict:
-    """Compiles the final investment memo."""
-    llm = get_llm()
-    # Concatenate all validated data for the writer
-    
-    context_data = f"""
-    --- Sherlock Report ---
-    {state.get('sherlock_report')}
-    
-    --- Researcher Report ---
-    {state.get('researcher_report')}
-    
-    --- CFO Report ---
-    {state.get('cfo_report')}
-    
-    --- CRITIC FEEDBACK (VALIDATION) ---
-    {state.get('critic_feedback')}
-    """
-    
+def _writer_messages(state: AgentState) -> list:
+    # The reports as validated by the Critic (rejected lines dropped), plus its feedback, within budget
+    context = apply_critic(_committee_context(state), state.get("critic_feedback") or "")
+    rendered = _render("writer", context, [key for key, _ in CONTEXT_SOURCES])
+    context_data = "\n\n".join(f"--- {title} ---\n{rendered[key]}" for key, title in CONTEXT_SOURCES)
+
     full_prompt = f"{WRITER_TASK_PROMPT}\n\nHere is the validated data:\n{context_data}"
 
-    messages = [
+    return [
         SystemMessage(content=WRITER_SYSTEM_PROMPT),
         HumanMessage(content=full_prompt)
     ]
-    
-    response = llm.invoke(messages)
+
+# 4. Node Functions
+
+@traced_node("router")
+def router_node(state: AgentState) -> dict:
+    """Extracts entities from the PDF into JSON."""
+    if not ROUTER_PREFETCH:
+        response = invoke_llm("router", get_node_llm("router"), _router_messages(state))
+        return _router_result(response, state)
+
+    # Searches start while the rest of the job order is still being generated
+    prefetch = RouterPrefetch(state.get("baseline"))
+    response = stream_llm(
+        "router", get_node_llm("router"), _router_messages(state),
+        on_text=prefetch.feed, on_attempt=prefetch.reset
+    )
+    annotate(prefetched_searches=prefetch.started)
+    return _router_result(response, state)
+
+
+@traced_node("sherlock")
+def sherlock_node(state: AgentState) -> dict:
+    """Performs background checks on founders."""
+    founders = state.get("job_order", {}).get("founders", [])
+    # Founders researched for an earlier deck bring their dossier instead of a new search
+    dossiers, searched = known_entities("founder", founders)
+    annotate(dossiers_used=len(dossiers))
+
+    # Fan out one search per founder; results come back in founder order
+    results = perform_live_searches([founder_query(f) for f in searched], raw=True)
+
+    response = invoke_llm("sherlock", get_node_llm("sherlock"), _sherlock_messages(founders, results, searched, dossiers))
+    return {
+        "sherlock_report": _record_findings("founder", response, searched, results),
+        "errors": _search_errors("sherlock", searched, results)
+    }
+
+
+@traced_node("researcher")
+def researcher_node(state: AgentState) -> dict:
+    """Analyzes market and competitors."""
+    competitors = state.get("job_order", {}).get("competitors", [])
+    dossiers, searched = known_entities("competitor", competitors)
+    annotate(dossiers_used=len(dossiers))
+
+    # Topic='news' for competitor analysis, all new competitors searched concurrently
+    results = perform_live_searches([competitor_query(c) for c in searched], topic="news", raw=True)
+
+    response = invoke_llm("researcher", get_node_llm("researcher"), _researcher_messages(competitors, results, searched, dossiers))
+    return {
+        "researcher_report": _record_findings("competitor", response, searched, results),
+        "errors": _search_errors("researcher", searched, results)
+    }
+
+
+@traced_node("cfo")
+def cfo_node(state: AgentState) -> dict:
+    """Sanity checks financial claims."""
+    check = _cfo_precheck(state)
+    if check is not None and check.consistent:
+        return {"cfo_report": check.report()}
+    response = invoke_llm("cfo", get_node_llm("cfo"), _cfo_messages(state, check))
+    return {"cfo_report": extract_text_from_response(response)}
+
+
+@traced_node("critic")
+def critic_node(state: AgentState) -> dict:
+    """Validates reports against the original PDF."""
+    if not _has_reports(state):
+        return {"critic_feedback": NO_EVIDENCE_FEEDBACK, "skipped_stages": ["critic"]}
+    context = _committee_context(state)
+    response = invoke_llm("critic", get_node_llm("critic"), _critic_messages(state, context))
+    return {"critic_feedback": extract_text_from_response(response), "committee_context": context}
+
+
+@traced_node("writer")
+def writer_node(state: AgentState) -> dict:
+    """Compiles the final investment memo."""
+    if not _has_reports(state):
+        return {"final_memo": NO_EVIDENCE_MEMO, "skipped_stages": ["writer"]}
+    response = invoke_llm("writer", get_node_llm("writer"), _writer_messages(state))
     return {"final_memo": extract_text_from_response(response)}
 
+# 5. Async Node Functions
+# Used by the compiled graph's ainvoke/astream so many analyses can share one event loop.
+# Blocking work (SQLite lookups, the NumPy checks, BM25 page scoring) runs in threads.
+
+@traced_node("router")
+async def arouter_node(state: AgentState) -> dict:
+    """Async variant of router_node."""
+    if not ROUTER_PREFETCH:
+        response = await ainvoke_llm("router", get_node_llm("router"), _router_messages(state))
+        return _router_result(response, state)
+
+    prefetch = AsyncRouterPrefetch(state.get("baseline"))
+    response = await astream_llm(
+        "router", get_node_llm("router"), _router_messages(state),
+        on_text=prefetch.feed, on_attempt=prefetch.reset
+    )
+    await prefetch.join()
+    annotate(prefetched_searches=prefetch.started)
+    return _router_result(response, state)
+
+
+@traced_node("sherlock")
+async def asherlock_node(state: AgentState) -> dict:
+    """Async variant of sherlock_node."""
+    founders = state.get("job_order", {}).get("founders", [])
+    dossiers, searched = await asyncio.to_thread(known_entities, "founder", founders)
+    annotate(dossiers_used=len(dossiers))
+    results = await aperform_live_searches([founder_query(f) for f in searched], raw=True)
+
+    response = await ainvoke_llm("sherlock", get_node_llm("sherlock"), _sherlock_messages(founders, results, searched, dossiers))
+    return {
+        "sherlock_report": await asyncio.to_thread(_record_findings, "founder", response, searched, results),
+        "errors": _search_errors("sherlock", searched, results)
+    }
+
+
+@traced_node("researcher")
+async def aresearcher_node(state: AgentState) -> dict:
+    """Async variant of researcher_node."""
+    competitors = state.get("job_order", {}).get("competitors", [])
+    dossiers, searched = await asyncio.to_thread(known_entities, "competitor", competitors)
+    annotate(dossiers_used=len(dossiers))
+    results = await aperform_live_searches([competitor_query(c) for c in searched], topic="news", raw=True)
+
+    response = await ainvoke_llm("researcher", get_node_llm("researcher"), _researcher_messages(competitors, results, searched, dossiers))
+    return {
+        "researcher_report": await asyncio.to_thread(_record_findings, "competitor", response, searched, results),
+        "errors": _search_errors("researcher", searched, results)
+    }
+
+
+@traced_node("cfo")
+async def acfo_node(state: AgentState) -> dict:
+    """Async variant of cfo_node."""
+    # The first call also imports NumPy
+    check = await asyncio.to_thread(_cfo_precheck, state)
+    if check is not None and check.consistent:
+        return {"cfo_report": check.report()}
+    response = await ainvoke_llm("cfo", get_node_llm("cfo"), _cfo_messages(state, check))
+    return {"cfo_report": extract_text_from_response(response)}
+
+
+@traced_node("critic")
+async def acritic_node(state: AgentState) -> dict:
+    """Async variant of critic_node."""
+    if not _has_reports(state):
+        return {"critic_feedback": NO_EVIDENCE_FEEDBACK, "skipped_stages": ["critic"]}
+    context = _committee_context(state)
+    # Selecting the page excerpts scores every deck page with BM25
+    messages = await asyncio.to_thread(_critic_messages, state, context)
+    response = await ainvoke_llm("critic", get_node_llm("critic"), messages)
+    return {"critic_feedback": extract_text_from_response(response), "committee_context": context}
+
+
+@traced_node("writer")
+async def awriter_node(state: AgentState) -> dict:
+    """Async variant of writer_node."""
+    if not _has_reports(state):
+        return {"final_memo": NO_EVIDENCE_MEMO, "skipped_stages": ["writer"]}
+    response = await ainvoke_llm("writer", get_node_llm("writer"), _writer_messages(state))
+    return {"final_memo": extract_text_from_response(response)}
@@ -0,0 +1,164 @@
+"""
+Local page-level text index of a pitch deck.
+
+The Router reads the PDF natively through Gemini; the Critic only needs the pages
+that back up each agent report. Extracting page text locally and ranking pages
+with BM25 lets the Critic validate against short excerpts instead of re-sending
+the whole deck. Decks without an extractable text layer (scanned slides) yield
+empty pages, and callers fall back to the full PDF.
+"""
+
+import hashlib
+import heapq
+import math
+import re
+from collections import Counter
+
+# Pages with less extractable text than this are treated as image-only
+MIN_PAGE_CHARS = 40
+# Share of pages that need a text layer before excerpts can stand in for the deck;
+# below it (mostly image slides) the excerpts would miss most of what the agents read
+MIN_TEXT_PAGE_SHARE = 0.5
+
+# Deck fingerprints: a bottom-k MinHash sketch over word shingles of the page text
+SHINGLE_SIZE = 5
+FINGERPRINT_SIZE = 128
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:[.,][0-9]+)*[a-z%]*")
+_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have", "in",
+    "is", "it", "its", "of", "on", "or", "that", "the", "their", "this", "to", "was",
+    "we", "were", "will", "with", "our", "they", "not", "but", "if", "can", "all",
+}
+
+
+def tokenize(text: str) -> list:
+    """Lowercases and splits text into index terms, keeping figures like "$100m" or "500,000"."""
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS and len(t) > 1]
+
+
+def extract_pages(source) -> list:
+    """
+    Extracts the text of every page of a PDF.
+
+    Args:
+        source: A file path, bytes, or a binary file-like object.
+
+    Returns:
+        list[str]: One string per page (empty strings for pages without text).
+        An empty list if pypdf is not installed or the PDF cannot be parsed.
+    """
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        print("pypdf is not installed; the Critic will use the full PDF.")
+        return []
+
+    import io
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(bytes(source))
+
+    try:
+        reader = PdfReader(source)
+        return [(page.extract_text() or "").strip() for page in reader.pages]
+    except Exception as e:
+        print(f"Could not extract PDF text locally ({e}); the Critic will use the full PDF.")
+        return []
+
+
+class PageIndex:
+    """A BM25 index over the pages of one deck."""
+
+    def __init__(self, pages, k1: float = 1.5, b: float = 0.75):
+        """
+        Args:
+            pages (list[str]): Page texts, in page order.
+            k1 (float): BM25 term frequency saturation.
+            b (float): BM25 length normalization.
+        """
+        self.pages = list(pages)
+        self.k1 = k1
+        self.b = b
+        self._terms = [Counter(tokenize(p)) for p in self.pages]
+        self._lengths = [sum(t.values()) for t in self._terms]
+        self._avg_length = (sum(self._lengths) / len(self._lengths)) if self._lengths else 0.0
+
+        doc_freq = Counter()
+        for terms in self._terms:
+            doc_freq.update(terms.keys())
+        n = len(self.pages)
+        self._idf = {t: math.log(1 + (n - df + 0.5) / (df + 0.5)) for t, df in doc_freq.items()}
+
+    @property
+    def text_pages(self) -> int:
+        """Number of pages with a usable text layer."""
+        return sum(1 for p in self.pages if len(p) >= MIN_PAGE_CHARS)
+
+    @property
+    def has_text(self) -> bool:
+        """True if at least MIN_TEXT_PAGE_SHARE of the pages have a usable text layer."""
+        return bool(self.pages) and self.text_pages >= MIN_TEXT_PAGE_SHARE * len(self.pages)
+
+    def score(self, query: str) -> list:
+        """Returns the BM25 score of every page for the query."""
+        query_terms = set(tokenize(query))
+        scores = []
+        for terms, length in zip(self._terms, self._lengths):
+            score = 0.0
+            norm = self.k1 * (1 - self.b + self.b * length / self._avg_length) if self._avg_length else self.k1
+            for term in query_terms:
+                tf = terms.get(term)
+                if tf:
+                    score += self._idf[term] * tf * (self.k1 + 1) / (tf + norm)
+            scores.append(score)
+        return scores
+
+    def search(self, query: str, k: int = 3, min_score: float = 0.0) -> list:
+        """
+        Returns the best matching pages.
+
+        Returns:
+            list[tuple[int, float]]: (zero-based page number, score), best first.
+        """
+        ranked = sorted(enumerate(self.score(query)), key=lambda item: item[1], reverse=True)
+        return [(page, score) for page, score in ranked[:k] if score > min_score]
+
+    def excerpt(self, page: int, max_chars: int = 1500) -> str:
+        """Returns the (truncated) text of a page."""
+        text = self.pages[page]
+        return text if len(text) <= max_chars else text[:max_chars].rstrip() + " [...]"
+
+
+def deck_fingerprint(pages, k: int = FINGERPRINT_SIZE) -> list:
+    """
+    A compact sketch of a deck's text, for finding earlier versions of the same deck.
+
+    Every run of SHINGLE_SIZE consecutive terms is hashed and the k smallest hashes
+    are kept (a bottom-k MinHash sketch), so a revision that edits a few slides
+    still shares most of its sketch with the original.
+
+    Args:
+        pages (list[str]): Page texts, as returned by extract_pages().
+        k (int): Sketch size.
+
+    Returns:
+        list[int]: Sorted shingle hashes (empty for decks without a text layer).
+    """
+    terms = [t for page in pages for t in tokenize(page)]
+    if not terms:
+        return []
+    size = min(SHINGLE_SIZE, len(terms))
+    hashes = {
+        int.from_bytes(hashlib.blake2b(" ".join(terms[i:i + size]).encode(), digest_size=8).digest(), "big")
+        for i in range(len(terms) - size + 1)
+    }
+    return heapq.nsmallest(k, hashes)
+
+
+def fingerprint_similarity(a, b, k: int = FINGERPRINT_SIZE) -> float:
+    """Estimated Jaccard similarity (0-1) of the two decks behind a pair of deck_fingerprint() sketches."""
+    if not a or not b:
+        return 0.0
+    a, b = set(a), set(b)
+    union = heapq.nsmallest(k, a | b)
+    return sum(1 for h in union if h in a and h in b) / len(union)
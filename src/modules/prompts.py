@@ -32,6 +32,16 @@ Assess if their LinkedIn history matches their claims.
 
 Classify the Team Risk as: LOW, MEDIUM, or HIGH."""
 
+# Appended to the Sherlock/Researcher task when some names were researched for an earlier deck
+DOSSIER_PROMPT = """Dossiers from earlier research, used instead of new searches for these names (findings with their date and sources):
+
+{dossiers}
+
+Treat them as evidence alongside the search data."""
+
+# Appended when the findings on newly searched names are kept as dossiers for later decks
+FINDINGS_PROMPT = """After the report, end your answer with a ```json block mapping each of these names to a 2-4 sentence summary of what the search data shows about them (key facts, red flags, exits, lawsuits, traction), to be reused in later analyses: {entities}"""
+
 # 3. Researcher Agent (Market Analysis)
 RESEARCHER_SYSTEM_PROMPT = """You are a ruthless Market Analyst. You do not believe in "Blue Oceans." You assume every market is crowded and that the startup is ignoring competitors. Your job is to validate if the market opportunity is real or if the incumbents (Google, Microsoft, etc.) are already killing it."""
 
@@ -58,6 +68,18 @@ Is the implied ARPU (Average Revenue Per User) realistic for this industry?
 
 Flag any number that looks "too good to be true"."""
 
+# Appended when the automated financial checks ran first: only flagged claims are listed above
+CFO_FIGURES_PROMPT = """The claims above were flagged by automated checks (the reason is given after each claim). {passed} other numeric claim(s) passed the checks and are not repeated here.
+
+Figures computed from all of the deck's claims:
+{figures}
+
+Use these figures instead of redoing the arithmetic, and judge whether each flagged claim is plausible, needs explanation from the founders, or is "too good to be true"."""
+
+# Appended after CFO_FIGURES_PROMPT for claims the automated checks found no figures in
+CFO_UNPARSED_PROMPT = """These claims contain no figures the automated checks could parse, so they are unverified. Assess them yourself:
+{claims}"""
+
 # 5. Critic Agent (The Gatekeeper)
 CRITIC_SYSTEM_PROMPT = """You are the Compliance Officer and Hallucination Filter. You have access to the Ground Truth (the Original PDF). Your ONLY job is to read the reports from Sherlock, Researcher, and CFO, and cross-reference them with the PDF. If an agent claims something that directly contradicts the PDF, you must REJECT it. However, if an agent brings in new external info (like a lawsuit found on Google), that is valid."""
 
@@ -71,6 +93,13 @@ List external discoveries (valid).
 
 List HALLUCINATIONS (invalid contradictions)."""
 
+# Used instead of attaching the full PDF when local page excerpts are available
+CRITIC_EXCERPTS_PROMPT = """Ground Truth excerpts from the original PDF (the pages most relevant to the reports above):
+
+{excerpts}
+
+Only these pages are provided. Treat a claim as a HALLUCINATION only if it contradicts these excerpts; if the excerpts are silent on it, list it as unverified rather than rejecting it."""
+
 # 6. Writer Agent (The Partner)
 WRITER_SYSTEM_PROMPT = """You are a General Partner at Argus VC. You write concise, decisive Investment Memos. You never use fluff. You use bullet points, bold text, and clear headers."""
 
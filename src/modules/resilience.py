@@ -0,0 +1,277 @@
+"""
+Client-side rate limiting, retries and structured errors for Gemini and Tavily.
+
+Every outbound call goes through call_with_retry / acall_with_retry, which
+1. waits for the API's token buckets (requests/min and tokens/min),
+2. retries retryable failures (429, 5xx, timeouts, connection errors) with
+   jittered exponential backoff,
+3. stops at a per-call deadline, and
+4. raises APIError, a structured error that callers record in the run state
+   instead of pasting exception text into prompts or reports.
+"""
+
+import asyncio
+import os
+import random
+import threading
+import time
+
+# Retry policy (shared by both APIs)
+MAX_ATTEMPTS = int(os.getenv("ARGUS_RETRY_ATTEMPTS", "5"))
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 20.0
+
+# Rough characters-per-token ratio for estimating prompt sizes (rate limiting and prompt budgets)
+CHARS_PER_TOKEN = 4
+
+# Per-call deadlines in seconds, covering every attempt and backoff wait
+DEADLINES = {
+    "gemini": float(os.getenv("ARGUS_GEMINI_DEADLINE", "180")),
+    "tavily": float(os.getenv("ARGUS_TAVILY_DEADLINE", "45")),
+}
+
+_RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+_RETRYABLE_NAMES = {
+    "ResourceExhausted", "ServiceUnavailable", "DeadlineExceeded", "InternalServerError",
+    "TimeoutError", "ReadTimeout", "ConnectTimeout", "ConnectError", "RemoteProtocolError",
+    "ConnectionError", "UsageLimitExceededError",  # Tavily raises this for HTTP 429
+}
+
+
+class APIError(Exception):
+    """A failed vendor call, with enough structure to report and aggregate it."""
+
+    def __init__(self, api: str, operation: str, kind: str, message: str,
+                 retryable: bool = False, attempts: int = 1, status: int = None):
+        super().__init__(f"{api} {operation} failed ({kind}): {message}")
+        self.api = api
+        self.operation = operation
+        self.kind = kind
+        self.message = message
+        self.retryable = retryable
+        self.attempts = attempts
+        self.status = status
+
+    def to_dict(self) -> dict:
+        return {
+            "api": self.api,
+            "operation": self.operation,
+            "kind": self.kind,
+            "message": self.message,
+            "retryable": self.retryable,
+            "attempts": self.attempts,
+            "status": self.status,
+        }
+
+
+class TokenBucket:
+    """A thread-safe token bucket refilled continuously at rate_per_minute."""
+
+    def __init__(self, rate_per_minute: float, capacity: float = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount: float = 1) -> float:
+        """
+        Takes amount tokens, going into debt if necessary.
+
+        Returns:
+            float: Seconds the caller must wait before proceeding (0 if available now).
+        """
+        # Never ask for more than the bucket can ever hold
+        amount = min(amount, self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= amount
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate if self.rate > 0 else float("inf")
+
+    def refund(self, amount: float = 1):
+        """Gives back tokens taken by reserve() for a call that was not made."""
+        amount = min(amount, self.capacity)
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self.capacity, self._tokens + amount)
+
+
+class RateLimiter:
+    """Request-per-minute and token-per-minute buckets for one API."""
+
+    def __init__(self, name: str, requests_per_minute: float, tokens_per_minute: float = None):
+        self.name = name
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+
+    def reserve(self, tokens: int = 0) -> float:
+        """Reserves one request (and `tokens` tokens) and returns the required wait in seconds."""
+        wait = self.requests.reserve(1)
+        if self.tokens is not None and tokens:
+            wait = max(wait, self.tokens.reserve(tokens))
+        return wait
+
+    def refund(self, tokens: int = 0):
+        """Returns a reservation that was abandoned (e.g. because the wait would pass the deadline)."""
+        self.requests.refund(1)
+        if self.tokens is not None and tokens:
+            self.tokens.refund(tokens)
+
+
+RATE_LIMITERS = {
+    "gemini": RateLimiter(
+        "gemini",
+        requests_per_minute=float(os.getenv("ARGUS_GEMINI_RPM", "60")),
+        tokens_per_minute=float(os.getenv("ARGUS_GEMINI_TPM", "1000000")),
+    ),
+    "tavily": RateLimiter(
+        "tavily",
+        requests_per_minute=float(os.getenv("ARGUS_TAVILY_RPM", "100")),
+    ),
+}
+
+
+def _status_of(exc):
+    """Finds an HTTP status code on an exception or anything it was raised from."""
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        seen.add(id(exc))
+        for attr in ("status_code", "code", "status"):
+            value = getattr(exc, attr, None)
+            if isinstance(value, int) and 100 <= value < 600:
+                return value
+        response = getattr(exc, "response", None)
+        value = getattr(response, "status_code", None)
+        if isinstance(value, int):
+            return value
+        exc = exc.__cause__ or exc.__context__
+    return None
+
+
+def classify(exc) -> tuple:
+    """
+    Classifies an exception raised by a vendor SDK.
+
+    Returns:
+        tuple: (kind, retryable, status)
+    """
+    status = _status_of(exc)
+    name = type(exc).__name__
+    text = str(exc).lower()
+
+    if status == 429 or name == "UsageLimitExceededError" or "resource exhausted" in text or "rate limit" in text:
+        return "rate_limited", True, status or 429
+    if isinstance(exc, (TimeoutError, asyncio.TimeoutError)) or "timeout" in name.lower() or "deadline" in text:
+        return "timeout", True, status
+    if status in _RETRYABLE_STATUS or name in _RETRYABLE_NAMES or isinstance(exc, ConnectionError):
+        return "unavailable", True, status
+    if status in (401, 403) or name in ("InvalidAPIKeyError", "ForbiddenError", "MissingAPIKeyError"):
+        return "auth", False, status
+    if status == 400 or name == "BadRequestError":
+        return "invalid_request", False, status
+    return "error", False, status
+
+
+def backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff for the given (1-based) attempt."""
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (attempt - 1)))
+
+
+def _give_up(api, operation, exc, attempt):
+    if isinstance(exc, APIError):
+        exc.attempts = attempt
+        return exc
+    kind, retryable, status = classify(exc)
+    error = APIError(api, operation, kind, str(exc) or type(exc).__name__, retryable, attempt, status)
+    error.__cause__ = exc
+    return error
+
+
+def _deadline_error(api, operation, attempt, last=None):
+    message = f"deadline exceeded after {attempt} attempt(s)"
+    if last is not None:
+        message += f"; last error: {last}"
+    return APIError(api, operation, "timeout", message, retryable=True, attempts=attempt)
+
+
+def call_with_retry(api: str, operation: str, fn, tokens: int = 0, deadline: float = None, max_attempts: int = None):
+    """
+    Calls fn(remaining_seconds) under the API's rate limiter with retries.
+
+    Args:
+        api (str): "gemini" or "tavily".
+        operation (str): Short label for errors and traces (e.g. the node name).
+        fn: Callable receiving the seconds left before the deadline (to use as a client timeout).
+        tokens (int): Estimated tokens consumed, charged against the tokens/min bucket.
+        deadline (float): Overall budget in seconds. Defaults to DEADLINES[api].
+        max_attempts (int): Defaults to MAX_ATTEMPTS.
+
+    Returns:
+        Whatever fn returns.
+
+    Raises:
+        APIError: On a non-retryable error, or when attempts or the deadline run out.
+    """
+    limiter = RATE_LIMITERS[api]
+    end = time.monotonic() + (deadline if deadline is not None else DEADLINES[api])
+    attempts = max_attempts or MAX_ATTEMPTS
+    last = None
+
+    for attempt in range(1, attempts + 1):
+        wait = limiter.reserve(tokens)
+        if time.monotonic() + wait >= end:
+            limiter.refund(tokens)
+            raise _deadline_error(api, operation, attempt, last)
+        if wait:
+            time.sleep(wait)
+
+        try:
+            return fn(end - time.monotonic())
+        except Exception as e:
+            last = e
+            kind, retryable, _ = classify(e)
+            if not retryable or attempt == attempts:
+                raise _give_up(api, operation, e, attempt)
+            delay = backoff_delay(attempt)
+            if time.monotonic() + delay >= end:
+                raise _deadline_error(api, operation, attempt, e)
+            print(f"{api} {operation}: {kind}, retrying in {delay:.1f}s (attempt {attempt}/{attempts})")
+            time.sleep(delay)
+
+
+async def acall_with_retry(api: str, operation: str, afn, tokens: int = 0, deadline: float = None, max_attempts: int = None):
+    """Async variant of call_with_retry; afn(remaining_seconds) is a coroutine function."""
+    limiter = RATE_LIMITERS[api]
+    end = time.monotonic() + (deadline if deadline is not None else DEADLINES[api])
+    attempts = max_attempts or MAX_ATTEMPTS
+    last = None
+
+    for attempt in range(1, attempts + 1):
+        wait = limiter.reserve(tokens)
+        if time.monotonic() + wait >= end:
+            limiter.refund(tokens)
+            raise _deadline_error(api, operation, attempt, last)
+        if wait:
+            await asyncio.sleep(wait)
+
+        remaining = end - time.monotonic()
+        try:
+            # Unlike threads, coroutines can be cancelled at the deadline
+            return await asyncio.wait_for(afn(remaining), timeout=remaining)
+        except Exception as e:
+            last = e
+            kind, retryable, _ = classify(e)
+            if not retryable or attempt == attempts:
+                raise _give_up(api, operation, e, attempt)
+            delay = backoff_delay(attempt)
+            if time.monotonic() + delay >= end:
+                raise _deadline_error(api, operation, attempt, e)
+            print(f"{api} {operation}: {kind}, retrying in {delay:.1f}s (attempt {attempt}/{attempts})")
+            await asyncio.sleep(delay)
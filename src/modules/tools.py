@@ -1,15 +1,308 @@
+import asyncio
+import contextvars
 import os
-from tavily import TavilyClient
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
 
-# Initialize the Tavily client
-# The client is instantiated globally as requested, expecting the environment variable to be present.
+from src.modules.cache import AsyncSingleFlight, SQLiteCache, SingleFlight, cache_path
+from src.modules.resilience import CHARS_PER_TOKEN, APIError, acall_with_retry, call_with_retry
+from src.modules.tracing import annotate, span
+
+# Tavily's own per-request timeout ceiling; the retry layer's deadline can shorten it
+SEARCH_REQUEST_TIMEOUT = 60
+
+# The Tavily client is shared by the whole process, but only created (and the
+# tavily package only imported) on the first search, to keep startup fast.
 _api_key = os.getenv("TAVILY_API_KEY")
-# We handle the case where the key might be missing gracefully in the function or during init if possible.
-# However, the prompt implies simple instantiation. 
-# We'll stick to a global client but adding a check in the function is good practice.
-tavily_client = TavilyClient(api_key=_api_key) if _api_key else None
+tavily_client = None
+
+# The async client owns an httpx.AsyncClient whose connection pool is bound to
+# the event loop it was first used on, so keep one client per running loop.
+_async_clients = weakref.WeakKeyDictionary()
+_async_client_override = None
+
+
+def set_search_clients(client, async_client=None):
+    """
+    Replaces the Tavily clients, e.g. with offline stand-ins for benchmarks.
+
+    Args:
+        client: Object with a Tavily-compatible search(query=..., search_depth=..., topic=...).
+        async_client: Object with an async search() of the same shape.
+    """
+    global tavily_client, _async_client_override
+    tavily_client = client
+    _async_client_override = async_client
+
+
+def get_tavily_client():
+    """Returns the shared TavilyClient, creating it on first use (None without an API key)."""
+    global tavily_client
+    if tavily_client is None and _api_key:
+        from tavily import TavilyClient
+        tavily_client = TavilyClient(api_key=_api_key)
+    return tavily_client
+
+
+def get_async_tavily_client():
+    """Returns the AsyncTavilyClient for the running event loop (None without an API key)."""
+    if _async_client_override is not None:
+        return _async_client_override
+    if not _api_key:
+        return None
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        from tavily import AsyncTavilyClient
+        client = AsyncTavilyClient(api_key=_api_key)
+        _async_clients[loop] = client
+    return client
+
+# Upper bound on Tavily requests in flight for a single fan-out.
+# Override with the ARGUS_SEARCH_CONCURRENCY environment variable.
+DEFAULT_SEARCH_CONCURRENCY = int(os.getenv("ARGUS_SEARCH_CONCURRENCY", "5"))
+
+# Persistent search cache. News goes stale much faster than background pages,
+# so the two topics get separate TTLs (in seconds). Set ARGUS_SEARCH_CACHE=0 to disable.
+SEARCH_CACHE_TTL = {
+    "news": float(os.getenv("ARGUS_SEARCH_TTL_NEWS", str(6 * 3600))),
+    "general": float(os.getenv("ARGUS_SEARCH_TTL_GENERAL", str(7 * 24 * 3600))),
+}
+SEARCH_CACHE_MAX_ENTRIES = int(os.getenv("ARGUS_SEARCH_CACHE_MAX_ENTRIES", "20000"))
+
+SEARCH_CACHE_ENABLED = os.getenv("ARGUS_SEARCH_CACHE", "1") != "0"
+# Opened on the first search, so importing this module creates no cache directory
+_search_cache = None
+_search_cache_lock = threading.Lock()
+
+# Prompt budget for the search results of one node, in (estimated) tokens.
+# ARGUS_SEARCH_TOKEN_BUDGET sets the default, ARGUS_SEARCH_TOKEN_BUDGET_<NODE> overrides one node.
+DEFAULT_SEARCH_TOKEN_BUDGET = int(os.getenv("ARGUS_SEARCH_TOKEN_BUDGET", "6000"))
+# No single result may take more than this many characters of the budget
+SEARCH_RESULT_MAX_CHARS = int(os.getenv("ARGUS_SEARCH_RESULT_MAX_CHARS", "2000"))
+
+# Used when the disk cache is disabled so concurrent identical searches still share one request
+_search_flight = SingleFlight()
+_async_search_flight = AsyncSingleFlight()
+
+
+def search_cache_key(query: str, search_depth: str, topic: str) -> str:
+    """Builds the cache key from the normalized query, search depth and topic."""
+    normalized = " ".join(query.lower().split())
+    return f"{topic}|{search_depth}|{normalized}"
+
+
+def get_search_cache():
+    """Returns the on-disk search cache, or None when caching is disabled."""
+    global _search_cache
+    if not SEARCH_CACHE_ENABLED:
+        return None
+    if _search_cache is None:
+        with _search_cache_lock:
+            if _search_cache is None:
+                _search_cache = SQLiteCache(cache_path("search_cache.sqlite3"), max_entries=SEARCH_CACHE_MAX_ENTRIES)
+    return _search_cache
+
+
+def search_cache_stats() -> dict:
+    """Returns hit/miss counters of the search cache (empty if disabled or not yet used)."""
+    return _search_cache.stats() if _search_cache else {}
+
+
+def fetch_search_results(query: str, search_depth="advanced", topic="general") -> list:
+    """
+    Returns the raw Tavily results for a query, served from the cache when possible.
+
+    Concurrent lookups of the same key share one in-flight request. Requests
+    go through the shared Tavily rate limiter and retry policy; failures are
+    raised as APIError and never cached.
+
+    Returns:
+        list[dict]: The "results" list of the Tavily response.
+    """
+    called = []
+
+    def request(remaining):
+        return get_tavily_client().search(
+            query=query,
+            search_depth=search_depth,
+            topic=topic,
+            timeout=min(SEARCH_REQUEST_TIMEOUT, remaining)
+        )
+
+    def search():
+        called.append(True)
+        response = call_with_retry("tavily", "search", request)
+        return response.get("results", [])
+
+    key = search_cache_key(query, search_depth, topic)
+    search_cache = get_search_cache()
+    if search_cache is None:
+        results, shared = _search_flight.do(key, search)
+    else:
+        ttl = SEARCH_CACHE_TTL.get(topic, SEARCH_CACHE_TTL["general"])
+        results = search_cache.get_or_compute(key, search, ttl=ttl)
+        shared = False
+    # Served without a Tavily request of our own (disk hit or joined an in-flight call)
+    annotate(cache_hit=not called or shared, results=len(results))
+    return results
+
+
+async def afetch_search_results(query: str, search_depth="advanced", topic="general") -> list:
+    """Async variant of fetch_search_results, using the AsyncTavilyClient."""
+    called = []
+
+    async def request(remaining):
+        return await get_async_tavily_client().search(
+            query=query,
+            search_depth=search_depth,
+            topic=topic,
+            timeout=min(SEARCH_REQUEST_TIMEOUT, remaining)
+        )
+
+    async def search():
+        called.append(True)
+        response = await acall_with_retry("tavily", "search", request)
+        return response.get("results", [])
+
+    key = search_cache_key(query, search_depth, topic)
+    search_cache = get_search_cache()
+    if search_cache is None:
+        results, shared = await _async_search_flight.do(key, search)
+    else:
+        ttl = SEARCH_CACHE_TTL.get(topic, SEARCH_CACHE_TTL["general"])
+        results = await search_cache.aget_or_compute(key, search, ttl=ttl)
+        shared = False
+    annotate(cache_hit=not called or shared, results=len(results))
+    return results
+
+
+def _format_result(result: dict, content=None) -> str:
+    title = result.get("title", "No Title")
+    url = result.get("url", "No URL")
+    if content is None:
+        content = result.get("content", "No Content")
+    return f"Source: {title} - {url} \n Content: {content}"
+
+
+def format_search_results(results: list) -> str:
+    """Formats raw Tavily results into a string suitable for LLM consumption."""
+    if not results:
+        return "No results found."
+    return "\n\n".join(_format_result(result) for result in results)
+
+
+def search_token_budget(node: str) -> int:
+    """The search-results token budget of a node (see ARGUS_SEARCH_TOKEN_BUDGET)."""
+    return int(os.getenv(f"ARGUS_SEARCH_TOKEN_BUDGET_{node.upper()}", DEFAULT_SEARCH_TOKEN_BUDGET))
+
+
+def _url_key(url: str) -> str:
+    """Normalizes a URL for deduplication (scheme, "www.", fragment and trailing slash ignored)."""
+    if not url:
+        return ""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    path = parts.path.rstrip("/")
+    return f"{host}{path}?{parts.query}" if parts.query else f"{host}{path}"
+
 
-def perform_live_search(query: str, search_depth="advanced", topic="general") -> str:
+def build_search_context(entities, results, token_budget: int = None) -> str:
+    """
+    Turns the raw results of several searches into one bounded prompt block.
+
+    Results are deduplicated by URL across all queries (a page found for several
+    entities is shown once, under the first, and credited to the others), ranked by
+    Tavily score, and admitted until the token budget is spent. Every entity's best
+    result is admitted before any entity's second one, so a long list of entities
+    cannot crowd out the last ones. Over-long contents are truncated.
+
+    Args:
+        entities (list[str]): The entity each search was run for (founder, competitor...).
+        results (list): Per entity, the raw result list from perform_live_searches(..., raw=True),
+            or the APIError of a failed search.
+        token_budget (int): Maximum estimated tokens for all result text.
+            Defaults to DEFAULT_SEARCH_TOKEN_BUDGET.
+
+    Returns:
+        str: The "--- Search for <entity> ---" sections, in entity order.
+    """
+    budget_chars = (token_budget or DEFAULT_SEARCH_TOKEN_BUDGET) * CHARS_PER_TOKEN
+
+    # Deduplicate by URL, remembering every entity a page was found for
+    unique = {}
+    candidates = []
+    total = 0
+    for index, entity_results in enumerate(results):
+        if isinstance(entity_results, APIError):
+            continue
+        for result in entity_results or []:
+            total += 1
+            key = _url_key(result.get("url", "")) or f"#{index}-{total}"
+            seen = unique.get(key)
+            if seen is None:
+                seen = {"result": result, "owner": index, "also": [], "score": result.get("score") or 0.0}
+                unique[key] = seen
+                candidates.append(seen)
+            elif index != seen["owner"] and entities[index] not in seen["also"]:
+                seen["also"].append(entities[index])
+                seen["score"] = max(seen["score"], result.get("score") or 0.0)
+
+    # Admission order: each entity's best result first, then everything else by score
+    ranked = sorted(candidates, key=lambda c: c["score"], reverse=True)
+    firsts, rest, owners = [], [], set()
+    for candidate in ranked:
+        (rest if candidate["owner"] in owners else firsts).append(candidate)
+        owners.add(candidate["owner"])
+
+    admitted = {}
+    remaining = budget_chars
+    truncated = 0
+    for candidate in firsts + rest:
+        content = candidate["result"].get("content") or ""
+        limit = min(SEARCH_RESULT_MAX_CHARS, remaining - 200)  # leave room for the title/URL line
+        if limit < 200:
+            break
+        if len(content) > limit:
+            content = content[:limit].rstrip() + " [...]"
+            truncated += 1
+        text = _format_result(candidate["result"], content)
+        if candidate["also"]:
+            text += f"\n (Also found for: {', '.join(candidate['also'])})"
+        admitted.setdefault(candidate["owner"], []).append((candidate["score"], text))
+        remaining -= len(text)
+
+    sections = []
+    for index, entity in enumerate(entities):
+        entity_results = results[index]
+        if isinstance(entity_results, APIError):
+            # Say plainly that nothing was retrieved, so a failed search is not read as "no red flags found"
+            body = "[Search unavailable: no data was retrieved. Do not treat this as a signal either way.]"
+        elif index in admitted:
+            body = "\n\n".join(text for _, text in sorted(admitted[index], key=lambda item: item[0], reverse=True))
+        elif entity_results:
+            body = "Results omitted (duplicates of other entities' sources, or over the prompt budget)."
+        else:
+            body = "No results found."
+        sections.append(f"\n--- Search for {entity} ---\n{body}\n")
+
+    kept = sum(len(texts) for texts in admitted.values())
+    annotate(
+        search_results=total,
+        search_unique=len(candidates),
+        search_kept=kept,
+        search_truncated=truncated,
+        search_context_tokens=(budget_chars - remaining) // CHARS_PER_TOKEN,
+    )
+    return "".join(sections)
+
+
+def perform_live_search(query: str, search_depth="advanced", topic="general", raw=False):
     """
     Performs a live search using the Tavily API and returns formatted results.
 
@@ -17,36 +310,172 @@ def perform_live_search(query: str, search_depth="advanced", topic="general") ->
         query (str): The search query.
         search_depth (str): The depth of search ("basic" or "advanced"). Defaults to "advanced".
         topic (str): The topic of search ("general" or "news"). Defaults to "general".
+        raw (bool): Return the raw result dicts (for build_search_context) instead of text.
 
     Returns:
-        str: A formatted string of search results suitable for LLM consumption.
+        str: A formatted string of search results suitable for LLM consumption
+        (list[dict] of raw results when raw is True).
+
+    Raises:
+        APIError: If the search failed (after retries) or no API key is configured.
     """
-    if not tavily_client:
-        return "Error: TAVILY_API_KEY is not set in the environment variables."
+    if get_tavily_client() is None:
+        raise APIError("tavily", "search", "config", "TAVILY_API_KEY is not set in the environment variables.")
 
-    try:
+    # A search started speculatively (see prefetch_search) is joined instead of repeated
+    future = _prefetched(query, search_depth, topic)
+    if future is not None:
+        results = future.result()
+        if isinstance(results, APIError):
+            raise results
+    else:
+        results = _live_search(query, search_depth, topic)
+    return results if raw else format_search_results(results)
+
+
+def _live_search(query, search_depth, topic) -> list:
+    with span("tavily", "search", query=query, topic=topic, search_depth=search_depth):
         # The Tavily Python SDK handles the parameters directly.
-        # We pass the topic and search_depth as requested.
-        response = tavily_client.search(
-            query=query,
-            search_depth=search_depth,
-            topic=topic
-        )
+        # We pass the topic and search_depth as requested (through the cache).
+        return fetch_search_results(query, search_depth=search_depth, topic=topic)
 
-        results = response.get("results", [])
-        if not results:
-            return "No results found."
 
-        formatted_output = ""
-        for result in results:
-            title = result.get("title", "No Title")
-            url = result.get("url", "No URL")
-            content = result.get("content", "No Content")
+async def aperform_live_search(query: str, search_depth="advanced", topic="general", raw=False):
+    """Async variant of perform_live_search."""
+    if get_async_tavily_client() is None:
+        raise APIError("tavily", "search", "config", "TAVILY_API_KEY is not set in the environment variables.")
+
+    future = _prefetched(query, search_depth, topic)
+    if future is not None:
+        results = await asyncio.wrap_future(future)
+        if isinstance(results, APIError):
+            raise results
+    else:
+        with span("tavily", "search", query=query, topic=topic, search_depth=search_depth):
+            results = await afetch_search_results(query, search_depth=search_depth, topic=topic)
+    return results if raw else format_search_results(results)
+
+
+# Speculative searches, started before the node that needs them runs (e.g. while the
+# Router is still streaming its job order). They run on a shared pool and are kept,
+# keyed like the search cache, for PREFETCH_TTL seconds so the agents can join them.
+PREFETCH_TTL = 300
+PREFETCH_WORKERS = int(os.getenv("ARGUS_PREFETCH_WORKERS", "16"))
+_prefetches = {}
+_prefetch_lock = threading.Lock()
+_prefetch_pool = None
+
+
+def prefetch_search(query: str, search_depth="advanced", topic="general") -> bool:
+    """
+    Starts a search in the background so a later perform_live_search for the same
+    (query, search_depth, topic) returns without waiting for Tavily.
 
-            formatted_output += f"Source: {title} - {url} \n Content: {content} \n\n"
+    Failures are kept as APIError and re-raised to the caller that joins the search.
+
+    Returns:
+        bool: True if a new search was started (False if one is already in flight
+        or done, or no Tavily client is configured).
+    """
+    global _prefetch_pool
+    if get_tavily_client() is None:
+        return False
+
+    key = search_cache_key(query, search_depth, topic)
+    now = time.monotonic()
+    with _prefetch_lock:
+        for stale in [k for k, (_, started) in _prefetches.items() if now - started > PREFETCH_TTL]:
+            del _prefetches[stale]
+        if key in _prefetches:
+            return False
+        if _prefetch_pool is None:
+            _prefetch_pool = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS, thread_name_prefix="argus-prefetch")
+        # Run in a copy of the caller's context so the search span lands in the active trace
+        context = contextvars.copy_context()
+        future = _prefetch_pool.submit(context.run, _search_or_error, query, search_depth, topic)
+        _prefetches[key] = (future, now)
+    return True
+
+
+def _search_or_error(query, search_depth, topic):
+    try:
+        return _live_search(query, search_depth, topic)
+    except APIError as e:
+        return e
+
+
+def _prefetched(query, search_depth, topic):
+    """The Future of a prefetched search for these parameters, or None."""
+    key = search_cache_key(query, search_depth, topic)
+    with _prefetch_lock:
+        entry = _prefetches.get(key)
+        if entry is None or time.monotonic() - entry[1] > PREFETCH_TTL:
+            return None
+        future = entry[0]
+        # A prefetch that already failed is not reused; the caller searches again
+        if future.done() and isinstance(future.result(), APIError):
+            del _prefetches[key]
+            return None
+    return future
+
+
+def perform_live_searches(queries, search_depth="advanced", topic="general", max_concurrency=None, raw=False) -> list:
+    """
+    Runs several live searches concurrently on a bounded worker pool.
+
+    Node latency is then close to the slowest single search rather than the
+    sum of all of them.
+
+    Args:
+        queries (list[str]): The search queries.
+        search_depth (str): Passed through to perform_live_search.
+        topic (str): Passed through to perform_live_search.
+        max_concurrency (int): Maximum number of requests in flight.
+            Defaults to DEFAULT_SEARCH_CONCURRENCY.
+        raw (bool): Return each query's raw result list instead of formatted text.
+
+    Returns:
+        list: The formatted result string (or raw result list) for each query, in the same order as
+        the queries. A query whose search failed gets its APIError instead, so
+        one failure does not discard the other results.
+    """
+    queries = list(queries)
+    if not queries:
+        return []
+
+    def search(query):
+        try:
+            return perform_live_search(query, search_depth=search_depth, topic=topic, raw=raw)
+        except APIError as e:
+            return e
+
+    workers = max(1, min(max_concurrency or DEFAULT_SEARCH_CONCURRENCY, len(queries)))
+    # Worker threads do not inherit context variables; give each search a copy of
+    # the caller's context so its span lands in the active trace under the node.
+    contexts = [contextvars.copy_context() for _ in queries]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="argus-search") as pool:
+        # map() yields results in input order regardless of completion order
+        return list(pool.map(
+            lambda ctx, q: ctx.run(search, q),
+            contexts, queries
+        ))
+
+
+async def aperform_live_searches(queries, search_depth="advanced", topic="general", max_concurrency=None, raw=False) -> list:
+    """
+    Async variant of perform_live_searches, bounded by a semaphore instead of threads.
+
+    Returns:
+        list: Formatted results (or APIError for failed searches), in query order.
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency or DEFAULT_SEARCH_CONCURRENCY))
 
-        return formatted_output.strip()
+    async def bounded(query):
+        async with semaphore:
+            try:
+                return await aperform_live_search(query, search_depth=search_depth, topic=topic, raw=raw)
+            except APIError as e:
+                return e
 
-    except Exception as e:
-        # Handle connection errors and other exceptions gracefully
-        return f"Error occurred during search: {str(e)}"
+    # gather() returns results in input order
+    return list(await asyncio.gather(*(bounded(q) for q in queries)))
@@ -0,0 +1,318 @@
+"""
+Per-run tracing and process-wide metrics for the committee graph.
+
+A run is wrapped in start_trace(); node functions, LLM calls and searches then
+record spans into it. Spans follow the OpenTelemetry span layout (trace/span ids,
+parent, start/end in unix nanoseconds, attributes) and can be exported as JSON lines.
+Every span also feeds the aggregated counters and histograms in METRICS.
+"""
+
+import contextvars
+import functools
+import inspect
+import json
+import os
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+
+# Append every finished trace to this JSONL file (one span per line) when set
+TRACE_FILE = os.getenv("ARGUS_TRACE_FILE")
+
+_current_trace = contextvars.ContextVar("argus_trace", default=None)
+_current_span = contextvars.ContextVar("argus_span", default=None)
+
+
+class Metrics:
+    """Thread-safe counters and latency histograms aggregated across runs."""
+
+    # Histogram bucket upper bounds in milliseconds
+    BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000, float("inf"))
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = {}
+        self.histograms = {}
+
+    def increment(self, name: str, value: float = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, name: str, value_ms: float):
+        with self._lock:
+            hist = self.histograms.get(name)
+            if hist is None:
+                hist = {"count": 0, "sum_ms": 0.0, "buckets": [0] * len(self.BUCKETS_MS)}
+                self.histograms[name] = hist
+            hist["count"] += 1
+            hist["sum_ms"] += value_ms
+            for i, bound in enumerate(self.BUCKETS_MS):
+                if value_ms <= bound:
+                    hist["buckets"][i] += 1
+                    break
+
+    def snapshot(self) -> dict:
+        """Returns a copy of all counters and histograms."""
+        with self._lock:
+            histograms = {}
+            for name, hist in self.histograms.items():
+                histograms[name] = {
+                    "count": hist["count"],
+                    "mean_ms": hist["sum_ms"] / hist["count"] if hist["count"] else 0.0,
+                    "buckets": dict(zip((str(b) for b in self.BUCKETS_MS), hist["buckets"])),
+                }
+            return {"counters": dict(self.counters), "histograms": histograms}
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+
+METRICS = Metrics()
+
+
+class Span:
+    """A timed operation inside a trace (a node, an LLM call or a search)."""
+
+    def __init__(self, name: str, kind: str, trace_id: str, parent_id=None, attributes=None):
+        self.name = name
+        self.kind = kind
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.attributes = dict(attributes or {})
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.status = "OK"
+        self._start = time.perf_counter()
+        self.duration_ms = 0.0
+
+    def set(self, **attributes):
+        """Adds or overwrites span attributes."""
+        self.attributes.update(attributes)
+
+    def finish(self, error=None):
+        self.duration_ms = (time.perf_counter() - self._start) * 1000
+        self.end_ns = time.time_ns()
+        if error is not None:
+            self.status = "ERROR"
+            self.attributes["error"] = f"{type(error).__name__}: {error}"
+
+    def to_dict(self) -> dict:
+        """OpenTelemetry-style representation of the span."""
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start_time_unix_nano": self.start_ns,
+            "end_time_unix_nano": self.end_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+class Trace:
+    """All spans recorded during one committee run."""
+
+    def __init__(self, run_id=None):
+        self.trace_id = secrets.token_hex(16)
+        self.run_id = run_id or self.trace_id
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def add(self, span: Span):
+        with self._lock:
+            self.spans.append(span)
+
+    def to_records(self) -> list:
+        with self._lock:
+            spans = list(self.spans)
+        return [{"run_id": self.run_id, **s.to_dict()} for s in sorted(spans, key=lambda s: s.start_ns)]
+
+    def export_jsonl(self, path: str):
+        """Appends every span of the trace to a JSON lines file."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "a") as f:
+            for record in self.to_records():
+                f.write(json.dumps(record) + "\n")
+
+    def breakdown(self) -> list:
+        """
+        Per-run timing breakdown for display.
+
+        Returns:
+            list[dict]: One row per span (name, kind, ms, tokens, cache hit), in start order.
+        """
+        rows = []
+        for record in self.to_records():
+            attrs = record["attributes"]
+            rows.append({
+                "name": record["name"],
+                "kind": record["kind"],
+                "model": attrs.get("model"),
+                "ms": record["duration_ms"],
+                "input_tokens": attrs.get("input_tokens"),
+                "output_tokens": attrs.get("output_tokens"),
+                "prompt_chars": attrs.get("prompt_chars"),
+                "cache_hit": attrs.get("cache_hit"),
+                "status": record["status"],
+            })
+        return rows
+
+    def node_durations(self) -> dict:
+        """Wall time in milliseconds of each node span, keyed by node name."""
+        with self._lock:
+            return {s.name: round(s.duration_ms, 3) for s in self.spans if s.kind == "node"}
+
+    def model_totals(self) -> dict:
+        """
+        LLM calls, time and tokens per model, to compare model tiering configurations.
+
+        Returns:
+            dict: {model: {"calls", "ms", "input_tokens", "output_tokens", "nodes"}}
+        """
+        with self._lock:
+            spans = [s for s in self.spans if s.kind == "llm"]
+        models = {}
+        for s in spans:
+            entry = models.setdefault(s.attributes.get("model") or "unknown", {
+                "calls": 0, "ms": 0.0, "input_tokens": 0, "output_tokens": 0, "nodes": []
+            })
+            entry["calls"] += 1
+            entry["ms"] = round(entry["ms"] + s.duration_ms, 3)
+            entry["input_tokens"] += s.attributes.get("input_tokens") or 0
+            entry["output_tokens"] += s.attributes.get("output_tokens") or 0
+            if s.name not in entry["nodes"]:
+                entry["nodes"].append(s.name)
+        return models
+
+    def totals(self) -> dict:
+        """Token, prompt size and cache hit totals over all LLM and search spans."""
+        totals = {"input_tokens": 0, "output_tokens": 0, "prompt_chars": 0,
+                  "llm_calls": 0, "searches": 0, "cache_hits": 0}
+        with self._lock:
+            spans = list(self.spans)
+        for s in spans:
+            if s.kind == "llm":
+                totals["llm_calls"] += 1
+                totals["input_tokens"] += s.attributes.get("input_tokens") or 0
+                totals["output_tokens"] += s.attributes.get("output_tokens") or 0
+                totals["prompt_chars"] += s.attributes.get("prompt_chars") or 0
+            elif s.kind == "search":
+                totals["searches"] += 1
+            if s.attributes.get("cache_hit"):
+                totals["cache_hits"] += 1
+        return totals
+
+
+def current_trace():
+    """Returns the active Trace, or None outside start_trace()."""
+    return _current_trace.get()
+
+
+@contextmanager
+def start_trace(run_id=None, export_path=None):
+    """
+    Activates a new Trace for the duration of a run.
+
+    Args:
+        run_id (str): Identifier recorded on every span (defaults to the trace id).
+        export_path (str): JSONL file to append the spans to when the run ends.
+            Defaults to the ARGUS_TRACE_FILE environment variable.
+
+    Yields:
+        Trace: The active trace.
+    """
+    trace = Trace(run_id)
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+        path = export_path or TRACE_FILE
+        if path:
+            trace.export_jsonl(path)
+
+
+@contextmanager
+def span(name: str, kind: str, **attributes):
+    """
+    Records a span in the active trace (if any) and in the aggregated metrics.
+
+    Yields:
+        Span: The span, so callers can attach attributes such as token counts.
+    """
+    trace = _current_trace.get()
+    parent = _current_span.get()
+    current = Span(
+        name, kind,
+        trace_id=trace.trace_id if trace else "",
+        parent_id=parent.span_id if parent else None,
+        attributes=attributes,
+    )
+    token = _current_span.set(current)
+    error = None
+    try:
+        yield current
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        _current_span.reset(token)
+        current.finish(error)
+        if trace is not None:
+            trace.add(current)
+        _record_metrics(current)
+
+
+def annotate(**attributes):
+    """Sets attributes on the innermost active span, if there is one."""
+    current = _current_span.get()
+    if current is not None:
+        current.set(**attributes)
+
+
+def _record_metrics(s: Span):
+    METRICS.increment(f"{s.kind}.calls")
+    METRICS.observe(f"{s.kind}.{s.name}.ms" if s.kind == "node" else f"{s.kind}.ms", s.duration_ms)
+    if s.status != "OK":
+        METRICS.increment(f"{s.kind}.errors")
+    if s.attributes.get("cache_hit"):
+        METRICS.increment(f"{s.kind}.cache_hits")
+    for key in ("input_tokens", "output_tokens", "prompt_chars"):
+        if s.attributes.get(key):
+            METRICS.increment(f"{s.kind}.{key}", s.attributes[key])
+
+
+def traced_node(name: str):
+    """Decorator that wraps a sync or async node function in a "node" span."""
+    def decorator(fn):
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with span(name, "node"):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name, "node"):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record_llm_usage(s: Span, response):
+    """Copies token counts from a LangChain response's usage_metadata onto a span."""
+    usage = getattr(response, "usage_metadata", None) or {}
+    s.set(
+        input_tokens=usage.get("input_tokens"),
+        output_tokens=usage.get("output_tokens"),
+    )
@@ -0,0 +1,58 @@
+# tests/test_async_nodes.py
+# The async nodes must keep blocking work (SQLite, NumPy, BM25) off the event loop.
+
+import asyncio
+import os
+import sys
+import threading
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.fakes import FakeAsyncSearchClient, FakeSearchClient, LatencyModel, fake_llm_factory
+from src.modules import nodes
+from src.modules.dossiers import DossierStore, set_dossier_store
+from src.modules.llm import set_llm_factory
+from src.modules.tools import set_search_clients
+
+NO_LATENCY = LatencyModel(0.0, kind="fixed")
+
+
+def test_blocking_work_runs_off_the_event_loop(monkeypatch):
+    threads = {}
+
+    def recorded(name, fn):
+        def wrapper(*args, **kwargs):
+            threads.setdefault(name, set()).add(threading.current_thread())
+            return fn(*args, **kwargs)
+        return wrapper
+
+    for name in ("known_entities", "_record_findings", "_cfo_precheck", "_critic_messages"):
+        monkeypatch.setattr(nodes, name, recorded(name, getattr(nodes, name)))
+    monkeypatch.setattr(nodes, "ROUTER_PREFETCH", True)
+    monkeypatch.setattr(nodes.RouterPrefetch, "_start", recorded("prefetch", nodes.RouterPrefetch._start))
+    set_dossier_store(DossierStore(":memory:"))
+    set_llm_factory(fake_llm_factory(NO_LATENCY))
+    set_search_clients(FakeSearchClient(NO_LATENCY), FakeAsyncSearchClient(NO_LATENCY))
+    try:
+        state = {
+            "pdf_file_uri": "files/deck", "pdf_pages": ["Alice Johnson founded OmniAGI. $2M ARR, 1,000 customers."],
+            "job_order": {"founders": ["Alice Johnson"], "competitors": ["OpenAI"],
+                          "financial_claims": ["$2M ARR with 1,000 customers"]},
+        }
+
+        async def run():
+            loop_thread = threading.current_thread()
+            await nodes.arouter_node(state)
+            for node in (nodes.asherlock_node, nodes.aresearcher_node, nodes.acfo_node):
+                state.update(await node(state))
+            await nodes.acritic_node(state)
+            return loop_thread
+
+        loop_thread = asyncio.run(run())
+    finally:
+        set_dossier_store(None)
+        set_llm_factory(None)
+        set_search_clients(None, None)
+
+    assert set(threads) == {"known_entities", "_record_findings", "_cfo_precheck", "_critic_messages", "prefetch"}
+    assert all(loop_thread not in used for used in threads.values())
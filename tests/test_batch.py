@@ -0,0 +1,128 @@
+# tests/test_batch.py
+# Regression tests for resuming checkpointed batch runs.
+
+import json
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.fakes import FakeAsyncSearchClient, FakeSearchClient, LatencyModel, fake_llm_factory
+from src import batch
+from src.graph import get_checkpointed_app
+from src.jobs import JobService, JobStore
+from src.modules import dossiers
+from src.modules.llm import set_llm_factory
+from src.modules.prompts import CRITIC_SYSTEM_PROMPT, SHERLOCK_SYSTEM_PROMPT
+from src.modules.tools import set_search_clients
+
+NO_LATENCY = LatencyModel(0.0, kind="fixed")
+
+
+class FakeIngestion:
+    """Every upload gets a new URI, as after the File API expired the previous one."""
+
+    def __init__(self):
+        self.uploads = 0
+
+    def upload_to_gemini(self, path, mime_type=None, display_name=None):
+        self.uploads += 1
+        return SimpleNamespace(uri=f"files/upload-{self.uploads}")
+
+
+@pytest.fixture
+def committee(monkeypatch):
+    """A fake model that fails the given nodes, recording the file URIs it was sent."""
+    monkeypatch.setattr(dossiers, "DOSSIERS_ENABLED", False)
+    failing, calls = set(), []
+    base = fake_llm_factory(NO_LATENCY)
+
+    def factory(model, google_api_key=None, **params):
+        llm = base(model, google_api_key, **params)
+
+        class Failing(type(llm)):
+            def _record(self, messages):
+                node = {SHERLOCK_SYSTEM_PROMPT: "sherlock", CRITIC_SYSTEM_PROMPT: "critic"}.get(messages[0].content)
+                uris = [p["file_uri"] for m in messages if isinstance(m.content, list)
+                        for p in m.content if isinstance(p, dict) and "file_uri" in p]
+                calls.append((node, uris))
+                if node in failing:
+                    raise RuntimeError(f"{node} failed")
+
+            def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+                self._record(messages)
+                return super()._generate(messages, stop, run_manager, **kwargs)
+
+            def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+                self._record(messages)
+                yield from super()._stream(messages, stop, run_manager, **kwargs)
+
+        return Failing(**llm.__dict__)
+
+    set_llm_factory(factory)
+    set_search_clients(FakeSearchClient(NO_LATENCY), FakeAsyncSearchClient(NO_LATENCY))
+    monkeypatch.setattr("src.modules.resilience.MAX_ATTEMPTS", 1)
+    yield failing, calls
+    set_llm_factory(None)
+    set_search_clients(None, None)
+
+
+def _decks(tmp_path):
+    decks = []
+    for name in ("alpha", "beta"):
+        path = tmp_path / f"{name}.pdf"
+        path.write_bytes(f"not a real pdf: {name}".encode())
+        decks.append({"id": name, "path": str(path), "run_id": name})
+    return decks
+
+
+def test_retry_uses_fresh_upload_and_merges_summary(tmp_path, committee):
+    failing, calls = committee
+    graph = get_checkpointed_app(str(tmp_path / "checkpoints.sqlite3"))
+    ingestion = FakeIngestion()
+    out = str(tmp_path / "memos")
+    decks = _decks(tmp_path)
+
+    failing.add("critic")
+    first = batch.run_batch(decks[:1], output_dir=out, ingestion=ingestion, graph=graph)
+    failing.clear()
+    batch.run_batch(decks[1:], output_dir=out, ingestion=ingestion, graph=graph, merge=True)
+    assert first["failed"] == 1
+
+    calls.clear()
+    summary = batch.run_batch(decks[:1], output_dir=out, ingestion=ingestion, graph=graph, merge=True)
+    critic_uris = [uris for node, uris in calls if node == "critic"]
+    assert critic_uris == [["files/upload-3"]]
+    # Only the failed Critic (and the Writer after it) ran again
+    assert "sherlock" not in [node for node, _ in calls]
+
+    with open(os.path.join(out, "summary.json")) as f:
+        stored = json.load(f)
+    assert stored == json.loads(json.dumps(summary))
+    assert [r["id"] for r in summary["results"]] == ["alpha", "beta"]
+    assert summary["succeeded"] == 2 and summary["from_checkpoint"] == 1
+    assert [r["checkpoint"] for r in summary["results"]] == ["resumable", "new"]
+    fresh = [r for r in summary["results"] if r["id"] == "beta"][0]
+    assert summary["latency_p50"] == fresh["seconds"]
+
+
+def test_retried_job_uses_fresh_upload(tmp_path, committee):
+    failing, calls = committee
+    service = JobService(store=JobStore(str(tmp_path / "jobs.sqlite3")), workers=1, ingestion=FakeIngestion(),
+                         graph=get_checkpointed_app(str(tmp_path / "checkpoints.sqlite3")), resume=False,
+                         incremental=False)
+    try:
+        failing.add("critic")
+        job_id = service.submit(b"not a real pdf", name="alpha.pdf")
+        assert service.wait(job_id, timeout=30)["status"] == "failed"
+
+        failing.clear()
+        calls.clear()
+        assert service.retry(job_id)
+        assert service.wait(job_id, timeout=30)["status"] == "succeeded"
+        assert [uris for node, uris in calls if node == "critic"] == [["files/upload-2"]]
+    finally:
+        service.shutdown()
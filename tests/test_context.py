@@ -0,0 +1,61 @@
+# tests/test_context.py
+# Regression tests for the token-budgeted Critic/Writer context.
+
+import os
+import subprocess
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.modules.context import apply_critic, assemble_context
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+FEEDBACK = """Hallucinations:
+- The CFO report says implied ARPU of $200 per user, which contradicts the deck.
+Unverified claims:
+- Sherlock states Alice founded Acme in 2019, which could not be confirmed.
+"""
+
+
+def test_critic_items_with_attribution_match_report_lines():
+    context = assemble_context({
+        "cfo_report": "## CFO Report\nImplied ARPU of $200 per user.\nRunway of 18 months.",
+        "sherlock_report": "Alice founded Acme in 2019 and sold it.",
+    })
+    result = apply_critic(context, FEEDBACK)
+    assert result["dropped"] == 1
+    assert [u["text"] for u in result["units"]["cfo_report"]] == ["## CFO Report", "Runway of 18 months."]
+    assert result["units"]["sherlock_report"][0]["text"].endswith("[unverified by the Critic]")
+
+
+def test_numbered_sections_keep_confirmed_facts():
+    feedback = """Validation Verdict: Partially Rejected
+1. **Confirmed Facts:**
+   - Alice founded Acme in 2019 and sold it.
+2. **HALLUCINATIONS (invalid contradictions):**
+   - The CFO report says implied ARPU of $200 per user.
+3. **External Discoveries (valid):**
+   - Runway of 18 months matches the filings.
+"""
+    context = assemble_context({
+        "cfo_report": "Implied ARPU of $200 per user.\nRunway of 18 months.",
+        "sherlock_report": "Alice founded Acme in 2019 and sold it.",
+    })
+    result = apply_critic(context, feedback)
+    assert result["dropped"] == 1
+    assert [u["text"] for u in result["units"]["cfo_report"]] == ["Runway of 18 months."]
+    assert [u["text"] for u in result["units"]["sherlock_report"]] == ["Alice founded Acme in 2019 and sold it."]
+
+
+def test_importing_context_opens_no_search_cache():
+    code = "import sys; import src.modules.context; print('src.modules.tools' in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "False"
+
+
+def test_importing_tools_creates_no_cache_dir(tmp_path):
+    cache_dir = tmp_path / "cache"
+    env = {**os.environ, "ARGUS_CACHE_DIR": str(cache_dir)}
+    subprocess.run([sys.executable, "-c", "import src.modules.tools"], cwd=ROOT, env=env, check=True)
+    assert not cache_dir.exists()
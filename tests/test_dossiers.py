@@ -0,0 +1,58 @@
+# tests/test_dossiers.py
+# Regression tests for the dossier store's interaction with the LLM response cache.
+
+import os
+import sys
+
+import pytest
+from langchain_core.messages import AIMessage
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.modules import llm, nodes
+from src.modules.cache import SQLiteCache
+from src.modules.dossiers import DossierStore, set_dossier_store
+
+FINDINGS = 'Report.\n```json\n{"Alice Johnson": "Founded two startups."}\n```'
+
+
+@pytest.fixture
+def store():
+    store = DossierStore(":memory:")
+    set_dossier_store(store)
+    yield store
+    set_dossier_store(None)
+
+
+@pytest.fixture
+def llm_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(llm, "LLM_CACHE_ENABLED", True)
+    monkeypatch.setattr(llm, "_response_cache", SQLiteCache(str(tmp_path / "llm.sqlite3")))
+
+
+def _prompt(founders):
+    dossiers, searched = nodes.known_entities("founder", founders)
+    return nodes._sherlock_messages(founders, [[] for _ in searched], searched, dossiers)[1].content
+
+
+def test_identical_deck_keeps_its_prompt_with_the_response_cache(store, llm_cache):
+    founders = ["Alice Johnson", "Bob Smith"]
+    first = _prompt(founders)
+    nodes._record_findings("founder", AIMessage(content=FINDINGS), founders, [[{"url": "https://a.example"}], []])
+    assert store.lookup("founder", ["Alice Johnson"])
+    assert _prompt(founders) == first
+    # Another deck with the same founder still gets the dossier
+    _, searched = nodes.known_entities("founder", ["Alice Johnson", "Carol White"])
+    assert searched == ["Carol White"]
+
+
+def test_dossiers_replace_searches_without_the_response_cache(store):
+    store.save("founder", "Alice Johnson", "Founded two startups.")
+    dossiers, searched = nodes.known_entities("founder", ["Alice Johnson", "Bob Smith"])
+    assert list(dossiers) == ["Alice Johnson"] and searched == ["Bob Smith"]
+
+
+def test_cached_response_does_not_refresh_dossiers(store):
+    cached = AIMessage(content=FINDINGS, response_metadata={"argus_cache_hit": True})
+    nodes._record_findings("founder", cached, ["Alice Johnson"], [[{"url": "https://a.example"}]])
+    assert not store.lookup("founder", ["Alice Johnson"])
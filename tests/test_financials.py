@@ -0,0 +1,75 @@
+# tests/test_financials.py
+# Regression tests for the deterministic financial checks in front of the CFO agent.
+
+import datetime
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.modules.financials import CHURN, RETENTION, REVENUE, USERS, check_claims, parse_claim
+
+YEAR = datetime.date.today().year
+LAST_YEAR = YEAR - 1
+
+
+def test_zero_revenue_stays_current_next_to_a_projection():
+    figures = parse_claim("We have $0 revenue but project $100M in Year 1.", YEAR)
+    current = [f for f in figures if f[0] == REVENUE and f[1] == 0]
+    projected = [f for f in figures if f[0] == REVENUE and f[1] == 100e6]
+    assert len(current) == 1 and current[0][2] == 0
+    assert projected and projected[0][2] == 1
+
+
+def test_pre_revenue_projection_is_flagged():
+    check = check_claims(["We have $0 revenue but project $100M in Year 1.", "We have 500,000 waitlist users."])
+    assert check.figures["current_revenue"] == 0
+    assert not check.consistent
+    assert any("pre-revenue" in reason for _, reasons in check.flagged_claims() for reason in reasons)
+
+
+def test_zero_revenue_phrases_are_pre_revenue():
+    for claim in ("$0 in revenue so far", "Zero revenue today", "We have not yet generated revenue"):
+        assert (REVENUE, 0.0) in [(m, v) for m, v, *_ in parse_claim(claim, YEAR)], claim
+
+
+def test_past_and_future_calendar_years_give_a_cagr():
+    check = check_claims([f"Revenue of $1.2 million in {LAST_YEAR - 2}", f"Projected $10 million in {LAST_YEAR + 1}"])
+    assert check.figures["current_revenue"] == 1.2e6
+    assert check.figures["projected_revenue"] == 10e6
+    # Three years of growth, not one
+    assert abs(check.figures["cagr"] - ((10 / 1.2) ** (1 / 3) - 1)) < 1e-9
+
+
+def test_projection_without_baseline_is_not_consistent():
+    check = check_claims(["Projected $100M revenue in Year 3", "20,000 paying customers"])
+    assert np.isnan(check.figures["current_revenue"])
+    assert not check.consistent
+
+
+def test_net_revenue_retention_is_not_churn():
+    assert parse_claim("Net revenue retention 120%", YEAR)[0][0] == RETENTION
+    assert parse_claim("Monthly churn of 2%", YEAR)[0][0] == CHURN
+
+
+def test_counts_are_not_years_or_labels():
+    figures = [(m, v) for m, v, *_ in parse_claim("Claim 1: $20M ARR with 2000 users", YEAR)]
+    assert figures == [(REVENUE, 20e6), (USERS, 2000.0)]
+
+
+def test_calendar_years_follow_the_reference_year():
+    claim = "Revenue of $1M in 2024"
+    assert parse_claim(claim, 2025)[0][2] == 0
+    assert parse_claim(claim, 2027)[0][2] == -2
+
+
+def test_claims_without_figures_reach_the_cfo_as_unverified():
+    from src.modules.nodes import _cfo_messages
+
+    claims = ["Projected $100M revenue in Year 3", "We have strong partnerships with top banks"]
+    check = check_claims(claims)
+    prompt = _cfo_messages({"job_order": {"financial_claims": claims}}, check)[1].content
+    assert check.unparsed_claims() == [claims[1]]
+    assert "unverified" in prompt and claims[1] in prompt
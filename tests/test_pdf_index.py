@@ -0,0 +1,25 @@
+# tests/test_pdf_index.py
+# Regression tests for the local page index behind the Critic's excerpts.
+
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.modules import nodes
+from src.modules.pdf_index import PageIndex
+
+TEXT_PAGE = "Financials: We have $0 revenue but project $100M in Year 1 with 500,000 waitlist users."
+
+
+def test_mostly_image_deck_has_no_usable_text():
+    assert not PageIndex([TEXT_PAGE] + [""] * 9).has_text
+    assert PageIndex([TEXT_PAGE] * 5 + [""] * 5).has_text
+    assert not PageIndex([]).has_text
+
+
+def test_critic_attaches_full_pdf_for_mostly_image_deck():
+    state = {"pdf_pages": [TEXT_PAGE] + [""] * 9, "cfo_report": "Projected $100M in Year 1 is unrealistic."}
+    assert nodes._critic_excerpts(state) is None
+    state["pdf_pages"] = [TEXT_PAGE, "Team: Alice Johnson (ex-Google), Bob Smith, both repeat founders."]
+    assert "[Page 1]" in nodes._critic_excerpts(state)
@@ -0,0 +1,26 @@
+# tests/test_resilience.py
+# Regression tests for the shared rate limiters and retry policy.
+
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.modules import resilience
+from src.modules.resilience import APIError, RateLimiter, call_with_retry
+
+
+def test_calls_abandoned_at_the_deadline_do_not_use_up_the_buckets(monkeypatch):
+    limiter = RateLimiter("test", requests_per_minute=1, tokens_per_minute=1000)
+    monkeypatch.setitem(resilience.RATE_LIMITERS, "test", limiter)
+    monkeypatch.setitem(resilience.DEADLINES, "test", 1.0)
+
+    assert call_with_retry("test", "op", lambda remaining: "ok", tokens=100) == "ok"
+    for _ in range(3):
+        with pytest.raises(APIError):
+            call_with_retry("test", "op", lambda remaining: "ok", tokens=100)
+    # Only the call that was made is charged
+    assert limiter.requests._tokens > -0.01
+    assert limiter.tokens._tokens > 900 - 1
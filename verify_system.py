@@ -18,12 +18,15 @@ except ImportError:
     sys.exit(1)
 
 from src.modules.ingestion import GoogleIngestion
+from src.modules.pdf_index import extract_pages
 from src.graph import app
 
 def create_dummy_pdf(filename):
     """Generates a dummy pitch deck PDF."""
     print(f"Generating dummy PDF: {filename}...")
-    c = canvas.Canvas(filename)
+    # invariant=1 drops timestamps/IDs so the bytes are identical on every run
+    # and the shared upload registry can reuse the previous upload.
+    c = canvas.Canvas(filename, invariant=1)
     c.setFont("Helvetica", 12)
     c.drawString(100, 750, "Startup: OmniAGI")
     c.drawString(100, 730, "Founders: Alice Johnson (ex-Google), Bob Smith")
@@ -53,7 +56,7 @@ def verify_system():
         print(f"File uploaded. URI: {file_object.uri}")
         
         print("\n--- Invoking Agent Graph ---")
-        initial_state = {"pdf_file_uri": file_object.uri}
+        initial_state = {"pdf_file_uri": file_object.uri, "pdf_pages": extract_pages(pdf_filename)}
         
         # Invoke the graph
         final_state = app.invoke(initial_state)